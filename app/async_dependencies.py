@@ -0,0 +1,69 @@
+# Async stack (DB_STACK=async): same layers on an AsyncSession
+# A module of its own, so the sync stack never imports the asyncio extension
+from typing import Annotated
+
+from fastapi import Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import get_async_engine, get_async_replica_selector, settings
+from app.dependencies import HeroCacheDep, HeroCountCacheDep
+from app.replicas import pinned_to_primary
+from app.repositories.async_hero_repository import AsyncHeroRepository
+from app.services.async_hero_service import AsyncHeroService
+
+
+async def get_async_session():
+    # expire_on_commit=False: no implicit (blocking) reloads after commit
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+
+
+async def get_async_read_session(request: Request):
+    # same routing as get_read_session: a replica unless pinned to the primary
+    replicas = get_async_replica_selector()
+    if replicas is None or pinned_to_primary(request.cookies):
+        engine = get_async_engine()
+    else:
+        engine = replicas.pick()
+        request.state.db_replica = True
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_session)]
+
+
+def get_async_hero_repository(session: AsyncSessionDep) -> AsyncHeroRepository:
+    return AsyncHeroRepository(session=session, bulk_chunk_size=settings.bulk_chunk_size)
+
+
+AsyncHeroRepoDep = Annotated[AsyncHeroRepository, Depends(get_async_hero_repository)]
+
+
+def get_async_hero_service(
+    repo: AsyncHeroRepoDep, cache: HeroCacheDep, count_cache: HeroCountCacheDep
+) -> AsyncHeroService:
+    return AsyncHeroService(repo=repo, cache=cache, count_cache=count_cache)
+
+
+AsyncHeroServiceDep = Annotated[AsyncHeroService, Depends(get_async_hero_service)]
+
+
+def get_async_hero_read_service(
+    request: Request,
+    session: AsyncReadSessionDep,
+    cache: HeroCacheDep,
+    count_cache: HeroCountCacheDep,
+) -> AsyncHeroService:
+    # GET endpoints only: same replica/ cache rule as `get_hero_read_service`
+    repo = AsyncHeroRepository(session=session, bulk_chunk_size=settings.bulk_chunk_size)
+    fill_cache = not getattr(request.state, "db_replica", False)
+    return AsyncHeroService(
+        repo=repo, cache=cache, count_cache=count_cache, fill_cache=fill_cache
+    )
+
+
+AsyncHeroReadServiceDep = Annotated[AsyncHeroService, Depends(get_async_hero_read_service)]
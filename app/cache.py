@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Protocol
+
+
+class CacheBackend(Protocol):
+    """
+    What the services need from a cache.
+
+    Values must be plain data (dicts, not ORM objects bound to a session), so a
+    shared backend (e.g. Redis) can be dropped in later behind the same interface.
+    """
+
+    def get(self, key: Hashable) -> Any | None: ...
+
+    def set(
+        self, key: Hashable, value: Any, if_generation: int | None = None
+    ) -> bool: ...
+
+    def generation(self) -> int: ...
+
+    def delete(self, key: Hashable) -> None: ...
+
+    def incr(self, key: Hashable, delta: int) -> int | None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class TTLLRUCache:
+    """
+    In-process cache: entries expire after `ttl` seconds, and once `max_size` is
+    reached the least recently used entry is evicted.
+
+    Thread-safe (sync handlers run on the threadpool).
+
+    Every write (`set()` without `if_generation`, `delete()`, `clear()`) bumps
+    a generation counter, so a read-through fill can tell that a write got in
+    between its db read and its `set()`, and drop its (possibly older) row.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._generation = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, if_generation: int | None = None) -> bool:
+        """
+        Store `value`; returns whether it was stored.
+
+        With `if_generation` (read from `generation()` before the value was
+        read from the db) it is only stored if nothing was written since.
+        """
+        with self._lock:
+            if if_generation is None:
+                self._generation += 1
+            elif if_generation != self._generation:
+                return False
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def incr(self, key: Hashable, delta: int) -> int | None:
+        """
+        Add `delta` to a cached number in place; returns the new value.
+
+        Only a live entry is changed (and keeps its expiry, so the value still
+        gets recomputed every `ttl` seconds); a missing one stays missing: None.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                return None
+            expires_at, value = entry
+            self._data[key] = (expires_at, value + delta)
+            return value + delta
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
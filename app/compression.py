@@ -0,0 +1,230 @@
+import hashlib
+import zlib
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.cache import TTLLRUCache
+from app.config import Settings
+from app.db import settings
+
+# Optional encoders: without the package that encoding is simply not offered
+try:
+    import brotli
+except ImportError:  # pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pip install zstandard
+    zstandard = None
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes, final: bool = False) -> bytes:
+        """Compressed `data`, flushed so the client can decode it right away."""
+        ...
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip framing
+
+    def compress(self, data: bytes, final: bool = False) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool = False) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool = False) -> bytes:
+        flush_mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+# Content-Encoding -> encoder factory (taking that encoding's level)
+ENCODERS: dict[str, Callable[[int], Encoder]] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+
+def split_list(value: str) -> list[str]:
+    # "a, b,," -> ["a", "b"] (comma-separated settings)
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def choose_encoding(accept_encoding: str, encodings: list[str]) -> str | None:
+    """
+    First of `encodings` (our preference order) that Accept-Encoding allows.
+
+    `q=0` rules an encoding out and `*` stands for any encoding not listed;
+    other q-values do not reorder our preference.
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = quality
+
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def media_type_matches(content_type: str, rules: list[str]) -> bool:
+    # "application/json; charset=utf-8" against "application/json" or "text/*"
+    media_type = content_type.partition(";")[0].strip().lower()
+    return any(
+        media_type == rule or (rule.endswith("/*") and media_type.startswith(rule[:-1]))
+        for rule in rules
+    )
+
+
+@lru_cache
+def get_compression_cache() -> TTLLRUCache | None:
+    """Process-wide cache of compressed bodies (COMPRESSION_CACHE_SIZE; 0 = off)."""
+    if settings.compression_cache_size <= 0:
+        return None
+    return TTLLRUCache(
+        max_size=settings.compression_cache_size, ttl=settings.compression_cache_ttl
+    )
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing responses with the best encoding the client accepts.
+
+    - complete bodies under `compression_min_size`, content types outside
+      `compression_content_types` and already encoded responses pass through
+    - complete bodies are compressed in one go; the result is cached by
+      content digest, so a hot list page is compressed once, not per request
+    - streamed bodies (e.g. the export) are compressed chunk by chunk, each
+      chunk flushed so the client gets it straight away, in constant memory
+    """
+
+    def __init__(self, app, settings: Settings, cache: TTLLRUCache | None = None) -> None:
+        self.app = app
+        self.encodings = [
+            encoding
+            for encoding in split_list(settings.compression_encodings)
+            if encoding in ENCODERS
+        ]
+        self.levels = {
+            "gzip": settings.compression_gzip_level,
+            "br": settings.compression_brotli_quality,
+            "zstd": settings.compression_zstd_level,
+        }
+        self.minimum_size = settings.compression_min_size
+        self.content_types = split_list(settings.compression_content_types)
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, CompressingSend(self, encoding, send))
+
+    def encoder(self, encoding: str) -> Encoder:
+        return ENCODERS[encoding](self.levels[encoding])
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if self.cache is None:
+            return self.encoder(encoding).compress(body, final=True)
+
+        key = ("compressed", encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self.encoder(encoding).compress(body, final=True)
+            self.cache.set(key, compressed)
+        return compressed
+
+
+class CompressingSend:
+    # `send` of one response: holds back the start message until the first
+    # body message shows whether (and how) to compress
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: dict | None = None
+        self.stream_encoder: Encoder | None = None
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+        elif self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            await self.first_message(start_message, message)
+        elif self.stream_encoder is not None and message["type"] == "http.response.body":
+            more_body = message.get("more_body", False)
+            body = self.stream_encoder.compress(message.get("body", b""), final=not more_body)
+            await self.send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+        else:
+            await self.send(message)
+
+    async def first_message(self, start_message, message) -> None:
+        headers = MutableHeaders(raw=start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if (
+            message["type"] != "http.response.body"
+            or "content-encoding" in headers
+            or not media_type_matches(
+                headers.get("content-type", ""), self.middleware.content_types
+            )
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        ):
+            await self.send(start_message)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        # ETag left as is: our tags name the hero's version, not these bytes,
+        # and If-Match compares them strongly (see app/etags.py)
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            del headers["Content-Length"]  # streamed as it comes
+            self.stream_encoder = self.middleware.encoder(self.encoding)
+            body = self.stream_encoder.compress(body)
+        else:
+            body = self.middleware.compress(self.encoding, body)
+            headers["Content-Length"] = str(len(body))
+
+        await self.send(start_message)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -6,6 +6,10 @@ class Settings(BaseSettings):
     # First: Create these variables in .env file
     # Check with this:
     db_engine: str = "sqlite"  # default db; (sqlite/ postgres)
+    db_stack: str = "sync"  # request path; (sync/ async)
+    # schema step on startup; (create/ check/ none): create_all, or only verify
+    # that alembic_version is at the migrations head (schema owned by Alembic)
+    db_startup_schema: str = "create"
 
     # sqlite settings (will be read from .env file)
     sqlite_file_name: str = "database.db"
@@ -17,6 +21,75 @@ class Settings(BaseSettings):
     postgres_port: int = 5432
     postgres_db: str | None = None
 
+    # Read replicas: GET /heroes/... sessions go to a replica, writes to the primary
+    db_replica_urls: str = ""  # comma-separated sync SQLAlchemy URLs; "" = none
+    db_replica_selection: str = "round_robin"  # (round_robin/ least_connections)
+    db_read_your_writes_seconds: float = 0.0  # pin a writer to the primary this long; 0 = off
+
+    # Bulk endpoints
+    bulk_chunk_size: int = 500  # rows per multi-row INSERT statement
+
+    # Hero read cache (per process; writes through HeroService keep it fresh)
+    hero_cache_backend: str = "memory"  # (memory/ none)
+    hero_cache_max_size: int = 10_000  # heroes kept; least recently used evicted first
+    hero_cache_ttl: float = 30.0  # seconds; bounds staleness from other processes
+    hero_count_cache_ttl: float = 30.0  # seconds; `count=cached` recounts this often
+
+    # Response compression (see app/compression.py)
+    compression_encodings: str = "zstd,br,gzip"  # preference order; "" = off
+    compression_min_size: int = 1024  # bytes; smaller complete bodies go out as is
+    compression_content_types: str = "application/json,application/x-ndjson,text/*"
+    compression_gzip_level: int = 6  # 1 (fast) .. 9 (small)
+    compression_brotli_quality: int = 4  # 0 .. 11; "br" needs `pip install brotli`
+    compression_zstd_level: int = 3  # 1 .. 22; "zstd" needs `pip install zstandard`
+    compression_cache_size: int = 256  # compressed bodies kept (by content); 0 = off
+    compression_cache_ttl: float = 300.0  # seconds
+
+    # Logging
+    log_dir: str = "logs"  # relative to the project root
+    log_queue: bool = True  # format + write logs on a background thread
+    log_queue_size: int = 10_000  # records buffered before the full-queue policy kicks in
+    log_queue_full_policy: str = "block"  # (block/ drop) when the queue is full
+    log_rotation: str = "none"  # app.log rotation; (none/ size/ time)
+    log_max_bytes: int = 10_000_000  # LOG_ROTATION=size
+    log_rotation_when: str = "midnight"  # LOG_ROTATION=time (TimedRotatingFileHandler)
+    log_backup_count: int = 5  # rotated files to keep
+    log_json: bool = False  # JSON lines instead of the text format
+
+    # SQL logging and request timing
+    db_echo: bool = False  # log every statement + params (debugging only; slow)
+    slow_query_threshold_ms: float = 200.0  # log statements slower than this; -1 = off
+    server_timing: bool = True  # Server-Timing header (app/ db/ serialize) on responses
+
+    # On-demand profiler (see app/profiling.py); off = not installed at all
+    profiling_enabled: bool = False
+    profiling_token: str = ""  # secret for the X-Profile-Token header; required when enabled
+    profiling_interval_ms: float = 1.0  # stack sampling interval (X-Profile: collapsed)
+
+    # Production server: `python -m app.server` (see app/server.py)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 1  # worker processes; 0 = one per CPU core
+    server_timeout_keep_alive: int = 5  # seconds an idle keep-alive connection stays open
+    server_timeout_graceful_shutdown: int = 30  # seconds in-flight requests get on shutdown
+    server_limit_max_requests: int = 0  # restart a worker after N requests; 0 = never
+
+    # Connection pool settings (postgres and file-based sqlite)
+    db_pool_size: int = 5  # connections kept open per process (i.e. per worker)
+    db_max_overflow: int = 10  # extra connections allowed under burst load
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = -1  # seconds before a connection is replaced; -1 = never
+    db_pool_pre_ping: bool = False  # test connections on checkout (stale conns)
+
+    # Statement caches (on top of the cached hero statements, see hero_repository.py)
+    db_query_cache_size: int = 500  # compiled SQL strings kept per engine; 0 = off
+    db_prepared_statement_cache_size: int = 100  # asyncpg prepared statements per connection
+
+    # sqlite pragmas (applied on every new connection)
+    sqlite_journal_mode: str = "wal"  # wal lets readers run alongside a writer
+    sqlite_synchronous: str = "normal"  # safe with wal; fewer fsyncs than "full"
+    sqlite_busy_timeout: int = 5000  # ms to wait on a locked db before failing
+
     # read env vars from .env file
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -42,6 +115,34 @@ class Settings(BaseSettings):
             message = f"Invalid or unsupported DB_ENGINE: {self.db_engine}"
             raise ValueError(message)
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def async_database_url(self) -> str:
+        """Same database as `database_url`, through an asyncio driver."""
+        if self.db_engine == "sqlite":
+            return self.database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        elif self.db_engine == "postgres":
+            return self.database_url.replace(
+                "postgresql+psycopg2://", "postgresql+asyncpg://", 1
+            )
+        else:
+            message = f"Invalid or unsupported DB_ENGINE: {self.db_engine}"
+            raise ValueError(message)
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.db_replica_urls.split(",") if url.strip()]
+
+    @property
+    def async_replica_urls(self) -> list[str]:
+        """Same replicas as `replica_urls`, through the asyncio drivers."""
+        return [
+            url.replace("sqlite://", "sqlite+aiosqlite://", 1).replace(
+                "postgresql+psycopg2://", "postgresql+asyncpg://", 1
+            )
+            for url in self.replica_urls
+        ]
+
 
 # Test with interactive ipynb in vscode itself (using Shift + Enter)
 if __name__ == "__main__":
@@ -49,3 +150,4 @@ if __name__ == "__main__":
     print(settings.db_engine)
     print(settings.sqlite_file_name)  # dabase.db
     print(settings.database_url)  # sqlite:///dabase.db
+    print(settings.async_database_url)  # sqlite+aiosqlite:///dabase.db
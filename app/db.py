@@ -1,12 +1,36 @@
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
 from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from sqlalchemy import (
+    AsyncAdaptedQueuePool,
+    Engine,
+    QueuePool,
+    StaticPool,
+    event,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.util import queue as sqla_queue
 from sqlmodel import create_engine
 
 from app.config import Settings
+from app.instrumentation import install_query_timing
+from app.replicas import ReplicaSelector
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 # sqlite_file_name = "database.db"
 # sqlite_url = f"sqlite:///{sqlite_file_name}"
 
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
 
 @lru_cache
 def get_settings():
@@ -17,33 +41,254 @@ def get_settings():
 settings = get_settings()
 
 
-def get_engine():
+class _TimedGetMixin:
+    """Report how long each `get()` of a pool's queue blocks (to `on_wait`)."""
+
+    on_wait: Callable[[float], None] | None = None
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)  # type: ignore[misc]
+        finally:
+            if self.on_wait is not None:
+                self.on_wait(time.perf_counter() - start)
+
+
+class _TimedQueue(_TimedGetMixin, sqla_queue.Queue):
+    pass
+
+
+class _TimedAsyncQueue(_TimedGetMixin, sqla_queue.AsyncAdaptedQueue):
+    pass
+
+
+class _CheckoutWaitMixin:
+    """
+    Record how long checkouts wait for a pooled connection (see `get_pool_stats`).
+
+    Only the wait in the pool's queue counts, not the time to open a new
+    connection; checkouts run on many threads at once, hence the lock.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self._pool.on_wait = self._record_wait  # type: ignore[attr-defined]
+
+    def _record_wait(self, waited: float) -> None:
+        with self._wait_lock:
+            self.wait_count += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+
+class TimedQueuePool(_CheckoutWaitMixin, QueuePool):
+    _queue_class = _TimedQueue
+
+
+class TimedAsyncQueuePool(_CheckoutWaitMixin, AsyncAdaptedQueuePool):
+    _queue_class = _TimedAsyncQueue
+
+
+def get_pool_options(is_async: bool = False) -> dict:
+    """Pool arguments for create_engine()/ create_async_engine() (from the .env file)."""
+    if settings.db_engine == "sqlite" and settings.sqlite_file_name == ":memory:":
+        # every connection to ":memory:" is a new, empty db -> share a single one
+        return {"poolclass": StaticPool}
+
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def set_sqlite_pragmas(engine: Engine) -> None:
+    """Apply journal_mode/ synchronous/ busy_timeout on every new sqlite connection."""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+        cursor.close()
+
+
+def get_engine(database_url: str | None = None):
     """
     Create engine based on the type of database.
 
     Returns engine conditionally as per the database.
-    The db URL needs to be changed in the .env file.
+    The db URL needs to be changed in the .env file (default: the primary's).
     """
-    if settings.database_url.startswith("sqlite"):
+    database_url = database_url or settings.database_url
+    if database_url.startswith("sqlite"):
         connect_args = {"check_same_thread": False}
         engine = create_engine(
-            settings.database_url,
-            echo=True,
+            database_url,
+            echo=settings.db_echo,
             connect_args=connect_args,  # only for sqlite
+            query_cache_size=settings.db_query_cache_size,
+            **get_pool_options(),
         )  # for sqlite
+        set_sqlite_pragmas(engine)
+        install_query_timing(engine, settings.slow_query_threshold_ms)
         return engine
-    elif settings.database_url.startswith("postgresql"):
+    elif database_url.startswith("postgresql"):
+        # psycopg2 has no server-side prepared statements: it sends each
+        # statement as text; the compiled cache still skips the SQL compilation
         engine = create_engine(
-            settings.database_url,
-            echo=True,
+            database_url,
+            echo=settings.db_echo,
+            query_cache_size=settings.db_query_cache_size,
+            **get_pool_options(),
         )  # for postgres
+        install_query_timing(engine, settings.slow_query_threshold_ms)
         return engine
     else:
-        message = f"Invalid {settings.database_url}"
+        message = f"Invalid {database_url}"
         raise ValueError(message)
 
 
-engine = get_engine()
+@lru_cache
+def get_sync_engine() -> Engine:
+    """
+    The process' engine (and its pool) for the sync request stack.
+
+    Built on first use, not at import: with several workers (`python -m
+    app.server`), each worker builds its own after it has started.
+    """
+    return get_engine()
+
+
+def create_async_db_engine(async_database_url: str) -> "AsyncEngine":
+    """Async counterpart of `get_engine` (aiosqlite/ asyncpg URL)."""
+    from sqlalchemy.ext.asyncio import create_async_engine  # DB_STACK=async only
+
+    if async_database_url.startswith("sqlite"):
+        async_engine = create_async_engine(
+            async_database_url,
+            echo=settings.db_echo,
+            connect_args={"check_same_thread": False},  # only for sqlite
+            query_cache_size=settings.db_query_cache_size,
+            **get_pool_options(is_async=True),
+        )
+        set_sqlite_pragmas(async_engine.sync_engine)
+    else:
+        # asyncpg prepares every statement server-side (parsed/ planned once
+        # per connection) and keeps the latest ones per connection
+        connect_args = {"prepared_statement_cache_size": settings.db_prepared_statement_cache_size}
+        async_engine = create_async_engine(
+            async_database_url,
+            echo=settings.db_echo,
+            connect_args=connect_args,
+            query_cache_size=settings.db_query_cache_size,
+            **get_pool_options(is_async=True),
+        )
+    install_query_timing(async_engine.sync_engine, settings.slow_query_threshold_ms)
+    return async_engine
+
+
+@lru_cache
+def get_async_engine() -> "AsyncEngine":
+    """
+    Create the asyncio engine (aiosqlite/ asyncpg) for the async request stack.
+
+    Built lazily on first use, so the async driver is only needed when
+    DB_STACK=async in the .env file.
+    """
+    return create_async_db_engine(settings.async_database_url)
+
+
+@lru_cache
+def get_replica_selector() -> ReplicaSelector[Engine] | None:
+    """Replica engines for read sessions (DB_REPLICA_URLS); None without replicas."""
+    if not settings.replica_urls:
+        return None
+    engines = [get_engine(url) for url in settings.replica_urls]
+    return ReplicaSelector(engines, settings.db_replica_selection)
+
+
+@lru_cache
+def get_async_replica_selector() -> "ReplicaSelector[AsyncEngine] | None":
+    """Async counterpart of `get_replica_selector`."""
+    if not settings.replica_urls:
+        return None
+    engines = [create_async_db_engine(url) for url in settings.async_replica_urls]
+    return ReplicaSelector(engines, settings.db_replica_selection)
+
+
+def _built_engines() -> list:
+    # the engines (sync and async, primary and replicas) this process has built
+    engines = []
+    if get_sync_engine.cache_info().currsize:
+        engines.append(get_sync_engine())
+    if get_async_engine.cache_info().currsize:
+        engines.append(get_async_engine())
+    for get_selector in (get_replica_selector, get_async_replica_selector):
+        if get_selector.cache_info().currsize and get_selector() is not None:
+            engines.extend(get_selector().engines)
+    return engines
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of the engines this process has built (shutdown)."""
+    for engine in _built_engines():
+        if hasattr(engine, "sync_engine"):  # AsyncEngine
+            await engine.dispose()
+        else:
+            engine.dispose()
+    for get_cached in (
+        get_sync_engine,
+        get_async_engine,
+        get_replica_selector,
+        get_async_replica_selector,
+    ):
+        get_cached.cache_clear()
+
+
+def _forget_pools_after_fork() -> None:
+    # a forked child (e.g. a preloading process manager) must not reuse, nor
+    # close, the connections its parent opened: drop them, the parent keeps them
+    for engine in _built_engines():
+        getattr(engine, "sync_engine", engine).dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_forget_pools_after_fork)
+
+
+def get_pool_stats(engine: Engine) -> dict:
+    """
+    Live connection pool numbers, for sizing DB_POOL_SIZE against the worker count.
+
+    `wait_*` is the time checkouts spent waiting for a free connection.
+    """
+    pool = engine.pool
+    stats: dict = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, _CheckoutWaitMixin):
+        avg = pool.wait_time_total / pool.wait_count if pool.wait_count else 0.0
+        stats.update(
+            checkouts=pool.wait_count,
+            wait_time_total_ms=round(pool.wait_time_total * 1000, 3),
+            wait_time_avg_ms=round(avg * 1000, 3),
+            wait_time_max_ms=round(pool.wait_time_max * 1000, 3),
+        )
+    return stats
 
 
 def create_db_and_tables():
@@ -55,4 +300,61 @@ def create_db_and_tables():
     """
     from app.models.hero_models import SQLModel  # import all models here
 
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.create_all(get_sync_engine())
+
+
+REVISION_LINE = re.compile(r"^(down_revision|revision)\b.*?=(.*)$", re.MULTILINE)
+REVISION_ID = re.compile(r"['\"](\w+)['\"]")
+
+
+@lru_cache
+def get_alembic_heads() -> tuple[str, ...]:
+    """
+    Head revision(s) of the migration scripts in migrations/versions/.
+
+    Read from the `revision`/ `down_revision` lines of the scripts, as text:
+    loading them through alembic's ScriptDirectory imports alembic and every
+    script, which costs more at startup than the create_all it replaces.
+    """
+    revisions, parents = set(), set()
+    for script in (ALEMBIC_INI.parent / "migrations" / "versions").glob("*.py"):
+        for name, value in REVISION_LINE.findall(script.read_text()):
+            ids = REVISION_ID.findall(value)
+            (revisions if name == "revision" else parents).update(ids)
+    return tuple(sorted(revisions - parents))
+
+
+@lru_cache
+def check_schema_at_head(engine: Engine) -> None:
+    """
+    Fail fast unless the database has every migration applied (`alembic upgrade head`).
+
+    One query against `alembic_version`, once per process (cached), instead of
+    create_all's catalog lookup of every table and index.
+    """
+    try:
+        with engine.connect() as conn:
+            current = conn.execute(text("SELECT version_num FROM alembic_version"))
+            revisions = tuple(sorted(current.scalars()))
+    except DBAPIError as exc:
+        message = "No alembic_version table in the database: run `alembic upgrade head`"
+        raise RuntimeError(message) from exc
+
+    heads = get_alembic_heads()
+    if revisions != heads:
+        message = (
+            f"Database schema is at {', '.join(revisions) or 'no revision'}, "
+            f"migrations head is {', '.join(heads)}: run `alembic upgrade head`"
+        )
+        raise RuntimeError(message)
+
+
+def prepare_schema() -> None:
+    """Startup step for the schema, as per DB_STARTUP_SCHEMA (create/ check/ none)."""
+    if settings.db_startup_schema == "create":
+        create_db_and_tables()
+    elif settings.db_startup_schema == "check":
+        check_schema_at_head(get_sync_engine())
+    elif settings.db_startup_schema != "none":
+        message = f"Invalid or unsupported DB_STARTUP_SCHEMA: {settings.db_startup_schema}"
+        raise ValueError(message)
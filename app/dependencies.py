@@ -1,30 +1,115 @@
+from functools import lru_cache
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Query, Request
 from sqlmodel import Session
 
-from app.db import engine
+from app.cache import CacheBackend, TTLLRUCache
+from app.db import get_replica_selector, get_sync_engine, settings
+from app.replicas import pinned_to_primary
 from app.repositories.hero_repository import HeroRepository
-from app.services.hero_service import HeroService
+from app.services.hero_service import HeroService, parse_fields
 
 
 def get_session():
-    with Session(engine) as session:
+    with Session(get_sync_engine()) as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_session)]
 
 
+def get_read_session(request: Request):
+    # reads go to a replica (DB_REPLICA_URLS), unless there is none or the
+    # client has just written (read-your-writes window): then to the primary
+    replicas = get_replica_selector()
+    if replicas is None or pinned_to_primary(request.cookies):
+        engine = get_sync_engine()
+    else:
+        engine = replicas.pick()
+        request.state.db_replica = True  # see `get_hero_read_service`
+    with Session(engine) as session:
+        yield session
+
+
+ReadSessionDep = Annotated[Session, Depends(get_read_session)]
+
+
 def get_hero_repository(session: SessionDep) -> HeroRepository:
-    return HeroRepository(session=session)
+    return HeroRepository(session=session, bulk_chunk_size=settings.bulk_chunk_size)
 
 
 HeroRepoDep = Annotated[HeroRepository, Depends(get_hero_repository)]
 
 
-def get_hero_service(repo: HeroRepoDep) -> HeroService:
-    return HeroService(repo=repo)
+@lru_cache
+def get_hero_cache() -> CacheBackend | None:
+    """Process-wide hero cache (HERO_CACHE_BACKEND in the .env file)."""
+    if settings.hero_cache_backend == "memory":
+        return TTLLRUCache(
+            max_size=settings.hero_cache_max_size, ttl=settings.hero_cache_ttl
+        )
+    elif settings.hero_cache_backend == "none":
+        return None
+    else:
+        message = f"Invalid or unsupported HERO_CACHE_BACKEND: {settings.hero_cache_backend}"
+        raise ValueError(message)
+
+
+HeroCacheDep = Annotated[CacheBackend | None, Depends(get_hero_cache)]
+
+
+@lru_cache
+def get_hero_count_cache() -> CacheBackend | None:
+    """
+    Process-wide total for `count=cached`: a one-entry cache with its own TTL.
+
+    Kept apart from the hero cache, so hero traffic neither evicts it nor
+    shows up in its hit/ miss counters.
+    """
+    if settings.hero_cache_backend == "none":
+        return None
+    return TTLLRUCache(max_size=1, ttl=settings.hero_count_cache_ttl)
+
+
+HeroCountCacheDep = Annotated[CacheBackend | None, Depends(get_hero_count_cache)]
+
+
+def get_hero_service(
+    repo: HeroRepoDep, cache: HeroCacheDep, count_cache: HeroCountCacheDep
+) -> HeroService:
+    return HeroService(repo=repo, cache=cache, count_cache=count_cache)
 
 
 HeroServiceDep = Annotated[HeroService, Depends(get_hero_service)]
+
+
+def get_hero_read_service(
+    request: Request,
+    session: ReadSessionDep,
+    cache: HeroCacheDep,
+    count_cache: HeroCountCacheDep,
+) -> HeroService:
+    # GET endpoints only: the session may be on a (lagging) replica, whose rows
+    # must not fill the cache (a writer pinned to the primary reads it too)
+    repo = HeroRepository(session=session, bulk_chunk_size=settings.bulk_chunk_size)
+    fill_cache = not getattr(request.state, "db_replica", False)
+    return HeroService(
+        repo=repo, cache=cache, count_cache=count_cache, fill_cache=fill_cache
+    )
+
+
+HeroReadServiceDep = Annotated[HeroService, Depends(get_hero_read_service)]
+
+
+def get_hero_fields(
+    fields: Annotated[
+        str | None, Query(description="Comma-separated HeroPublic fields, e.g. id,name")
+    ] = None,
+) -> tuple[str, ...] | None:
+    # sparse fieldset: None -> the whole HeroPublic
+    return parse_fields(fields) if fields is not None else None
+
+
+HeroFieldsDep = Annotated[tuple[str, ...] | None, Depends(get_hero_fields)]
+
@@ -0,0 +1,48 @@
+import re
+from collections.abc import Iterable
+
+# one entity-tag, or "*"; a quoted tag may itself contain commas ("3-name,id")
+ETAG_PATTERN = re.compile(r'\*|(?:W/)?"[^"]*"')
+
+
+# Entity tags for single heroes, derived from `Hero.version`
+def make_etag(version: int, fields: Iterable[str] | None = None) -> str:
+    """
+    Strong ETag for a hero at `version`: "3", or "3-name,id" for a sparse fieldset.
+
+    The fieldset is part of the tag because it is a different representation
+    of the same hero; the version alone is what conditional writes compare.
+    """
+    if fields is None:
+        return f'"{version}"'
+    return f'"{version}-{",".join(fields)}"'
+
+
+def parse_etags(header: str) -> list[str]:
+    # "a", W/"b" -> ['"a"', 'W/"b"']
+    return ETAG_PATTERN.findall(header)
+
+
+def none_match(header: str, etag: str) -> bool:
+    """If-None-Match (weak comparison): True when the client's copy is current."""
+    tags = parse_etags(header)
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def match_versions(header: str) -> list[int] | None:
+    """
+    Versions an If-Match header accepts; None for "*" (any current version).
+
+    Strong comparison: weak tags never match, and anything that is not one of
+    our tags is simply left out (so an all-foreign header matches nothing).
+    """
+    tags = parse_etags(header)
+    if "*" in tags:
+        return None
+    versions = []
+    for tag in tags:
+        if tag.startswith('"') and tag.endswith('"'):
+            version = tag[1:-1].split("-", 1)[0]
+            if version.isdigit():
+                versions.append(int(version))
+    return versions
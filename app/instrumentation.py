@@ -0,0 +1,170 @@
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+
+from app import metrics
+from app.logging_config import get_logger
+
+# Dedicated logger, so slow queries can be routed/ filtered on their own
+slow_query_logger = get_logger("app.slow_query")
+
+# Outcome of the compiled cache lookup (CacheStats: CACHE_HIT, CACHE_MISS, ...)
+# of every statement executed by this process, on all instrumented engines
+compiled_cache_counts: Counter[str] = Counter()
+
+# ASGI scope of the request being served (routing fills in scope["route"])
+_request_scope: ContextVar[dict | None] = ContextVar("request_scope", default=None)
+
+
+@dataclass
+class RequestTimings:
+    # where the time of one request went; filled in by the db hooks and
+    # `serialization_timer()` (from threadpool handlers too: same object)
+    db_seconds: float = 0.0
+    db_statements: int = 0
+    serialization_seconds: float = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        # Server-Timing header value; durations in milliseconds
+        return (
+            f"app;dur={total_seconds * 1000:.2f}, "
+            f'db;dur={self.db_seconds * 1000:.2f};desc="statements={self.db_statements}", '
+            f"serialize;dur={self.serialization_seconds * 1000:.2f}"
+        )
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware that makes the current request visible to db event hooks,
+    and times it.
+
+    The scope dict is shared with the router, so the matched route is
+    available by the time any statement runs (also in threadpool handlers,
+    which run in a copy of this context).
+
+    Every response gets a `Server-Timing` header (time until the response
+    starts, db time/ statement count, JSON serialisation), and each request
+    is recorded in the `/metrics` histograms, labelled by method and route.
+    """
+
+    def __init__(self, app, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        start = time.perf_counter()
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        scope_token = _request_scope.set(scope)
+        timings_token = _request_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(timings_token)
+            _request_scope.reset(scope_token)
+            record_request(scope, timings, time.perf_counter() - start)
+
+
+def route_labels(scope: dict) -> tuple[str, str]:
+    # route template, never the raw path (that would be one series per hero id)
+    path = getattr(scope.get("route"), "path", None) or "unmatched"
+    return scope.get("method", ""), path
+
+
+def record_request(scope: dict, timings: RequestTimings, duration_seconds: float) -> None:
+    labels = route_labels(scope)
+    metrics.request_duration.observe(labels, duration_seconds)
+    metrics.request_db_duration.observe(labels, timings.db_seconds)
+    metrics.request_db_statements.observe(labels, timings.db_statements)
+    metrics.request_serialization_duration.observe(labels, timings.serialization_seconds)
+
+
+@contextmanager
+def serialization_timer() -> Iterator[None]:
+    """Count the time spent in the block as JSON serialisation of the current request."""
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialization_seconds += time.perf_counter() - start
+
+
+def current_route() -> str | None:
+    """Route of the current request, e.g. "GET /heroes/{hero_id}" (None outside requests)."""
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path")
+    return f"{scope.get('method')} {path}"
+
+
+def install_query_timing(engine: Engine, slow_query_threshold_ms: float) -> None:
+    """
+    Time every statement: add it to the current request's timings, and log it
+    when it takes `slow_query_threshold_ms` or longer (negative = no log).
+
+    A statement costs two perf_counter() calls; parameters are never logged.
+    Also counts the engine's compiled cache hits/ misses (`compiled_cache_counts`).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is not None:
+            compiled_cache_counts[cache_hit.name] += 1
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.db_seconds += duration
+            timings.db_statements += 1
+
+        duration_ms = duration * 1000
+        if slow_query_threshold_ms < 0 or duration_ms < slow_query_threshold_ms:
+            return
+
+        route = current_route()
+        statement = " ".join(statement.split())
+        slow_query_logger.warning(
+            "Slow query: %.1f ms | route=%s | %s",
+            duration_ms,
+            route,
+            statement,
+            extra={"duration_ms": round(duration_ms, 3), "route": route, "statement": statement},
+        )
+
+
+def get_compiled_cache_stats() -> dict:
+    """Compiled cache outcomes since start, with the hit rate of the cacheable ones."""
+    hits, misses = compiled_cache_counts["CACHE_HIT"], compiled_cache_counts["CACHE_MISS"]
+    hit_rate = hits / (hits + misses) if hits + misses else None
+    return {**compiled_cache_counts, "hit_rate": hit_rate}
@@ -1,20 +1,119 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
 from pathlib import Path
 
+from app.config import Settings
 
-# Configure root (global) logging once (console only; no file)
-def setup_logging(level: int = logging.INFO) -> None:
+# Background thread that formats + writes records in queue mode (see setup_logging)
+_listener: QueueListener | None = None
+_queue_handler: "BoundedQueueHandler | None" = None
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including `extra=` fields (no %-style format string)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue: block until there is room, or drop the record.
+
+    Only the message itself is resolved in the calling thread; the handlers
+    behind the QueueListener do the formatting and the I/O.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = True) -> None:
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()  # args may change after the call returns
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _file_handler(log_file: Path, settings: Settings) -> logging.Handler:
+    if settings.log_rotation == "size":
+        return RotatingFileHandler(
+            log_file,
+            maxBytes=settings.log_max_bytes,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8",
+        )
+    elif settings.log_rotation == "time":
+        return TimedRotatingFileHandler(
+            log_file,
+            when=settings.log_rotation_when,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8",
+        )
+    elif settings.log_rotation == "none":
+        # FileHandler() automatically creates the log_file if it doesn't already exists
+        return logging.FileHandler(log_file, encoding="utf-8")
+    else:
+        message = f"Invalid or unsupported LOG_ROTATION: {settings.log_rotation}"
+        raise ValueError(message)
+
+
+# Configure root (global) logging once
+def setup_logging(level: int = logging.INFO, settings: Settings | None = None) -> None:
     """
     Set up basic logging configuration for the entire app.
 
     Set up logging to file + console.
+    With LOG_QUEUE=true (default) the root logger only gets a QueueHandler and
+    a QueueListener thread does the formatting and writing, so log calls never
+    wait on disk or stdout.
     """
+    global _listener, _queue_handler
+    settings = settings or Settings()
+    if settings.log_queue_full_policy not in ("block", "drop"):
+        message = f"Invalid LOG_QUEUE_FULL_POLICY: {settings.log_queue_full_policy}"
+        raise ValueError(message)
 
     # NOTE: go to the proejct's root dir from this file (test manually)
     root_dir = Path(__file__).resolve().parent.parent
 
     # Create /logs/ folder at root
-    log_dir = root_dir / "logs"  # gitignore files in it `logs/`
+    log_dir = root_dir / settings.log_dir  # gitignore files in it `logs/`
     log_dir.mkdir(exist_ok=True)  # create dir if doesn't already exists
 
     # Create app.log file
@@ -23,27 +122,69 @@ def setup_logging(level: int = logging.INFO) -> None:
     log_file.touch(exist_ok=True)  # create file if doesn't already exists
 
     log_format = "LOG: %(name)s: %(asctime)s | %(levelname)s | %(filename)s:%(lineno)s >>> %(message)s"
+    formatter = JsonFormatter() if settings.log_json else logging.Formatter(log_format)
 
-    # FileHandler() automatically creates the log_file if it doesn't already exists
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter(log_format))
+    file_handler = _file_handler(log_file, settings)
+    file_handler.setFormatter(formatter)
 
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(log_format))
+    console_handler.setFormatter(formatter)
 
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
     # Clear existing handlers (b/c of implicit "uvicorn --reload")
+    stop_logging()
     root_logger.handlers.clear()  # safe from `uvicorn --reload`
 
-    # Add all handlers to root logger
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    if settings.log_queue:
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+        _queue_handler = BoundedQueueHandler(
+            log_queue, block=settings.log_queue_full_policy == "block"
+        )
+        _listener = QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        root_logger.addHandler(_queue_handler)
+    else:
+        # Add all handlers to root logger
+        root_logger.addHandler(file_handler)
+        root_logger.addHandler(console_handler)
 
     # Silence the watchfies.main INFO logs (while keeping --realod working)
     logging.getLogger("watchfiles").setLevel(logging.WARNING)
 
+    # Our pool classes log under their own names (app.db.<class>), not under
+    # "sqlalchemy" (WARN by default) -> no "Pool disposed"/ "Pool recreating" INFO
+    for pool_class in ("TimedQueuePool", "TimedAsyncQueuePool"):
+        logging.getLogger(f"app.db.{pool_class}").setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    """Flush the queue and stop the listener thread (no-op outside queue mode)."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()  # writes out every record still in the queue
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _queue_handler = None
+
+
+def get_logging_stats() -> dict:
+    """Queue depth and dropped records (LOG_QUEUE_FULL_POLICY=drop) of queue mode."""
+    if _queue_handler is None:
+        return {"queue": False}
+    return {
+        "queue": True,
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+    }
+
+
+atexit.register(stop_logging)
+
 
 # Get a module specific logger
 def get_logger(name: str) -> logging.Logger:
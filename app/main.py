@@ -1,20 +1,69 @@
+import os
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from app.db import create_db_and_tables
-from app.logging_config import get_logger, setup_logging
-from app.routers import hero_router
+from app.compression import CompressionMiddleware, get_compression_cache
+from app.db import dispose_engines, prepare_schema, settings
+from app.instrumentation import RequestContextMiddleware
+from app.logging_config import get_logger, setup_logging, stop_logging
+from app.replicas import ReadYourWritesMiddleware
+from app.routers import metrics_router, monitoring_router
 
-# Initialize logging and create logger for this module
-setup_logging()
 logger = get_logger(__name__)
 
-app = FastAPI()
-logger.info("API is ready.")
 
-app.include_router(hero_router.router)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # runs in every worker process, after it has started (see app/server.py)
+    setup_logging(settings=settings)
+    start = time.perf_counter()
+    prepare_schema()
+    logger.info(
+        "Database schema: %s (%.1f ms).",
+        settings.db_startup_schema,
+        (time.perf_counter() - start) * 1000,
+    )
+    logger.info("API is ready (pid %s).", os.getpid())
+    yield
+    logger.info("Shutting down.")
+    await dispose_engines()  # close pooled connections
+    stop_logging()  # flush queued log records
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestContextMiddleware, server_timing=settings.server_timing)
+app.add_middleware(
+    CompressionMiddleware, settings=settings, cache=get_compression_cache()
+)
+if settings.db_read_your_writes_seconds > 0:
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.db_read_your_writes_seconds)
+if settings.profiling_enabled:
+    if not settings.profiling_token:
+        raise ValueError("PROFILING_TOKEN must be set when PROFILING_ENABLED=true")
+    from app.profiling import ProfilingMiddleware
+
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profiling_token,
+        interval_ms=settings.profiling_interval_ms,
+    )
+
+# DB_STACK picks the request path: sync handlers (threadpool) or async handlers;
+# only that stack is imported (the async one pulls in sqlalchemy's asyncio extension)
+if settings.db_stack == "sync":
+    from app.routers import hero_router
+
+    app.include_router(hero_router.router)
+elif settings.db_stack == "async":
+    from app.routers import async_hero_router
+
+    app.include_router(async_hero_router.router)
+else:
+    message = f"Invalid or unsupported DB_STACK: {settings.db_stack}"
+    raise ValueError(message)
 
+app.include_router(monitoring_router.router)
+app.include_router(metrics_router.router)
 
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-    logger.info("Connected database and created tables.")
@@ -0,0 +1,114 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Sequence
+
+# Prometheus histograms for `GET /metrics`, kept in process (no client library).
+# Every worker process has its own: scrape each worker, or sum them upstream.
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    A labelled histogram, rendered in the Prometheus text format.
+
+    Thread-safe (sync handlers run on the threadpool); `observe()` is one
+    bisect and three additions under a lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = SECONDS_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)  # first bucket with value <= le
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = [
+                (labels, list(counts), total, count)
+                for labels, (counts, total, count) in self._series.items()
+            ]
+
+        for labels, counts, total, count in sorted(snapshot):
+            label_text = ",".join(
+                f'{name}="{escape_label(value)}"'
+                for name, value in zip(self.labelnames, labels)
+            )
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total!r}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+# Per request, labelled by method and route template ("/heroes/{hero_id}")
+REQUEST_LABELS = ("method", "route")
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time from the request to the end of the response body.",
+    REQUEST_LABELS,
+)
+request_db_duration = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing database statements, per request.",
+    REQUEST_LABELS,
+)
+request_db_statements = Histogram(
+    "http_request_db_statements",
+    "Database statements executed, per request.",
+    REQUEST_LABELS,
+    buckets=STATEMENT_BUCKETS,
+)
+request_serialization_duration = Histogram(
+    "http_request_serialization_duration_seconds",
+    "Time spent writing JSON response bodies, per request.",
+    REQUEST_LABELS,
+)
+
+HISTOGRAMS = (
+    request_duration,
+    request_db_duration,
+    request_db_statements,
+    request_serialization_duration,
+)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    return "\n".join(line for histogram in HISTOGRAMS for line in histogram.render()) + "\n"
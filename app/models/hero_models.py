@@ -1,15 +1,52 @@
+from enum import Enum
+
+from pydantic import model_validator
+from sqlalchemy import DDL, event
 from sqlmodel import Field, SQLModel
 
 
 class HeroBase(SQLModel):
     name: str = Field(index=True)
     age: int | None = Field(default=None, index=True)
-    gender: str | None = None
+    gender: str | None = Field(default=None, index=True)
 
 
 class Hero(HeroBase, table=True):
     id: int | None = Field(default=None, primary_key=True)
     secret_name: str
+    # bumped by every update; served as the hero's ETag (not part of HeroPublic)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+
+
+# Full-text index on hero.name for GET /heroes/search, kept in sync by the db itself
+# (created along with the table; `migrations/versions` adds it to existing dbs):
+# - sqlite: FTS5 external-content table `hero_fts` + insert/ update/ delete triggers
+# - postgres: generated `name_tsv` tsvector column + GIN index
+HERO_SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE hero_fts USING fts5(name, content='hero', content_rowid='id')",
+        """CREATE TRIGGER hero_fts_insert AFTER INSERT ON hero BEGIN
+            INSERT INTO hero_fts(rowid, name) VALUES (new.id, new.name);
+        END""",
+        """CREATE TRIGGER hero_fts_delete AFTER DELETE ON hero BEGIN
+            INSERT INTO hero_fts(hero_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END""",
+        """CREATE TRIGGER hero_fts_update AFTER UPDATE OF name ON hero BEGIN
+            INSERT INTO hero_fts(hero_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO hero_fts(rowid, name) VALUES (new.id, new.name);
+        END""",
+    ],
+    "postgresql": [
+        """ALTER TABLE hero ADD COLUMN name_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', name)) STORED""",
+        "CREATE INDEX ix_hero_name_tsv ON hero USING gin (name_tsv)",
+    ],
+}
+for dialect, statements in HERO_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(
+            Hero.__table__, "after_create", DDL(statement).execute_if(dialect=dialect)
+        )
 
 
 class HeroPublic(HeroBase):
@@ -25,3 +62,57 @@ class HeroUpdate(HeroBase):
     age: int | None = None
     secret_name: str | None = None
     gender: str | None = None
+
+
+class HeroBulkUpdate(HeroUpdate):
+    id: int
+
+    @model_validator(mode="after")
+    def check_has_changes(self):
+        # an item with only "id" would change nothing but its version
+        if not self.model_fields_set - {"id"}:
+            raise ValueError("No fields to update")
+        # explicit nulls for NOT NULL columns would fail the whole batch's UPDATE
+        for field in ("name", "secret_name"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+
+class HeroBulkResult(SQLModel):
+    ids: list[int]  # heroes updated/ deleted
+    not_found: list[int]
+
+
+# Columns GET /heroes/ can be ordered (and keyset-paginated) by; `id` is the tiebreaker
+class HeroOrderBy(str, Enum):
+    id = "id"
+    name = "name"
+    age = "age"
+
+
+class SortDirection(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+# Query filters of GET /heroes/; each one compiles to a predicate on an indexed column
+class HeroFilter(SQLModel):
+    name: str | None = None  # exact match
+    name_prefix: str | None = None
+    age_min: int | None = None  # inclusive
+    age_max: int | None = None  # inclusive
+    gender: str | None = None
+
+
+# How GET /heroes/?count= computes X-Total-Count
+class HeroCountMode(str, Enum):
+    exact = "exact"  # COUNT(*), honours the filters
+    estimated = "estimated"  # planner statistics, whole table
+    cached = "cached"  # cached COUNT(*) kept current by writes, whole table
+
+
+# Formats of GET /heroes/export
+class HeroExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
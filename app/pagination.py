@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+
+# Opaque cursor for keyset (seek) pagination
+def encode_cursor(order_by: str, value: Any, hero_id: int) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    The cursor carries the column it was built for, the column value and the id
+    tiebreaker, so the next page can seek straight past that row.
+    """
+    payload = json.dumps({"k": order_by, "v": value, "id": hero_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, Any, int]:
+    """
+    Decode a cursor built by `encode_cursor()`.
+
+    Returns (order_by, value, hero_id); raises ValueError for anything malformed.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        order_by, value, hero_id = payload["k"], payload["v"], payload["id"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    if not isinstance(order_by, str) or type(hero_id) is not int:
+        raise ValueError("Invalid cursor")
+    return order_by, value, hero_id
@@ -0,0 +1,146 @@
+import asyncio
+import cProfile
+import hmac
+import marshal
+import sys
+import threading
+import time
+from collections import Counter
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_FORMATS = ("pstats", "collapsed")
+
+
+class StackSampler:
+    """
+    Sampling profiler: every `interval` seconds, the Python stack of every
+    other thread is counted, as collapsed stacks ("thread;outer;...;inner N"),
+    the input format of flamegraph.pl/ speedscope/ inferno.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        thread_names: dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if thread_id not in thread_names:  # threadpool threads come and go
+                    thread_names.update((t.ident, t.name) for t in threading.enumerate())
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling single requests on demand (PROFILING_ENABLED).
+
+    A request with `X-Profile: pstats` or `X-Profile: collapsed` and the
+    matching `X-Profile-Token` runs as usual, body included, but its response
+    is replaced by the profile:
+    - pstats: a cProfile dump (`pstats.Stats(path)`, snakeviz, ...)
+    - collapsed: sampled stacks for a flamegraph
+
+    The original status and duration come back as `X-Profiled-Status`/
+    `X-Profiled-Duration-Ms`. A wrong token is a 403; one profile runs at a
+    time (409 while busy). Both profilers see the whole process (cProfile
+    uses sys.monitoring on Python 3.12+), so threadpool handlers are
+    included, and so is whatever else the process does meanwhile: profile
+    on a quiet instance.
+
+    Only installed when enabled; then other requests pay one header lookup.
+    """
+
+    def __init__(self, app, token: str, interval_ms: float = 1.0) -> None:
+        self.app = app
+        self.token = token.encode()
+        self.interval = interval_ms / 1000
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        profile_format = headers.get("x-profile")
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = headers.get("x-profile-token", "").encode()
+        if not hmac.compare_digest(token, self.token):
+            response = PlainTextResponse("Invalid profiling token", status_code=403)
+        elif profile_format not in PROFILE_FORMATS:
+            message = f"X-Profile must be one of: {', '.join(PROFILE_FORMATS)}"
+            response = PlainTextResponse(message, status_code=400)
+        elif self._lock.locked():
+            response = PlainTextResponse("Another request is being profiled", status_code=409)
+        else:
+            async with self._lock:
+                response = await self.profile(scope, receive, profile_format)
+        await response(scope, receive, send)
+
+    async def profile(self, scope, receive, profile_format: str) -> Response:
+        status = 500
+
+        async def discard(message) -> None:
+            # the response is replaced by the profile; only its status is kept
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        start = time.perf_counter()
+        if profile_format == "pstats":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.disable()
+            profiler.create_stats()
+            content, media_type = marshal.dumps(profiler.stats), "application/octet-stream"
+        else:
+            with StackSampler(self.interval) as sampler:
+                await self.app(scope, receive, discard)
+            content, media_type = sampler.collapsed(), "text/plain"
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        logger.info(
+            "Profiled %s %s (%s, %.1f ms)", scope["method"], scope["path"], status, duration_ms
+        )
+        headers = {
+            "X-Profiled-Status": str(status),
+            "X-Profiled-Duration-Ms": f"{duration_ms:.1f}",
+        }
+        if profile_format == "pstats":
+            headers["Content-Disposition"] = 'attachment; filename="profile.pstats"'
+        return Response(content, media_type=media_type, headers=headers)
@@ -0,0 +1,85 @@
+import itertools
+import math
+import time
+from collections.abc import Mapping, Sequence
+from typing import Generic, TypeVar
+
+from sqlalchemy import QueuePool
+from starlette.datastructures import MutableHeaders
+
+E = TypeVar("E")  # Engine or AsyncEngine
+
+REPLICA_SELECTIONS = ("round_robin", "least_connections")
+PRIMARY_COOKIE = "db_primary_until"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def checked_out(engine) -> int:
+    """Connections of `engine` (sync or async) in use by this process right now."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+class ReplicaSelector(Generic[E]):
+    """
+    Picks the replica engine for a read session (DB_REPLICA_SELECTION).
+
+    - round_robin: each replica in turn
+    - least_connections: the replica with the fewest connections checked out
+      by this process (each worker only sees its own pools)
+    """
+
+    def __init__(self, engines: Sequence[E], selection: str = "round_robin") -> None:
+        if not engines:
+            raise ValueError("ReplicaSelector needs at least one replica engine")
+        if selection not in REPLICA_SELECTIONS:
+            message = f"Invalid or unsupported DB_REPLICA_SELECTION: {selection}"
+            raise ValueError(message)
+        self.engines = tuple(engines)
+        self.selection = selection
+        self._turn = itertools.count()  # next() is atomic under the GIL: no lock
+
+    def pick(self) -> E:
+        if self.selection == "least_connections":
+            return min(self.engines, key=checked_out)
+        return self.engines[next(self._turn) % len(self.engines)]
+
+
+def pinned_to_primary(cookies: Mapping[str, str]) -> bool:
+    """True while the client's read-your-writes window (set after a write) is open."""
+    try:
+        return float(cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware pinning a client to the primary right after it writes.
+
+    A successful POST/ PUT/ PATCH/ DELETE response sets the `db_primary_until`
+    cookie (expiry time, `window` seconds ahead); while it holds, the read
+    sessions of that client go to the primary instead of a replica (see
+    `get_read_session`), so it sees its own writes despite replication lag.
+    Other clients keep reading from the replicas.
+    """
+
+    def __init__(self, app, window: float) -> None:
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                MutableHeaders(scope=message).append("set-cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,224 @@
+from collections.abc import AsyncIterator, Collection
+from typing import Any
+
+from sqlalchemy import delete, func, insert, update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.hero_models import (
+    Hero,
+    HeroFilter,
+    HeroOrderBy,
+    HeroPublic,
+    SortDirection,
+)
+from app.repositories.hero_repository import (
+    PG_ESTIMATE,
+    SQLITE_ESTIMATE,
+    SELECT_VERSION,
+    SQLITE_HAS_STATS,
+    is_nullable,
+    select_after,
+    select_count,
+    select_nulls_after,
+    select_one,
+    select_page,
+    select_search,
+)
+
+
+class AsyncHeroRepository:
+    """Async twin of `HeroRepository`, used when DB_STACK=async."""
+
+    def __init__(self, session: AsyncSession, bulk_chunk_size: int = 500) -> None:
+        self.session = session
+        self.bulk_chunk_size = bulk_chunk_size
+
+    async def create(self, db_hero: Hero) -> Hero:
+        self.session.add(db_hero)
+        await self.session.commit()
+        await self.session.refresh(db_hero)
+        return db_hero
+
+    async def create_many(self, db_heroes: list[Hero]) -> list[Hero]:
+        """Same chunked multi-row INSERT .. RETURNING as `HeroRepository.create_many()`."""
+        dialect = self.session.bind.dialect
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            table = Hero.__table__
+            statement = insert(table).returning(*table.c, sort_by_parameter_order=True)
+            rows = [hero.model_dump(exclude={"id"}) for hero in db_heroes]
+            created = []
+            for start in range(0, len(rows), self.bulk_chunk_size):
+                chunk = rows[start : start + self.bulk_chunk_size]
+                result = await self.session.exec(statement, params=chunk)
+                created.extend(Hero.model_validate(row._mapping) for row in result)
+        else:
+            self.session.add_all(db_heroes)
+            await self.session.flush()
+            created = [Hero.model_validate(hero.model_dump()) for hero in db_heroes]
+
+        await self.session.commit()
+        return created
+
+    async def read_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        *,
+        order_by: HeroOrderBy = HeroOrderBy.id,
+        direction: SortDirection = SortDirection.asc,
+        filters: HeroFilter | None = None,
+        after: tuple[Any, int] | None = None,
+        columns: tuple[str, ...] | None = None,
+    ):
+        """Same paging modes, filters and projection as `HeroRepository.read_many()`."""
+        query = {"direction": direction, "filters": filters, "columns": columns}
+        if after is None:
+            statement, params = select_page(order_by, offset, limit, **query)
+            heroes = (await self.session.exec(statement, params=params)).all()
+            return heroes
+
+        value, after_id = after
+        heroes = []
+        if value is not None:
+            statement, params = select_after(order_by, value, after_id, limit, **query)
+            heroes = list((await self.session.exec(statement, params=params)).all())
+            after_id = None
+
+        if is_nullable(order_by) and len(heroes) < limit:
+            statement, params = select_nulls_after(
+                order_by, after_id, limit - len(heroes), **query
+            )
+            heroes.extend((await self.session.exec(statement, params=params)).all())
+        return heroes
+
+    async def _existing_ids(self, ids: list[int]) -> set[int]:
+        found: set[int] = set()
+        for start in range(0, len(ids), self.bulk_chunk_size):
+            chunk = ids[start : start + self.bulk_chunk_size]
+            found.update(await self.session.exec(select(Hero.id).where(col(Hero.id).in_(chunk))))
+        return found
+
+    async def update_many(self, updates: list[dict]) -> list[int]:
+        """Same bulk UPDATE by primary key as `HeroRepository.update_many()`."""
+        found = await self._existing_ids([data["id"] for data in updates])
+        rows = [data for data in updates if data["id"] in found and len(data) > 1]
+        if rows:
+            await self.session.exec(update(Hero), params=rows)
+            ids = [data["id"] for data in rows]
+            for start in range(0, len(ids), self.bulk_chunk_size):
+                chunk = ids[start : start + self.bulk_chunk_size]
+                await self.session.exec(
+                    update(Hero)
+                    .where(col(Hero.id).in_(chunk))
+                    .values(version=col(Hero.version) + 1)
+                )
+        await self.session.commit()
+        return sorted(found)
+
+    async def delete_many(self, ids: list[int]) -> list[int]:
+        """Same chunked DELETE .. WHERE id IN (..) as `HeroRepository.delete_many()`."""
+        deleted: set[int] = set()
+        use_returning = self.session.bind.dialect.delete_returning
+        for start in range(0, len(ids), self.bulk_chunk_size):
+            chunk = ids[start : start + self.bulk_chunk_size]
+            statement = delete(Hero).where(col(Hero.id).in_(chunk))
+            if use_returning:
+                result = await self.session.exec(statement.returning(col(Hero.id)))
+                deleted.update(result.scalars())
+            else:
+                deleted.update(await self._existing_ids(chunk))
+                await self.session.exec(statement)
+        await self.session.commit()
+        return sorted(deleted)
+
+    async def stream_public(self, batch_size: int = 1000) -> AsyncIterator[list[Any]]:
+        """
+        Every hero's public columns as plain rows, ordered by id, `batch_size`
+        rows at a time (a list per batch): `AsyncSession.stream()` reads them
+        from a server-side cursor, like `HeroRepository.stream_public()`.
+        """
+        columns = [col(getattr(Hero, name)) for name in HeroPublic.model_fields]
+        statement = (
+            select(*columns)
+            .order_by(col(Hero.id))
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(statement)
+        async for batch in result.partitions():
+            yield batch
+
+    async def count(self, filters: HeroFilter | None = None) -> int:
+        statement, params = select_count(filters)
+        return (await self.session.exec(statement, params=params)).one()
+
+    async def estimate_count(self) -> int | None:
+        """Same statistics as `HeroRepository.estimate_count()`."""
+        if self.session.get_bind().dialect.name == "postgresql":
+            estimate = (await self.session.exec(PG_ESTIMATE)).scalar()
+            return estimate if estimate is not None and estimate >= 0 else None
+
+        if (await self.session.exec(SQLITE_HAS_STATS)).first():
+            estimate = (await self.session.exec(SQLITE_ESTIMATE)).scalar()
+            if estimate is not None:
+                return estimate
+        return (await self.session.exec(select(func.max(Hero.id)))).one() or 0
+
+    async def search(self, terms: list[str], offset: int = 0, limit: int = 100):
+        """Same ranked full-text match as `HeroRepository.search()`."""
+        dialect = self.session.bind.dialect.name
+        statement, params = select_search(dialect, terms, offset, limit)
+        heroes = (await self.session.exec(statement, params=params)).all()
+        return heroes
+
+    async def read_one(self, hero_id: int, columns: tuple[str, ...] | None = None):
+        if columns is not None:
+            statement, params = select_one(hero_id, columns)
+            return (await self.session.exec(statement, params=params)).first()
+
+        hero = await self.session.get(Hero, hero_id)
+        return hero
+
+    async def read_version(self, hero_id: int) -> int | None:
+        params = {"hero_id": hero_id}
+        return (await self.session.exec(SELECT_VERSION, params=params)).first()
+
+    async def update_by_id(
+        self,
+        hero_id: int,
+        hero_data: dict,
+        versions: Collection[int] | None = None,
+    ) -> Hero | None:
+        """Same single-statement (conditional) update as `HeroRepository.update_by_id()`."""
+        if not hero_data:
+            hero = await self.read_one(hero_id)
+            if hero and versions is not None and hero.version not in versions:
+                return None
+            return hero
+
+        # ORM-enabled statement: heroes already in this session get the new values too
+        statement = (
+            update(Hero)
+            .where(col(Hero.id) == hero_id)
+            .values(**hero_data, version=col(Hero.version) + 1)
+        )
+        if versions is not None:
+            statement = statement.where(col(Hero.version).in_(versions))
+        if self.session.bind.dialect.update_returning:
+            row = (await self.session.exec(statement.returning(*Hero.__table__.c))).first()
+            await self.session.commit()
+            return Hero.model_validate(row._mapping) if row else None
+
+        updated = (await self.session.exec(statement)).rowcount
+        await self.session.commit()
+        return await self.read_one(hero_id) if updated else None
+
+    async def delete_by_id(
+        self, hero_id: int, versions: Collection[int] | None = None
+    ) -> bool:
+        statement = delete(Hero).where(col(Hero.id) == hero_id)
+        if versions is not None:
+            statement = statement.where(col(Hero.version).in_(versions))
+        result = await self.session.exec(statement)
+        await self.session.commit()
+        return result.rowcount > 0
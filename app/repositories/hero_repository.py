@@ -1,11 +1,312 @@
-from sqlmodel import Session, select
+import sys
+from collections.abc import Collection, Iterator
+from functools import lru_cache
+from typing import Any
 
-from app.models.hero_models import Hero
+from sqlalchemy import (
+    Integer,
+    bindparam,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy import select as sa_select
+from sqlmodel import Session, col, select
+
+from app.models.hero_models import (
+    Hero,
+    HeroFilter,
+    HeroOrderBy,
+    HeroPublic,
+    SortDirection,
+)
+
+
+# Statement builders for `read_many()` (shared with the async repository)
+#
+# The hot statements are built once per shape (sort, direction, which filters,
+# which columns) and cached; every value (filter values, offset, limit, keyset
+# position, ids) goes in as a bound parameter. Re-executing the same statement
+# object skips building it and SQLAlchemy's cache-key generation: its compiled
+# SQL comes straight out of the engine's compiled cache (`query_cache_size`).
+# The builders return (statement, params) for `session.exec(statement, params=params)`.
+STATEMENT_CACHE_SIZE = 256  # shapes per builder; the API allows a few hundred
+OFFSET = bindparam("offset", type_=Integer)
+LIMIT = bindparam("limit", type_=Integer)
+
+
+def is_nullable(order_by: HeroOrderBy) -> bool:
+    return Hero.__table__.c[order_by.value].nullable
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest string greater than every string starting with `prefix`."""
+    if not prefix or ord(prefix[-1]) == sys.maxunicode:
+        return None  # no upper bound: name >= prefix alone
+    last = ord(prefix[-1])
+    return prefix[:-1] + chr(last + 1)
+
+
+def filter_params(filters: HeroFilter | None) -> dict[str, Any]:
+    """Bound parameters of `filters`; their names (sorted) are the filter shape."""
+    if filters is None:
+        return {}
+    params = filters.model_dump(exclude_none=True)
+    if "name_prefix" in params:
+        upper = prefix_upper_bound(params["name_prefix"])
+        if upper is not None:
+            params["name_prefix_upper"] = upper
+    return params
+
+
+def filter_clauses(fields: Collection[str]) -> list:
+    """
+    WHERE clauses for the filter `fields` (see `filter_params`), all sargable
+    (usable as an index range/ lookup).
+
+    `name_prefix` becomes name >= 'ab' AND name < 'ac' rather than LIKE 'ab%'
+    (sqlite only uses an index for LIKE with case_sensitive_like on).
+    """
+    clauses = []
+    if "name" in fields:
+        clauses.append(col(Hero.name) == bindparam("name"))
+    if "name_prefix" in fields:
+        clauses.append(col(Hero.name) >= bindparam("name_prefix"))
+    if "name_prefix_upper" in fields:
+        clauses.append(col(Hero.name) < bindparam("name_prefix_upper"))
+    if "age_min" in fields:
+        clauses.append(col(Hero.age) >= bindparam("age_min"))
+    if "age_max" in fields:
+        clauses.append(col(Hero.age) <= bindparam("age_max"))
+    if "gender" in fields:
+        clauses.append(col(Hero.gender) == bindparam("gender"))
+    return clauses
+
+
+# Filters that select a range of their column's index (vs. a single key)
+RANGE_FILTER_COLUMNS = {"name_prefix": "name", "age_min": "age", "age_max": "age"}
+
+
+def unsupported_by_index(filters: HeroFilter | None, order_by: HeroOrderBy) -> str | None:
+    """
+    Why no index can serve `filters` + `order_by`, or None when one can.
+
+    Every column has a single-column index, so a query walks one index: the
+    ORDER BY column's. Exact-match filters on other columns are checked row by
+    row along that walk, but a range filter on another column would need the
+    whole range read and sorted (or the whole table scanned).
+    """
+    if filters is None:
+        return None
+    for field in filters.model_dump(exclude_none=True):
+        column = RANGE_FILTER_COLUMNS.get(field, field)
+        if not Hero.__table__.c[column].index:
+            return f"No index on {column} to filter by"
+        if field in RANGE_FILTER_COLUMNS and column != order_by.value:
+            return f"Filtering on a range of {column} requires order_by={column}"
+    return None
+
+
+def ordering(order_by: HeroOrderBy, direction: SortDirection) -> list:
+    """ORDER BY <column> [DESC] [NULLS LAST], id [DESC]; walks the column's index."""
+    columns = [col(getattr(Hero, order_by.value))]
+    if order_by != HeroOrderBy.id:
+        columns.append(col(Hero.id))
+    if direction == SortDirection.desc:
+        columns = [column.desc() for column in columns]
+    if is_nullable(order_by):
+        columns[0] = columns[0].nulls_last()
+    return columns
+
+
+def select_heroes(columns: tuple[str, ...] | None = None):
+    """SELECT whole `Hero` entities, or only `columns` as plain rows (no ORM objects)."""
+    if columns is None:
+        return select(Hero)
+    # sqlalchemy's select: Rows even for a single column (sqlmodel's gives scalars)
+    return sa_select(*(col(getattr(Hero, name)) for name in columns))
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _page_statement(order_by, direction, fields, columns):
+    statement = select_heroes(columns).where(*filter_clauses(fields))
+    statement = statement.order_by(*ordering(order_by, direction))
+    return statement.offset(OFFSET).limit(LIMIT)
+
+
+def select_page(
+    order_by: HeroOrderBy,
+    offset: int,
+    limit: int,
+    direction: SortDirection = SortDirection.asc,
+    filters: HeroFilter | None = None,
+    columns: tuple[str, ...] | None = None,
+):
+    """Offset page: WHERE <filters> ORDER BY .. OFFSET .. LIMIT .."""
+    params = filter_params(filters)
+    statement = _page_statement(order_by, direction, tuple(sorted(params)), columns)
+    return statement, {**params, "offset": offset, "limit": limit}
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _after_statement(order_by, direction, fields, columns):
+    descending = direction == SortDirection.desc
+    statement = select_heroes(columns).where(*filter_clauses(fields))
+    after_id = bindparam("after_id", type_=Integer)
+    if order_by == HeroOrderBy.id:
+        seek = col(Hero.id) < after_id if descending else col(Hero.id) > after_id
+    else:
+        column = col(getattr(Hero, order_by.value))
+        # (value, id) row comparison -> index range scan on the column's index
+        value = bindparam("after_value", type_=column.type)
+        key, last = tuple_(column, col(Hero.id)), tuple_(value, after_id)
+        seek = key < last if descending else key > last
+    statement = statement.where(seek).order_by(*ordering(order_by, direction))
+    return statement.limit(LIMIT)
+
+
+def select_after(
+    order_by: HeroOrderBy,
+    value: Any,
+    after_id: int,
+    limit: int,
+    direction: SortDirection = SortDirection.asc,
+    filters: HeroFilter | None = None,
+    columns: tuple[str, ...] | None = None,
+):
+    """Keyset page over the non-NULL rows, seeking past (value, after_id)."""
+    params = filter_params(filters)
+    statement = _after_statement(order_by, direction, tuple(sorted(params)), columns)
+    params.update(after_id=after_id, limit=limit)
+    if order_by != HeroOrderBy.id:
+        params["after_value"] = value
+    return statement, params
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _nulls_after_statement(order_by, direction, fields, columns, has_after):
+    statement = select_heroes(columns).where(*filter_clauses(fields))
+    statement = statement.where(col(getattr(Hero, order_by.value)).is_(None))
+    after_id = bindparam("after_id", type_=Integer)
+    if direction == SortDirection.desc:
+        if has_after:
+            statement = statement.where(col(Hero.id) < after_id)
+        return statement.order_by(col(Hero.id).desc()).limit(LIMIT)
+
+    if has_after:
+        statement = statement.where(col(Hero.id) > after_id)
+    return statement.order_by(col(Hero.id)).limit(LIMIT)
+
+
+def select_nulls_after(
+    order_by: HeroOrderBy,
+    after_id: int | None,
+    limit: int,
+    direction: SortDirection = SortDirection.asc,
+    filters: HeroFilter | None = None,
+    columns: tuple[str, ...] | None = None,
+):
+    """Keyset page over the NULL rows of a nullable column (they come last)."""
+    params = filter_params(filters)
+    fields = tuple(sorted(params))
+    statement = _nulls_after_statement(order_by, direction, fields, columns, after_id is not None)
+    params["limit"] = limit
+    if after_id is not None:
+        params["after_id"] = after_id
+    return statement, params
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _one_statement(columns):
+    return select_heroes(columns).where(col(Hero.id) == bindparam("hero_id", type_=Integer))
+
+
+def select_one(hero_id: int, columns: tuple[str, ...]):
+    """One hero's `columns` as a plain row, by primary key."""
+    return _one_statement(columns), {"hero_id": hero_id}
+
+
+SELECT_VERSION = select(Hero.version).where(col(Hero.id) == bindparam("hero_id", type_=Integer))
+
+
+@lru_cache(maxsize=2)
+def _search_statement(dialect: str):
+    if dialect == "postgresql":
+        name_tsv = literal_column("hero.name_tsv")
+        query = func.to_tsquery("simple", bindparam("query"))
+        statement = select(Hero).where(name_tsv.op("@@")(query))
+        ordering = [func.ts_rank(name_tsv, query).desc(), col(Hero.id)]
+    else:
+        hero_fts = table("hero_fts", column("rowid"), column("rank"))
+        statement = (
+            select(Hero)
+            .join(hero_fts, hero_fts.c.rowid == col(Hero.id))
+            .where(text("hero_fts MATCH :query"))
+        )
+        ordering = [hero_fts.c.rank, col(Hero.id)]
+    statement = statement.order_by(*ordering)
+    return statement.offset(OFFSET).limit(LIMIT)
+
+
+def select_search(dialect: str, terms: list[str], offset: int, limit: int):
+    """
+    Full-text match of every term (as a word prefix) in hero.name, best first.
+
+    sqlite: FTS5 `hero_fts` ranked by bm25; postgres: `name_tsv` GIN index
+    ranked by ts_rank (see HERO_SEARCH_DDL). `terms` are plain words only.
+    """
+    if dialect == "postgresql":
+        query = " & ".join(f"{term}:*" for term in terms)
+    else:
+        query = " ".join(f'"{term}"*' for term in terms)
+    return _search_statement(dialect), {"query": query, "offset": offset, "limit": limit}
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _count_statement(fields):
+    return select(func.count()).select_from(Hero).where(*filter_clauses(fields))
+
+
+def select_count(filters: HeroFilter | None = None):
+    params = filter_params(filters)
+    return _count_statement(tuple(sorted(params))), params
+
+
+STATEMENT_CACHES = {
+    "page": _page_statement,
+    "after": _after_statement,
+    "nulls_after": _nulls_after_statement,
+    "one": _one_statement,
+    "search": _search_statement,
+    "count": _count_statement,
+}
+
+
+def get_statement_cache_stats() -> dict:
+    """Hits/ misses of the hero statement caches (one per builder), since start."""
+    stats = {}
+    for name, builder in STATEMENT_CACHES.items():
+        info = builder.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return stats
+
+
+# Row count estimates from the planner statistics (no table scan)
+PG_ESTIMATE = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'hero'::regclass")
+SQLITE_HAS_STATS = text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+SQLITE_ESTIMATE = text("SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 WHERE tbl = 'hero'")
 
 
 class HeroRepository:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, bulk_chunk_size: int = 500) -> None:
         self.session = session
+        self.bulk_chunk_size = bulk_chunk_size
 
     def create(self, db_hero: Hero) -> Hero:
         self.session.add(db_hero)
@@ -13,16 +314,185 @@ class HeroRepository:
         self.session.refresh(db_hero)
         return db_hero
 
-    def read_many(self, offset: int = 0, limit: int = 100):
-        heroes = self.session.exec(select(Hero).offset(offset).limit(limit)).all()
+    def create_many(self, db_heroes: list[Hero]) -> list[Hero]:
+        """
+        Insert many heroes in one transaction, `bulk_chunk_size` rows per INSERT.
+
+        Uses multi-row INSERT .. RETURNING where the dialect supports it
+        (sqlite >= 3.35, postgres); otherwise falls back to an ORM flush.
+        Returns detached heroes with their new ids (no per-row refresh).
+        """
+        dialect = self.session.get_bind().dialect
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            table = Hero.__table__
+            statement = insert(table).returning(*table.c, sort_by_parameter_order=True)
+            rows = [hero.model_dump(exclude={"id"}) for hero in db_heroes]
+            created = []
+            for start in range(0, len(rows), self.bulk_chunk_size):
+                chunk = rows[start : start + self.bulk_chunk_size]
+                result = self.session.exec(statement, params=chunk)
+                created.extend(Hero.model_validate(row._mapping) for row in result)
+        else:
+            self.session.add_all(db_heroes)
+            self.session.flush()
+            created = [Hero.model_validate(hero.model_dump()) for hero in db_heroes]
+
+        self.session.commit()
+        return created
+
+    def read_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        *,
+        order_by: HeroOrderBy = HeroOrderBy.id,
+        direction: SortDirection = SortDirection.asc,
+        filters: HeroFilter | None = None,
+        after: tuple[Any, int] | None = None,
+        columns: tuple[str, ...] | None = None,
+    ):
+        """
+        Read a page of heroes ordered by `order_by` (with `id` as the tiebreaker).
+
+        Offset mode: skip `offset` rows (the db still scans every skipped row).
+        Keyset mode: pass `after=(value, id)` of the last row already seen and
+        the db seeks straight to the next row through the column's index.
+        NULLs (only `age` can be NULL) always sort after every non-NULL value,
+        in either direction. `filters` narrow both modes. With `columns`, only
+        those columns are selected and plain rows come back instead of heroes
+        (they must include `id` and the `order_by` column for keyset paging).
+        """
+        query = {"direction": direction, "filters": filters, "columns": columns}
+        if after is None:
+            statement, params = select_page(order_by, offset, limit, **query)
+            heroes = self.session.exec(statement, params=params).all()
+            return heroes
+
+        value, after_id = after
+        heroes = []
+        if value is not None:
+            statement, params = select_after(order_by, value, after_id, limit, **query)
+            heroes = list(self.session.exec(statement, params=params).all())
+            after_id = None  # the NULL section (if any) starts from its first row
+
+        if is_nullable(order_by) and len(heroes) < limit:
+            statement, params = select_nulls_after(
+                order_by, after_id, limit - len(heroes), **query
+            )
+            heroes.extend(self.session.exec(statement, params=params).all())
         return heroes
 
-    def read_one(self, hero_id: int):
+    def _existing_ids(self, ids: list[int]) -> set[int]:
+        found: set[int] = set()
+        for start in range(0, len(ids), self.bulk_chunk_size):
+            chunk = ids[start : start + self.bulk_chunk_size]
+            found.update(self.session.exec(select(Hero.id).where(col(Hero.id).in_(chunk))))
+        return found
+
+    def update_many(self, updates: list[dict]) -> list[int]:
+        """
+        Apply per-hero field updates (each dict holds "id") in one transaction.
+
+        One SELECT id .. WHERE id IN (..) per chunk to find the existing heroes,
+        then a single executemany UPDATE .. WHERE id = ? for all of them.
+        Returns the ids that exist (and were updated).
+        """
+        found = self._existing_ids([data["id"] for data in updates])
+        rows = [data for data in updates if data["id"] in found and len(data) > 1]
+        if rows:
+            self.session.exec(update(Hero), params=rows)  # ORM bulk UPDATE by primary key
+            # + one version bump per chunk (bulk-by-pk params can't hold an expression)
+            ids = [data["id"] for data in rows]
+            for start in range(0, len(ids), self.bulk_chunk_size):
+                chunk = ids[start : start + self.bulk_chunk_size]
+                self.session.exec(
+                    update(Hero)
+                    .where(col(Hero.id).in_(chunk))
+                    .values(version=col(Hero.version) + 1)
+                )
+        self.session.commit()
+        return sorted(found)
+
+    def delete_many(self, ids: list[int]) -> list[int]:
+        """
+        Delete heroes by id in one transaction: DELETE .. WHERE id IN (..) per chunk.
+
+        Returns the ids that existed (and were deleted).
+        """
+        deleted: set[int] = set()
+        use_returning = self.session.get_bind().dialect.delete_returning
+        for start in range(0, len(ids), self.bulk_chunk_size):
+            chunk = ids[start : start + self.bulk_chunk_size]
+            statement = delete(Hero).where(col(Hero.id).in_(chunk))
+            if use_returning:
+                deleted.update(self.session.exec(statement.returning(col(Hero.id))).scalars())
+            else:
+                deleted.update(self._existing_ids(chunk))
+                self.session.exec(statement)
+        self.session.commit()
+        return sorted(deleted)
+
+    def stream_public(self, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Yield every hero's public columns as plain rows, ordered by id.
+
+        `yield_per` fetches `batch_size` rows at a time (server-side cursor on
+        postgres), so memory stays flat whatever the table size; no ORM objects.
+        """
+        columns = [col(getattr(Hero, name)) for name in HeroPublic.model_fields]
+        statement = (
+            select(*columns)
+            .order_by(col(Hero.id))
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.exec(statement)
+
+    def count(self, filters: HeroFilter | None = None) -> int:
+        """Exact COUNT(*) of the heroes matching `filters`."""
+        statement, params = select_count(filters)
+        return self.session.exec(statement, params=params).one()
+
+    def estimate_count(self) -> int | None:
+        """
+        Approximate number of heroes, read from planner statistics.
+
+        postgres: pg_class.reltuples (kept by autovacuum/ ANALYZE); sqlite: the
+        sqlite_stat1 row count (ANALYZE), else max(id), an upper bound read off
+        the primary key. None when postgres has never analyzed the table.
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            estimate = self.session.exec(PG_ESTIMATE).scalar()
+            return estimate if estimate is not None and estimate >= 0 else None
+
+        if self.session.exec(SQLITE_HAS_STATS).first():
+            estimate = self.session.exec(SQLITE_ESTIMATE).scalar()
+            if estimate is not None:
+                return estimate
+        return self.session.exec(select(func.max(Hero.id))).one() or 0
+
+    def search(self, terms: list[str], offset: int = 0, limit: int = 100):
+        """Heroes whose name matches every term, ranked (full-text index, no scan)."""
+        dialect = self.session.get_bind().dialect.name
+        statement, params = select_search(dialect, terms, offset, limit)
+        heroes = self.session.exec(statement, params=params).all()
+        return heroes
+
+    def read_one(self, hero_id: int, columns: tuple[str, ...] | None = None):
+        if columns is not None:
+            # one plain row of just `columns`, bypassing the identity map
+            statement, params = select_one(hero_id, columns)
+            return self.session.exec(statement, params=params).first()
+
         hero = self.session.get(Hero, hero_id)
         return hero
 
+    def read_version(self, hero_id: int) -> int | None:
+        """Current version of a hero (one PK lookup, one column), None if missing."""
+        return self.session.exec(SELECT_VERSION, params={"hero_id": hero_id}).first()
+
     def update(self, hero_db: Hero, hero_data: dict) -> Hero:
         hero_db.sqlmodel_update(hero_data)
+        hero_db.version += 1
         self.session.add(hero_db)
         self.session.commit()
         self.session.refresh(hero_db)
@@ -31,3 +501,52 @@ class HeroRepository:
     def delete(self, hero) -> None:
         self.session.delete(hero)
         self.session.commit()
+
+    def update_by_id(
+        self,
+        hero_id: int,
+        hero_data: dict,
+        versions: Collection[int] | None = None,
+    ) -> Hero | None:
+        """
+        UPDATE hero SET .., version = version + 1 WHERE id = :id RETURNING .. in
+        a single round trip.
+
+        No prior SELECT and no refresh afterwards; returns a detached hero, or
+        None when no row has that id (or, with `versions`, none of those versions:
+        optimistic concurrency, the check and the write are one statement).
+        """
+        if not hero_data:
+            hero = self.read_one(hero_id)
+            if hero and versions is not None and hero.version not in versions:
+                return None
+            return hero
+
+        # ORM-enabled statement: heroes already in this session get the new values too
+        statement = (
+            update(Hero)
+            .where(col(Hero.id) == hero_id)
+            .values(**hero_data, version=col(Hero.version) + 1)
+        )
+        if versions is not None:
+            statement = statement.where(col(Hero.version).in_(versions))
+        if self.session.get_bind().dialect.update_returning:
+            row = self.session.exec(statement.returning(*Hero.__table__.c)).first()
+            self.session.commit()
+            return Hero.model_validate(row._mapping) if row else None
+
+        updated = self.session.exec(statement).rowcount
+        self.session.commit()
+        return self.read_one(hero_id) if updated else None
+
+    def delete_by_id(self, hero_id: int, versions: Collection[int] | None = None) -> bool:
+        """
+        DELETE .. WHERE id = :id without loading the hero; False if no row matched
+        (with `versions`: also when the hero is at another version).
+        """
+        statement = delete(Hero).where(col(Hero.id) == hero_id)
+        if versions is not None:
+            statement = statement.where(col(Hero.version).in_(versions))
+        deleted = self.session.exec(statement).rowcount
+        self.session.commit()
+        return deleted > 0
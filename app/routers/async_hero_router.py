@@ -0,0 +1,157 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, Header, Query
+
+from app.async_dependencies import AsyncHeroReadServiceDep, AsyncHeroServiceDep
+from app.dependencies import HeroFieldsDep
+from app.etags import make_etag
+from app.models.hero_models import (
+    HeroBulkResult,
+    HeroBulkUpdate,
+    HeroCountMode,
+    HeroCreate,
+    HeroExportFormat,
+    HeroFilter,
+    HeroOrderBy,
+    HeroPublic,
+    HeroUpdate,
+    SortDirection,
+)
+from app.responses import (
+    export_response,
+    fields_response,
+    hero_fields_response,
+    hero_response,
+    heroes_response,
+)
+
+# The endpoints of `hero_router`, served by `async def` handlers on an
+# AsyncSession (mounted instead of `hero_router` when DB_STACK=async)
+router = APIRouter()
+
+
+@router.post("/heroes/", response_model=HeroPublic)
+async def create_hero(hero: HeroCreate, service: AsyncHeroServiceDep):
+    db_hero = await service.create(hero)
+    return hero_response(db_hero, headers={"ETag": make_etag(db_hero.version)})
+
+
+@router.post("/heroes/bulk", response_model=list[HeroPublic])
+async def create_heroes(
+    heroes: Annotated[list[HeroCreate], Body(min_length=1, max_length=10_000)],
+    service: AsyncHeroServiceDep,
+):
+    # one transaction, batched multi-row INSERTs (BULK_CHUNK_SIZE rows each)
+    db_heroes = await service.create_many(heroes)
+    return heroes_response(db_heroes)
+
+
+# NOTE: /heroes/bulk, /heroes/export and /heroes/search routes must be declared
+# before the /heroes/{hero_id} ones
+@router.patch("/heroes/bulk", response_model=HeroBulkResult)
+async def update_heroes(
+    heroes: Annotated[list[HeroBulkUpdate], Body(min_length=1, max_length=10_000)],
+    service: AsyncHeroServiceDep,
+):
+    # one transaction: SELECT id .. IN (..) + one executemany UPDATE
+    result = await service.update_many(heroes)
+    return result
+
+
+@router.delete("/heroes/bulk", response_model=HeroBulkResult)
+async def delete_heroes(
+    hero_ids: Annotated[list[int], Body(min_length=1, max_length=10_000)],
+    service: AsyncHeroServiceDep,
+):
+    # one transaction: DELETE .. WHERE id IN (..) RETURNING id
+    result = await service.delete_many(hero_ids)
+    return result
+
+
+@router.get("/heroes/", response_model=list[HeroPublic])
+async def read_heroes(
+    service: AsyncHeroReadServiceDep,
+    filters: Annotated[HeroFilter, Depends()],
+    fields: HeroFieldsDep,
+    offset: int = 0,
+    limit: Annotated[int, Query(le=100)] = 100,
+    cursor: str | None = None,
+    order_by: HeroOrderBy = HeroOrderBy.id,
+    direction: SortDirection = SortDirection.asc,
+    count: HeroCountMode | None = None,
+):
+    heroes = await service.read_many(
+        offset,
+        limit,
+        cursor=cursor,
+        order_by=order_by,
+        direction=direction,
+        filters=filters,
+        fields=fields,
+    )
+    headers = {}
+    next_cursor = service.next_cursor(heroes, limit, order_by, direction)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if count is not None:
+        headers["X-Total-Count"] = str(await service.count(count, filters))
+    if fields is not None:
+        return fields_response(heroes, fields, headers=headers)
+    return heroes_response(heroes, headers=headers)
+
+
+@router.get("/heroes/export")
+async def export_heroes(
+    service: AsyncHeroReadServiceDep,
+    format: HeroExportFormat = HeroExportFormat.ndjson,
+):
+    # Streamed from a server-side cursor: constant memory for any table size
+    # (the session stays open until the response is fully sent)
+    return export_response(service.export(format), format)
+
+
+@router.get("/heroes/search", response_model=list[HeroPublic])
+async def search_heroes(
+    service: AsyncHeroReadServiceDep,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    offset: int = 0,
+    limit: Annotated[int, Query(le=100)] = 100,
+):
+    # Best matches first; served by the full-text index (FTS5/ tsvector)
+    heroes = await service.search(q, offset, limit)
+    return heroes_response(heroes)
+
+
+@router.get("/heroes/{hero_id}", response_model=HeroPublic)
+async def read_hero(
+    hero_id: int,
+    service: AsyncHeroReadServiceDep,
+    fields: HeroFieldsDep,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    hero = await service.read_one(hero_id, fields, if_none_match)
+    if fields is not None:
+        headers = {"ETag": make_etag(hero["version"], fields)}
+        return hero_fields_response(hero, fields, headers=headers)
+    return hero_response(hero, headers={"ETag": make_etag(hero.version)})
+
+
+@router.patch("/heroes/{hero_id}", response_model=HeroPublic)
+async def update_hero(
+    hero_id: int,
+    hero: HeroUpdate,
+    service: AsyncHeroServiceDep,
+    if_match: Annotated[str | None, Header()] = None,
+):
+    hero_db = await service.update(hero_id, hero, if_match)
+    return hero_response(hero_db, headers={"ETag": make_etag(hero_db.version)})
+
+
+@router.delete("/heroes/{hero_id}")
+async def delete_hero(
+    hero_id: int,
+    service: AsyncHeroServiceDep,
+    if_match: Annotated[str | None, Header()] = None,
+):
+    await service.delete(hero_id, if_match)
+    return {"ok": True}
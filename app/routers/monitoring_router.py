@@ -0,0 +1,64 @@
+from fastapi import APIRouter
+
+from app.compression import get_compression_cache
+from app.db import (
+    get_async_engine,
+    get_async_replica_selector,
+    get_pool_stats,
+    get_replica_selector,
+    get_sync_engine,
+    settings,
+)
+from app.dependencies import get_hero_cache
+from app.instrumentation import get_compiled_cache_stats
+from app.logging_config import get_logging_stats
+from app.repositories.hero_repository import get_statement_cache_stats
+
+# Operational endpoints (not part of the public hero API)
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+
+@router.get("/pool")
+def read_pool_stats():
+    """Live connection pool stats of the engine serving requests (DB_STACK), and replicas."""
+    if settings.db_stack == "async":
+        stats = get_pool_stats(get_async_engine().sync_engine)
+        replicas = get_async_replica_selector()
+    else:
+        stats = get_pool_stats(get_sync_engine())
+        replicas = get_replica_selector()
+    if replicas is not None:
+        stats["replicas"] = [
+            get_pool_stats(getattr(engine, "sync_engine", engine)) for engine in replicas.engines
+        ]
+    return stats
+
+
+@router.get("/statements")
+def read_statement_stats():
+    """Hits/ misses of the cached hero statements and of the engines' compiled cache."""
+    return {"statements": get_statement_cache_stats(), "compiled": get_compiled_cache_stats()}
+
+
+@router.get("/logging")
+def read_logging_stats():
+    """Log queue depth and records dropped because the queue was full."""
+    return get_logging_stats()
+
+
+@router.get("/cache")
+def read_cache_stats():
+    """Hit/ miss/ eviction counters of the hero read cache."""
+    cache = get_hero_cache()
+    if cache is None:
+        return {"backend": "none"}
+    return cache.stats()
+
+
+@router.get("/compression")
+def read_compression_stats():
+    """Hit/ miss counters of the compressed-body cache (hot list pages)."""
+    cache = get_compression_cache()
+    if cache is None:
+        return {"backend": "none"}
+    return cache.stats()
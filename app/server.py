@@ -0,0 +1,49 @@
+"""
+Production entrypoint: `python -m app.server`, configured by the SERVER_* settings.
+
+Runs `app.main:app` on uvicorn with SERVER_WORKERS processes (one event loop,
+threadpool, engine and connection pool each), so one container uses every
+core it is given. uvicorn spawns fresh worker processes: each one imports the
+app and builds its engine itself, on first use (see `get_sync_engine`), and
+runs the `lifespan` of app/main.py: setup on start, pools disposed on stop.
+
+The schema step (DB_STARTUP_SCHEMA) runs here, once, before the workers
+start: with `create`, the workers' own create_all then finds the tables
+instead of racing to create them; with `check`, a database behind the
+migrations head stops the server before any worker is spawned.
+
+On SIGTERM/ SIGINT, workers stop accepting connections and get
+SERVER_TIMEOUT_GRACEFUL_SHUTDOWN seconds to finish in-flight requests.
+
+Size DB_POOL_SIZE + DB_MAX_OVERFLOW per worker: the database sees
+workers x (pool size + overflow) connections at most.
+"""
+
+import os
+
+import uvicorn
+
+from app.db import get_sync_engine, prepare_schema, settings
+
+
+def worker_count() -> int:
+    return settings.server_workers or os.cpu_count() or 1
+
+
+def main() -> None:
+    prepare_schema()
+    get_sync_engine().dispose()  # nothing of it is used by the workers
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=worker_count(),
+        timeout_keep_alive=settings.server_timeout_keep_alive,
+        timeout_graceful_shutdown=settings.server_timeout_graceful_shutdown,
+        limit_max_requests=settings.server_limit_max_requests or None,
+    )
+
+
+if __name__ == "__main__":
+    main()
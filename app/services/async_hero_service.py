@@ -0,0 +1,222 @@
+from collections.abc import AsyncIterator
+
+from fastapi import HTTPException
+
+from app.cache import CacheBackend
+from app.etags import make_etag, match_versions, none_match
+from app.models.hero_models import (
+    Hero,
+    HeroBulkResult,
+    HeroBulkUpdate,
+    HeroCountMode,
+    HeroCreate,
+    HeroExportFormat,
+    HeroFilter,
+    HeroOrderBy,
+    HeroUpdate,
+    SortDirection,
+)
+from app.repositories.async_hero_repository import AsyncHeroRepository
+from app.services.hero_service import (
+    HERO_COUNT_CACHE_KEY,
+    bulk_result,
+    check_count_mode,
+    check_index_support,
+    export_chunk,
+    hero_cache_key,
+    next_cursor,
+    not_found_or_modified,
+    projection,
+    search_terms,
+    seek_after,
+)
+
+
+class AsyncHeroService:
+    """Async twin of `HeroService`, used when DB_STACK=async."""
+
+    def __init__(
+        self,
+        repo: AsyncHeroRepository,
+        cache: CacheBackend | None = None,
+        fill_cache: bool = True,
+        count_cache: CacheBackend | None = None,
+    ) -> None:
+        self.repo = repo
+        self.cache = cache
+        self.count_cache = count_cache  # `count=cached` total (one entry, own TTL)
+        self.fill_cache = fill_cache
+
+    def _cache_hero(self, hero: Hero, if_generation: int | None = None) -> None:
+        if self.cache is not None:
+            self.cache.set(hero_cache_key(hero.id), hero.model_dump(), if_generation)
+
+    def _adjust_count(self, delta: int) -> None:
+        if self.count_cache is not None and delta:
+            self.count_cache.incr(HERO_COUNT_CACHE_KEY, delta)
+
+    async def create(self, hero: HeroCreate) -> Hero:
+        db_hero = Hero.model_validate(hero)
+        db_hero = await self.repo.create(db_hero)
+        self._cache_hero(db_hero)
+        self._adjust_count(1)
+        return db_hero
+
+    async def create_many(self, heroes: list[HeroCreate]) -> list[Hero]:
+        # not cached, like `HeroService.create_many()`
+        db_heroes = [Hero.model_validate(hero) for hero in heroes]
+        created = await self.repo.create_many(db_heroes)
+        self._adjust_count(len(created))
+        return created
+
+    async def read_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+        **criteria,
+    ):
+        order_by = criteria.get("order_by", HeroOrderBy.id)
+        check_index_support(criteria.get("filters"), order_by)
+        if cursor is not None:
+            direction = criteria.get("direction", SortDirection.asc)
+            criteria["after"] = seek_after(cursor, offset, order_by, direction)
+        if fields is not None:
+            criteria["columns"] = projection(fields, order_by)
+
+        heroes = await self.repo.read_many(offset, limit, **criteria)
+        return heroes
+
+    async def count(self, mode: HeroCountMode, filters: HeroFilter | None = None) -> int:
+        """Same count modes as `HeroService.count()`."""
+        check_count_mode(mode, filters)
+        if mode == HeroCountMode.estimated:
+            estimate = await self.repo.estimate_count()
+            return estimate if estimate is not None else await self.repo.count()
+        if mode == HeroCountMode.cached and self.count_cache is not None:
+            total = self.count_cache.get(HERO_COUNT_CACHE_KEY)
+            if total is None:
+                total = await self.repo.count()
+                if self.fill_cache:
+                    self.count_cache.set(HERO_COUNT_CACHE_KEY, total)
+            return total
+        return await self.repo.count(filters)
+
+    def next_cursor(
+        self,
+        heroes,
+        limit: int,
+        order_by: HeroOrderBy = HeroOrderBy.id,
+        direction: SortDirection = SortDirection.asc,
+    ) -> str | None:
+        return next_cursor(heroes, limit, order_by, direction)
+
+    async def export(
+        self, fmt: HeroExportFormat, batch_size: int = 1000
+    ) -> AsyncIterator[str]:
+        """Same NDJSON/ CSV stream as `HeroService.export()`, one chunk per batch."""
+        header = fmt == HeroExportFormat.csv
+        async for batch in self.repo.stream_public(batch_size):
+            yield export_chunk(fmt, batch, header)
+            header = False
+        if header:  # header only, for an empty table
+            yield export_chunk(fmt, [], header)
+
+    async def search(self, q: str, offset: int = 0, limit: int = 100):
+        """Same sanitised, ranked search as `HeroService.search()`."""
+        heroes = await self.repo.search(search_terms(q), offset, limit)
+        return heroes
+
+    async def current_version(self, hero_id: int) -> int | None:
+        if self.cache is not None:
+            cached = self.cache.get(hero_cache_key(hero_id))
+            if cached is not None:
+                return cached["version"]
+        return await self.repo.read_version(hero_id)
+
+    async def check_not_modified(
+        self, hero_id: int, if_none_match: str, fields: tuple[str, ...] | None = None
+    ) -> None:
+        version = await self.current_version(hero_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Hero not found")
+        etag = make_etag(version, fields)
+        if none_match(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+
+    async def read_one(
+        self,
+        hero_id: int,
+        fields: tuple[str, ...] | None = None,
+        if_none_match: str | None = None,
+    ):
+        """Same cache, sparse-fieldset and ETag rules as `HeroService.read_one()`."""
+        # before any db read: a write after this point voids the fill below
+        generation = self.cache.generation() if self.cache is not None else 0
+        if if_none_match is not None:
+            await self.check_not_modified(hero_id, if_none_match, fields)
+
+        if self.cache is not None:
+            cached = self.cache.get(hero_cache_key(hero_id))
+            if cached is not None:
+                if fields is not None:
+                    return {field: cached[field] for field in (*fields, "version")}
+                return Hero.model_validate(cached)
+
+        if fields is not None:
+            row = await self.repo.read_one(hero_id, columns=(*fields, "version"))
+            if not row:
+                raise HTTPException(status_code=404, detail="Hero not found")
+            return dict(row._mapping)
+
+        hero = await self.repo.read_one(hero_id)
+        if not hero:
+            raise HTTPException(status_code=404, detail="Hero not found")
+        if self.fill_cache:
+            # not over a row a concurrent write cached (or deleted) meanwhile
+            self._cache_hero(hero, if_generation=generation)
+        return hero
+
+    async def update(
+        self, hero_id: int, hero: HeroUpdate, if_match: str | None = None
+    ) -> Hero:
+        # one UPDATE .. RETURNING; no row updated -> no such hero (or 412)
+        hero_data = hero.model_dump(exclude_unset=True)
+        versions = match_versions(if_match) if if_match is not None else None
+        hero_db = await self.repo.update_by_id(hero_id, hero_data, versions)
+        if not hero_db:
+            raise not_found_or_modified(
+                await self.repo.read_version(hero_id) if versions is not None else None
+            )
+        self._cache_hero(hero_db)
+
+        return hero_db
+
+    async def update_many(self, heroes: list[HeroBulkUpdate]) -> HeroBulkResult:
+        updates = [hero.model_dump(exclude_unset=True) for hero in heroes]
+        updated = await self.repo.update_many(updates)
+        self._invalidate(updated)
+        return bulk_result([data["id"] for data in updates], updated)
+
+    async def delete_many(self, hero_ids: list[int]) -> HeroBulkResult:
+        deleted = await self.repo.delete_many(hero_ids)
+        self._invalidate(deleted)
+        self._adjust_count(-len(deleted))
+        return bulk_result(hero_ids, deleted)
+
+    def _invalidate(self, hero_ids: list[int]) -> None:
+        if self.cache is not None:
+            for hero_id in hero_ids:
+                self.cache.delete(hero_cache_key(hero_id))
+
+    async def delete(self, hero_id: int, if_match: str | None = None) -> None:
+        # one DELETE; no row deleted -> no such hero (or 412)
+        versions = match_versions(if_match) if if_match is not None else None
+        if not await self.repo.delete_by_id(hero_id, versions):
+            raise not_found_or_modified(
+                await self.repo.read_version(hero_id) if versions is not None else None
+            )
+        if self.cache is not None:
+            self.cache.delete(hero_cache_key(hero_id))
+        self._adjust_count(-1)
@@ -1,39 +1,375 @@
+import csv
+import io
+import json
+import re
+from collections.abc import Iterator
+from itertools import batched
+
 from fastapi import HTTPException
 
-from app.models.hero_models import Hero, HeroCreate, HeroUpdate
-from app.repositories.hero_repository import HeroRepository
+from app.cache import CacheBackend
+from app.etags import make_etag, match_versions, none_match
+from app.models.hero_models import (
+    Hero,
+    HeroBulkResult,
+    HeroBulkUpdate,
+    HeroCountMode,
+    HeroCreate,
+    HeroExportFormat,
+    HeroFilter,
+    HeroOrderBy,
+    HeroPublic,
+    HeroUpdate,
+    SortDirection,
+)
+from app.pagination import decode_cursor, encode_cursor
+from app.repositories.hero_repository import (
+    HeroRepository,
+    is_nullable,
+    unsupported_by_index,
+)
+
+
+# Cursor and query helpers (shared with the async service)
+# Python type of each sort column's values, as they come back from a cursor's JSON
+CURSOR_VALUE_TYPES = {HeroOrderBy.id: int, HeroOrderBy.name: str, HeroOrderBy.age: int}
+
+
+def sort_key(order_by: HeroOrderBy, direction: SortDirection) -> str:
+    # the sort a cursor was built for: "age" or "-age"
+    return order_by.value if direction == SortDirection.asc else f"-{order_by.value}"
+
+
+def seek_after(
+    cursor: str,
+    offset: int,
+    order_by: HeroOrderBy,
+    direction: SortDirection = SortDirection.asc,
+) -> tuple:
+    """Turn a client cursor into the repo's `after=(value, id)` seek key."""
+    if offset:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor, not both")
+    try:
+        cursor_sort_key, value, hero_id = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort_key != sort_key(order_by, direction):
+        raise HTTPException(status_code=400, detail="Cursor does not match order_by")
+    if not valid_cursor_value(order_by, value):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, hero_id
+
+
+def valid_cursor_value(order_by: HeroOrderBy, value) -> bool:
+    """A (possibly tampered) cursor value fits the order_by column: type, or NULL."""
+    if value is None:
+        return is_nullable(order_by)
+    # bool is an int subclass, but never a valid sort value
+    return isinstance(value, CURSOR_VALUE_TYPES[order_by]) and not isinstance(value, bool)
+
+
+def check_index_support(filters: HeroFilter | None, order_by: HeroOrderBy) -> None:
+    """Reject filter/ sort combinations that would scan or sort the table."""
+    problem = unsupported_by_index(filters, order_by)
+    if problem:
+        raise HTTPException(status_code=400, detail=problem)
+
+
+def search_terms(q: str) -> list[str]:
+    """Plain words of a search query (no full-text operators get through)."""
+    terms = re.findall(r"[^\W_]+", q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query has no words")
+    return terms
+
+
+def parse_fields(fields: str) -> tuple[str, ...]:
+    """`fields=id,name` -> ("name", "id"): known HeroPublic fields, in schema order."""
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(HeroPublic.model_fields)
+    if unknown or not requested:
+        detail = f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields"
+        raise HTTPException(status_code=400, detail=detail)
+    return tuple(field for field in HeroPublic.model_fields if field in requested)
+
+
+def projection(fields: tuple[str, ...], order_by: HeroOrderBy) -> tuple[str, ...]:
+    # columns to SELECT: the requested ones plus what the next cursor is built from
+    needed = {*fields, order_by.value, "id"}
+    return tuple(field for field in HeroPublic.model_fields if field in needed)
+
+
+def check_count_mode(mode: HeroCountMode, filters: HeroFilter | None) -> None:
+    # estimated and cached counts are whole-table counts
+    if mode != HeroCountMode.exact and filters and filters.model_dump(exclude_none=True):
+        raise HTTPException(status_code=400, detail="Only exact counts can be filtered")
+
+
+HERO_COUNT_CACHE_KEY = ("hero_count",)
+
+
+def not_found_or_modified(version: int | None) -> HTTPException:
+    # a conditional write matched no row: no such hero, or it is at another version
+    if version is None:
+        return HTTPException(status_code=404, detail="Hero not found")
+    return HTTPException(status_code=412, detail="Hero has changed (ETag mismatch)")
+
+
+def hero_cache_key(hero_id: int) -> tuple[str, int]:
+    return ("hero", hero_id)
+
+
+def bulk_result(requested: list[int], done: list[int]) -> HeroBulkResult:
+    done_set = set(done)
+    not_found = sorted({hero_id for hero_id in requested if hero_id not in done_set})
+    return HeroBulkResult(ids=sorted(done_set), not_found=not_found)
+
+
+EXPORT_FIELDS = list(HeroPublic.model_fields)
+
+
+def export_chunk(fmt: HeroExportFormat, rows, header: bool = False) -> str:
+    """`rows` (public columns) as NDJSON lines or CSV rows, the CSV header first if asked."""
+    if fmt == HeroExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(EXPORT_FIELDS)
+        writer.writerows(rows)
+        return buffer.getvalue()
+    return "".join(json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in rows)
+
+
+def next_cursor(
+    heroes,
+    limit: int,
+    order_by: HeroOrderBy,
+    direction: SortDirection = SortDirection.asc,
+) -> str | None:
+    if not heroes or len(heroes) < limit:
+        return None
+    last = heroes[-1]
+    key = sort_key(order_by, direction)
+    return encode_cursor(key, getattr(last, order_by.value), last.id)
 
 
 class HeroService:
-    def __init__(self, repo: HeroRepository) -> None:
+    def __init__(
+        self,
+        repo: HeroRepository,
+        cache: CacheBackend | None = None,
+        fill_cache: bool = True,
+        count_cache: CacheBackend | None = None,
+    ) -> None:
         self.repo = repo
+        self.cache = cache
+        self.count_cache = count_cache  # `count=cached` total (one entry, own TTL)
+        # False when `repo` reads from a (lagging) replica: its reads may be
+        # served from the cache, but never fill it (nor the cached count)
+        self.fill_cache = fill_cache
+
+    def _cache_hero(self, hero: Hero, if_generation: int | None = None) -> None:
+        # cache plain data, never the session-bound ORM object
+        if self.cache is not None:
+            self.cache.set(hero_cache_key(hero.id), hero.model_dump(), if_generation)
+
+    def _adjust_count(self, delta: int) -> None:
+        # keep a cached total current without a recount (no-op when not cached)
+        if self.count_cache is not None and delta:
+            self.count_cache.incr(HERO_COUNT_CACHE_KEY, delta)
 
     def create(self, hero: HeroCreate) -> Hero:
         db_hero = Hero.model_validate(hero)
         db_hero = self.repo.create(db_hero)
+        self._cache_hero(db_hero)
+        self._adjust_count(1)
         return db_hero
 
-    def read_many(self, offset: int = 0, limit: int = 100):
-        heroes = self.repo.read_many(offset, limit)
+    def create_many(self, heroes: list[HeroCreate]) -> list[Hero]:
+        # not cached: new ids are never stale, and a bulk import would evict the hot set
+        db_heroes = [Hero.model_validate(hero) for hero in heroes]
+        created = self.repo.create_many(db_heroes)
+        self._adjust_count(len(created))
+        return created
+
+    def read_many(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+        **criteria,
+    ):
+        """
+        Read a page of heroes.
+
+        Without a cursor this is plain offset pagination. With a cursor (taken
+        from `next_cursor()` of the previous page) the repo seeks past the last
+        row already seen instead of scanning and discarding `offset` rows.
+        Filters that no index can serve with the requested order are a 400.
+        With `fields` (see `parse_fields()`) only those columns are read, as
+        plain rows rather than heroes.
+        """
+        order_by = criteria.get("order_by", HeroOrderBy.id)
+        check_index_support(criteria.get("filters"), order_by)
+        if cursor is not None:
+            direction = criteria.get("direction", SortDirection.asc)
+            criteria["after"] = seek_after(cursor, offset, order_by, direction)
+        if fields is not None:
+            criteria["columns"] = projection(fields, order_by)
+
+        heroes = self.repo.read_many(offset, limit, **criteria)
         return heroes
 
-    def read_one(self, hero_id: int) -> Hero:
+    def count(self, mode: HeroCountMode, filters: HeroFilter | None = None) -> int:
+        """
+        Total number of heroes for X-Total-Count.
+
+        exact: COUNT(*) with the filters (a second query per page);
+        estimated: planner statistics, no scan (exact when there are none yet);
+        cached: COUNT(*) once per HERO_COUNT_CACHE_TTL, adjusted in between by
+        the writes made through this service. The last two ignore filters (400
+        if given).
+        """
+        check_count_mode(mode, filters)
+        if mode == HeroCountMode.estimated:
+            estimate = self.repo.estimate_count()
+            return estimate if estimate is not None else self.repo.count()
+        if mode == HeroCountMode.cached and self.count_cache is not None:
+            total = self.count_cache.get(HERO_COUNT_CACHE_KEY)
+            if total is None:
+                total = self.repo.count()
+                if self.fill_cache:
+                    self.count_cache.set(HERO_COUNT_CACHE_KEY, total)
+            return total
+        return self.repo.count(filters)
+
+    def next_cursor(
+        self,
+        heroes,
+        limit: int,
+        order_by: HeroOrderBy = HeroOrderBy.id,
+        direction: SortDirection = SortDirection.asc,
+    ) -> str | None:
+        """Cursor for the page after `heroes` (None once the last page is reached)."""
+        return next_cursor(heroes, limit, order_by, direction)
+
+    def export(self, fmt: HeroExportFormat, batch_size: int = 1000) -> Iterator[str]:
+        """
+        Stream every hero (public fields) as NDJSON lines or CSV rows.
+
+        Yields one text chunk per `batch_size` rows, straight from the repo's
+        row stream, so nothing holds the whole table.
+        """
+        rows = self.repo.stream_public(batch_size)
+        header = fmt == HeroExportFormat.csv
+        for batch in batched(rows, batch_size):
+            yield export_chunk(fmt, batch, header)
+            header = False
+        if header:  # header only, for an empty table
+            yield export_chunk(fmt, [], header)
+
+    def search(self, q: str, offset: int = 0, limit: int = 100):
+        """Ranked full-text search on hero names; each word matches as a prefix."""
+        heroes = self.repo.search(search_terms(q), offset, limit)
+        return heroes
+
+    def current_version(self, hero_id: int) -> int | None:
+        # from the cache when possible, else one-column PK lookup
+        if self.cache is not None:
+            cached = self.cache.get(hero_cache_key(hero_id))
+            if cached is not None:
+                return cached["version"]
+        return self.repo.read_version(hero_id)
+
+    def check_not_modified(
+        self, hero_id: int, if_none_match: str, fields: tuple[str, ...] | None = None
+    ) -> None:
+        """304 (with the ETag) when the client's copy is current: nothing is loaded."""
+        version = self.current_version(hero_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Hero not found")
+        etag = make_etag(version, fields)
+        if none_match(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+
+    def read_one(
+        self,
+        hero_id: int,
+        fields: tuple[str, ...] | None = None,
+        if_none_match: str | None = None,
+    ):
+        """
+        Read-through: served from the cache when possible, else from the repo.
+
+        With `fields` the result is a dict of just those fields (plus `version`,
+        for the ETag); a cache miss then reads only those columns (and the
+        partial row is not cached). `if_none_match` may short-cut to a 304.
+        """
+        # before any db read: a write after this point voids the fill below
+        generation = self.cache.generation() if self.cache is not None else 0
+        if if_none_match is not None:
+            self.check_not_modified(hero_id, if_none_match, fields)
+
+        if self.cache is not None:
+            cached = self.cache.get(hero_cache_key(hero_id))
+            if cached is not None:
+                if fields is not None:
+                    return {field: cached[field] for field in (*fields, "version")}
+                return Hero.model_validate(cached)
+
+        if fields is not None:
+            row = self.repo.read_one(hero_id, columns=(*fields, "version"))
+            if not row:
+                raise HTTPException(status_code=404, detail="Hero not found")
+            return dict(row._mapping)
+
         hero = self.repo.read_one(hero_id)
         if not hero:
             raise HTTPException(status_code=404, detail="Hero not found")
+        if self.fill_cache:
+            # not over a row a concurrent write cached (or deleted) meanwhile
+            self._cache_hero(hero, if_generation=generation)
         return hero
 
-    def update(self, hero_id: int, hero: HeroUpdate) -> Hero:
-        hero_db = self.repo.read_one(hero_id)
-        if not hero_db:
-            raise HTTPException(status_code=404, detail="Hero not found")
+    def update(self, hero_id: int, hero: HeroUpdate, if_match: str | None = None) -> Hero:
+        # one UPDATE .. RETURNING; no row updated -> no such hero (or, with
+        # If-Match, a newer version: 412)
         hero_data = hero.model_dump(exclude_unset=True)
-        hero_db = self.repo.update(hero_db, hero_data)
+        versions = match_versions(if_match) if if_match is not None else None
+        hero_db = self.repo.update_by_id(hero_id, hero_data, versions)
+        if not hero_db:
+            raise not_found_or_modified(
+                self.repo.read_version(hero_id) if versions is not None else None
+            )
+        self._cache_hero(hero_db)
 
         return hero_db
 
-    def delete(self, hero_id: int) -> None:
-        hero = self.repo.read_one(hero_id)
-        if not hero:
-            raise HTTPException(status_code=404, detail="Hero not found")
-        self.repo.delete(hero)
+    def update_many(self, heroes: list[HeroBulkUpdate]) -> HeroBulkResult:
+        updates = [hero.model_dump(exclude_unset=True) for hero in heroes]
+        updated = self.repo.update_many(updates)
+        self._invalidate(updated)
+        return bulk_result([data["id"] for data in updates], updated)
+
+    def delete_many(self, hero_ids: list[int]) -> HeroBulkResult:
+        deleted = self.repo.delete_many(hero_ids)
+        self._invalidate(deleted)
+        self._adjust_count(-len(deleted))
+        return bulk_result(hero_ids, deleted)
+
+    def _invalidate(self, hero_ids: list[int]) -> None:
+        if self.cache is not None:
+            for hero_id in hero_ids:
+                self.cache.delete(hero_cache_key(hero_id))
+
+    def delete(self, hero_id: int, if_match: str | None = None) -> None:
+        # one DELETE; no row deleted -> no such hero (or, with If-Match, 412)
+        versions = match_versions(if_match) if if_match is not None else None
+        if not self.repo.delete_by_id(hero_id, versions):
+            raise not_found_or_modified(
+                self.repo.read_version(hero_id) if versions is not None else None
+            )
+        if self.cache is not None:
+            self.cache.delete(hero_cache_key(hero_id))
+        self._adjust_count(-1)
@@ -0,0 +1,74 @@
+"""
+POST /heroes/bulk vs a loop over POST /heroes/ for importing many heroes.
+
+Run from the project root:
+    python -m benchmarks.bench_bulk_create --heroes 5000 --chunk-size 500
+
+Both variants run against the real app (in-process TestClient) on a fresh
+SQLite file each, so the numbers include validation, serialisation and commits.
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.dependencies import SessionDep, get_hero_repository, get_session
+from app.main import app
+from app.repositories.hero_repository import HeroRepository
+
+
+def run(payload: list[dict], chunk_size: int, bulk: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+
+        def get_session_override():
+            with Session(engine) as session:
+                yield session
+
+        def get_hero_repository_override(session: SessionDep) -> HeroRepository:
+            return HeroRepository(session=session, bulk_chunk_size=chunk_size)
+
+        app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_hero_repository] = get_hero_repository_override
+        client = TestClient(app)
+
+        start = time.perf_counter()
+        if bulk:
+            for i in range(0, len(payload), 10_000):  # endpoint accepts up to 10k items
+                client.post("/heroes/bulk", json=payload[i : i + 10_000]).raise_for_status()
+        else:
+            for hero in payload:
+                client.post("/heroes/", json=hero).raise_for_status()
+        elapsed = time.perf_counter() - start
+
+        app.dependency_overrides.clear()
+        engine.dispose()
+        return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--heroes", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one line per request
+
+    payload = [
+        {"name": f"Hero{i}", "secret_name": f"Secret{i}", "age": i % 90}
+        for i in range(args.heroes)
+    ]
+    print(f"heroes={args.heroes} chunk_size={args.chunk_size}")
+    print(f"{'variant':>10} {'seconds':>9} {'heroes/s':>10}")
+    for name, bulk in [("loop", False), ("bulk", True)]:
+        elapsed = run(payload, args.chunk_size, bulk)
+        print(f"{name:>10} {elapsed:>9.3f} {args.heroes / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
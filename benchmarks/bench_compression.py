@@ -0,0 +1,112 @@
+"""
+Bytes vs CPU of the response encodings on typical hero list payloads.
+
+Run from the project root:
+    python -m benchmarks.bench_compression --rows 20 100 --requests 500
+
+For each payload (a `GET /heroes/` page of `rows` heroes, as the fast JSON
+path writes it) and each encoding/ level, prints the compressed size, the
+ratio, and the time to compress (and decompress) it once. The `cached` row is
+what a hit in the middleware's compressed-body cache costs instead (digest +
+lookup). br and zstd rows need `pip install brotli zstandard`.
+"""
+
+import argparse
+import gzip
+import hashlib
+import time
+
+from app.cache import TTLLRUCache
+from app.compression import ENCODERS, brotli, zstandard
+from app.models.hero_models import Hero
+from app.responses import heroes_json
+
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 11], "zstd": [1, 3, 19]}
+
+DECODERS = {"gzip": gzip.decompress}
+if brotli is not None:
+    DECODERS["br"] = brotli.decompress
+if zstandard is not None:
+
+    def zstd_decompress(data: bytes) -> bytes:
+        # streamed frames carry no content size: decode them as a stream
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    DECODERS["zstd"] = zstd_decompress
+
+
+def time_per_call(fn, calls: int) -> float:
+    # best of 3 runs, in microseconds per call
+    runs = []
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        runs.append((time.perf_counter() - start) / calls * 1e6)
+    return min(runs)
+
+
+def hero_page(rows: int) -> bytes:
+    return heroes_json(
+        Hero(
+            id=i,
+            name=f"Hero {i}",
+            secret_name=f"Secret {i}",
+            age=i % 90 or None,
+            gender=("Female", "Male", None)[i % 3],
+        )
+        for i in range(1, rows + 1)
+    )
+
+
+def bench_payload(body: bytes, calls: int) -> list[tuple[str, int, float, float]]:
+    results = [("identity", len(body), 0.0, 0.0)]
+    for encoding, factory in ENCODERS.items():
+        for level in LEVELS[encoding]:
+
+            def compress():
+                return factory(level).compress(body, final=True)
+
+            compressed = compress()
+            decode = DECODERS[encoding]
+            assert decode(compressed) == body
+            results.append(
+                (
+                    f"{encoding}-{level}",
+                    len(compressed),
+                    time_per_call(compress, calls),
+                    time_per_call(lambda: decode(compressed), calls),
+                )
+            )
+
+    cache = TTLLRUCache(max_size=16, ttl=60)
+    key = ("compressed", "gzip", hashlib.blake2b(body, digest_size=16).digest())
+    cache.set(key, b"")
+
+    def cached():
+        return cache.get(("compressed", "gzip", hashlib.blake2b(body, digest_size=16).digest()))
+
+    results.append(("cached", 0, time_per_call(cached, calls), 0.0))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"requests={args.requests}")
+    print(f"{'rows':>6} {'encoding':>9} {'bytes':>8} {'ratio':>6} {'comp us':>9} {'decomp us':>10}")
+    for rows in args.rows:
+        body = hero_page(rows)
+        for name, size, compress_us, decompress_us in bench_payload(body, args.requests):
+            ratio = f"{len(body) / size:.2f}" if size else "-"
+            print(
+                f"{rows:>6} {name:>9} {size:>8} {ratio:>6} "
+                f"{compress_us:>9.1f} {decompress_us:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
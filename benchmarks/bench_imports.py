@@ -0,0 +1,66 @@
+"""
+Import time of `app.main` (the cold-start floor of every worker and test run).
+
+Run from the project root:
+    python -m benchmarks.bench_imports --runs 5 --top 15
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters, per
+DB_STACK, and prints the median total, the share of the app's own modules,
+and the top-level packages that cost the most (self time of all their
+modules). tests/test_imports.py enforces a budget on the same numbers.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+STACKS = ("sync", "async")
+
+
+def import_times(stack: str) -> dict[str, int]:
+    """{module: self time in us} of one `import app.main`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env={**os.environ, "DB_STACK": stack},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(self_us)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for stack in STACKS:
+        totals, app_totals = [], []
+        packages: Counter[str] = Counter()
+        for _ in range(args.runs):
+            times = import_times(stack)
+            totals.append(sum(times.values()) / 1000)
+            app_totals.append(sum(us for m, us in times.items() if m.split(".")[0] == "app") / 1000)
+            for module, us in times.items():
+                packages[module.split(".")[0]] += us / 1000 / args.runs
+
+        total, app_total = statistics.median(totals), statistics.median(app_totals)
+        print(f"DB_STACK={stack}: {total:.1f} ms ({len(times)} modules)")
+        print(f"  app.*: {app_total:.1f} ms ({app_total / total:.0%})")
+        for package, ms in packages.most_common(args.top):
+            print(f"  {package:<24} {ms:>8.1f} ms")
+        print()
+
+
+if __name__ == "__main__":
+    main()
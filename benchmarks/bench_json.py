@@ -0,0 +1,139 @@
+"""
+Fast JSON path vs FastAPI's `response_model` serialisation for the hero list.
+
+Run from the project root:
+    python -m benchmarks.bench_json --rows 100 --requests 2000
+
+Two levels, both for a `limit` sized page of heroes:
+- serialiser: `heroes_json()` vs validate-into-HeroPublic + dump_json (what
+  FastAPI does with `response_model`), on in-memory `Hero` objects
+- endpoint: GET /heroes/ (fast path) vs the same route returning the ORM rows
+  with `response_model=list[HeroPublic]`, through the in-process TestClient
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.dependencies import HeroServiceDep, get_read_session, get_session
+from app.main import app
+from app.models.hero_models import (
+    Hero,
+    HeroFilter,
+    HeroOrderBy,
+    HeroPublic,
+    SortDirection,
+)
+from app.responses import heroes_json
+
+# the pre-fast-path route, mounted next to the real one for comparison
+baseline_router = APIRouter()
+
+
+@baseline_router.get("/baseline/heroes/", response_model=list[HeroPublic])
+def read_heroes_baseline(
+    service: HeroServiceDep,
+    filters: Annotated[HeroFilter, Depends()],
+    offset: int = 0,
+    limit: Annotated[int, Query(le=100)] = 100,
+    order_by: HeroOrderBy = HeroOrderBy.id,
+    direction: SortDirection = SortDirection.asc,
+):
+    return service.read_many(
+        offset, limit, order_by=order_by, direction=direction, filters=filters
+    )
+
+
+def time_per_call(fn, calls: int) -> float:
+    # best of 3 runs, in microseconds per call
+    runs = []
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        runs.append((time.perf_counter() - start) / calls * 1e6)
+    return min(runs)
+
+
+def bench_serialiser(rows: int, calls: int) -> list[tuple[str, float]]:
+    heroes = [
+        Hero(id=i, name=f"Hero{i}", secret_name="s", age=i % 90 or None, gender="Female")
+        for i in range(1, rows + 1)
+    ]
+    adapter = TypeAdapter(list[HeroPublic])
+
+    def response_model():
+        return adapter.dump_json(adapter.validate_python(heroes, from_attributes=True))
+
+    assert response_model() == heroes_json(heroes)
+    return [
+        ("response_model", time_per_call(response_model, calls)),
+        ("heroes_json", time_per_call(lambda: heroes_json(heroes), calls)),
+    ]
+
+
+def bench_endpoint(rows: int, calls: int) -> list[tuple[str, float]]:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            Hero(name=f"Hero{i}", secret_name="s", age=i % 90) for i in range(rows)
+        )
+        session.commit()
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    app.include_router(baseline_router)
+    client = TestClient(app)
+    params = {"limit": rows}
+
+    variants = [("response_model", "/baseline/heroes/"), ("fast path", "/heroes/")]
+    expected = client.get("/heroes/", params=params).content
+    for _, path in variants:
+        assert client.get(path, params=params).content == expected  # same bytes
+
+    latencies = {name: [] for name, _ in variants}
+    for _ in range(calls):  # interleaved, so drift hits both variants alike
+        for name, path in variants:
+            start = time.perf_counter()
+            client.get(path, params=params)
+            latencies[name].append((time.perf_counter() - start) * 1e6)
+    results = [(name, statistics.median(latencies[name])) for name, _ in variants]
+
+    app.dependency_overrides.clear()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one line per request
+
+    print(f"rows={args.rows} requests={args.requests}")
+    print(f"{'level':>10} {'variant':>15} {'us/call':>9}")
+    for level, results in [
+        ("serialiser", bench_serialiser(args.rows, args.requests)),
+        ("endpoint", bench_endpoint(args.rows, args.requests)),
+    ]:
+        for name, micros in results:
+            print(f"{level:>10} {name:>15} {micros:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Request latency with logging off, with direct (blocking) handlers and with the queue.
+
+Run from the project root:
+    python -m benchmarks.bench_logging --requests 2000 --lines 5
+
+Each request to a tiny app logs `--lines` INFO records. Console output goes to
+os.devnull so the terminal is not the bottleneck; the file handler writes to a
+temporary directory.
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.logging_config import get_logger, setup_logging, stop_logging
+
+logger = get_logger("app.bench")
+
+
+def make_app(lines: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        for i in range(lines):
+            logger.info("handled line %d of request %s", i, "ping")
+        return {"ok": True}
+
+    return app
+
+
+def measure(client: TestClient, requests: int) -> list[float]:
+    client.get("/ping")  # warm up
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get("/ping")
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=5)
+    args = parser.parse_args()
+
+    client = TestClient(make_app(args.lines))
+    modes = {
+        "off": None,
+        "direct": {"log_queue": False},
+        "direct+json": {"log_queue": False, "log_json": True},
+        "queue": {"log_queue": True},
+        "queue+json": {"log_queue": True, "log_json": True},
+    }
+
+    print(f"requests={args.requests} log lines/request={args.lines}")
+    print(f"{'mode':>12} {'p50 ms':>8} {'p99 ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for mode, options in modes.items():
+            with contextlib.redirect_stderr(devnull):  # console handler -> devnull
+                if options is None:
+                    logging.disable(logging.CRITICAL)
+                else:
+                    logging.disable(logging.NOTSET)
+                    setup_logging(settings=Settings(log_dir=tmp, **options))
+                timings = measure(client, args.requests)
+                stop_logging()
+
+            p50 = statistics.median(timings)
+            p99 = timings[int(len(timings) * 0.99) - 1]
+            print(f"{mode:>12} {p50:>8.3f} {p99:>8.3f}")
+    logging.disable(logging.NOTSET)
+
+
+if __name__ == "__main__":
+    main()
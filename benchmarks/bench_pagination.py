@@ -0,0 +1,90 @@
+"""
+Offset vs keyset (cursor) pagination latency for `HeroRepository.read_many`.
+
+Run from the project root:
+    python -m benchmarks.bench_pagination --limit 10 --pages 10000
+
+Seeds `limit * pages` heroes into a throwaway SQLite file and times single
+pages at increasing depth. Offset latency grows with the page number;
+keyset latency stays flat.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine, insert
+
+from app.models.hero_models import Hero, HeroOrderBy
+from app.repositories.hero_repository import HeroRepository
+
+
+def seed(engine, rows: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    batch = 10_000
+    with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            conn.execute(
+                insert(Hero),
+                [
+                    {"name": f"Hero{i:08d}", "secret_name": f"S{i}", "age": i % 90}
+                    for i in range(start, min(start + batch, rows))
+                ],
+            )
+
+
+def time_page(fn, repeat: int) -> float:
+    """Median wall time of `fn()` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--order-by", choices=[o.value for o in HeroOrderBy], default="id")
+    args = parser.parse_args()
+    order_by = HeroOrderBy(args.order_by)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        seed(engine, args.limit * args.pages)
+
+        checkpoints = [p for p in (1, 10, 100, 1_000, 10_000, 100_000) if p <= args.pages]
+        print(f"rows={args.limit * args.pages} limit={args.limit} order_by={order_by.value}")
+        print(f"{'page':>8} {'offset ms':>10} {'keyset ms':>10}")
+
+        with Session(engine) as session:
+            repo = HeroRepository(session)
+            for page in checkpoints:
+                offset = (page - 1) * args.limit
+                after = None
+                if offset:
+                    # sort key of the last row on the previous page (what the cursor holds)
+                    last = repo.read_many(offset - 1, 1, order_by=order_by)[0]
+                    after = (getattr(last, order_by.value), last.id)
+
+                offset_ms = time_page(
+                    lambda: repo.read_many(offset, args.limit, order_by=order_by),
+                    args.repeat,
+                )
+                keyset_ms = time_page(
+                    lambda: repo.read_many(limit=args.limit, order_by=order_by, after=after),
+                    args.repeat,
+                )
+                session.expunge_all()
+                print(f"{page:>8} {offset_ms:>10.3f} {keyset_ms:>10.3f}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
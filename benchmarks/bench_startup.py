@@ -0,0 +1,123 @@
+"""
+Cold start: time from launching the server to its first answered request.
+
+Run from the project root:
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --postgres-url postgresql+psycopg2://u:p@localhost/bench
+
+Compares the DB_STARTUP_SCHEMA modes on a database at the migrations head (a
+throwaway SQLite file, or `--postgres-url`: a throwaway database, its hero
+table dropped), set up as a new one is: tables from the models, seeded with
+`--heroes`, then `alembic stamp head` (the first migration expects an
+existing hero table):
+- create: SQLModel.metadata.create_all (catalog lookups for every table/ index)
+- check: one query against alembic_version, compared with the migrations head
+- none: no schema step at all (the floor)
+
+Each run starts `uvicorn app.main:app` in a fresh process (imports included,
+as on a real boot) and polls GET /heroes/?limit=1 until it answers 200; the
+time to that first answer is reported (median/ min/ max of `--runs`), along
+with the schema step alone, as logged by the app's lifespan.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+from benchmarks.seed import seed_heroes
+from benchmarks.suite import free_port, server_env
+
+MODES = ("create", "check", "none")
+SCHEMA_LOG = re.compile(r"Database schema: \w+ \(([\d.]+) ms\)")
+
+
+def prepare_database(database_url: str, env: dict, heroes: int) -> None:
+    engine = create_engine(database_url)
+    SQLModel.metadata.drop_all(engine)
+    seed_heroes(engine, heroes)
+    engine.dispose()
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "stamp", "--purge", "head"],
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def first_request_after_start(env: dict, timeout: float = 60.0) -> float:
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+    command += ["--log-level", "warning"]
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.get("/heroes/?limit=1").status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with {server.returncode}")
+                time.sleep(0.005)
+        raise RuntimeError("server did not answer")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def last_schema_step_ms(log_file: Path) -> float:
+    matches = SCHEMA_LOG.findall(log_file.read_text()) if log_file.exists() else []
+    return float(matches[-1]) if matches else float("nan")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--heroes", type=int, default=10_000)
+    parser.add_argument("--postgres-url", help="throwaway postgres db (default: SQLite)")
+    parser.add_argument("--stack", choices=("sync", "async"), default="sync")
+    args = parser.parse_args()
+
+    print(f"{'schema':<7} {'first request ms (median/ min/ max)':>36} {'schema step ms':>15}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        if args.postgres_url:
+            target, database_url = "postgres", args.postgres_url
+        else:
+            target, database_url = "sqlite-file", f"sqlite:///{tmp / 'bench.db'}"
+        base_env = server_env(target, database_url, tmp, args)
+        base_env.pop("DB_STARTUP_SCHEMA", None)
+        prepare_database(database_url, base_env, args.heroes)
+
+        for mode in args.modes:
+            env = {**base_env, "DB_STARTUP_SCHEMA": mode}
+            first_request, schema_step = [], []
+            for _ in range(args.runs):
+                first_request.append(first_request_after_start(env) * 1000)
+                schema_step.append(last_schema_step_ms(tmp / "app.log"))
+            print(
+                f"{mode:<7} {statistics.median(first_request):>16.1f} "
+                f"{min(first_request):>9.1f} {max(first_request):>9.1f} "
+                f"{statistics.median(schema_step):>15.2f}"
+            )
+    print(f"\n{os.cpu_count()} CPU cores, python {sys.version.split()[0]}")
+
+
+if __name__ == "__main__":
+    main()
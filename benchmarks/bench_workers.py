@@ -0,0 +1,128 @@
+"""
+Scaling benchmark: `python -m app.server` with 1, 2, 4 and 8 worker processes.
+
+Run from the project root:
+    python -m benchmarks.bench_workers --heroes 10000 --concurrency 64 --duration 10
+
+For each SERVER_WORKERS value it starts the production entrypoint on a seeded
+throwaway SQLite file, drives it with `--concurrency` concurrent httpx clients
+(reads by id, first pages of the list, and creates) and prints req/s and
+p50/p95/p99 latency, plus the speedup over one worker. The load generator
+shares the machine: past the core count, workers compete with it (and with
+each other), so expect the curve to flatten there.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks import report
+from benchmarks.seed import seed_heroes
+from benchmarks.suite import free_port, wait_until_up
+
+
+def requests_mix(heroes: int, rng: random.Random):
+    # 80% reads by id, 15% list pages, 5% creates
+    roll = rng.random()
+    if roll < 0.80:
+        return "GET", f"/heroes/{rng.randint(1, heroes)}", None
+    if roll < 0.95:
+        return "GET", "/heroes/?limit=20", None
+    return "POST", "/heroes/", {"name": f"Bench {rng.getrandbits(32)}", "secret_name": "x"}
+
+
+async def drive(base_url: str, heroes: int, args) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    warm_until = time.perf_counter() + args.warmup
+    deadline = warm_until + args.duration
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def worker(rng: random.Random) -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                method, url, body = requests_mix(heroes, rng)
+                call_start = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                if call_start < warm_until:
+                    continue
+                if response.is_success:
+                    latencies.append(time.perf_counter() - call_start)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker(random.Random(i)) for i in range(args.concurrency)))
+    return report.summarize(latencies, args.duration, errors)
+
+
+def run(workers: int, sqlite_file: Path, tmp: Path, args) -> dict:
+    port = free_port()
+    env = {
+        **os.environ,
+        "DB_ENGINE": "sqlite",
+        "SQLITE_FILE_NAME": str(sqlite_file),
+        "DB_STACK": args.stack,
+        "LOG_DIR": str(tmp),
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": str(workers),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(wait_until_up(base_url))
+        return asyncio.run(drive(base_url, args.heroes, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--heroes", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--stack", choices=("sync", "async"), default="sync")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU cores; {args.concurrency} concurrent clients\n")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for workers in args.workers:
+            sqlite_file = tmp / f"bench-{workers}.db"  # same data, no earlier creates
+            engine = create_engine(f"sqlite:///{sqlite_file}")
+            seed_heroes(engine, args.heroes)
+            engine.dispose()
+            results[workers] = run(workers, sqlite_file, tmp, args)
+
+    base_rps = next(iter(results.values()))["rps"]
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for workers, stats in results.items():
+        speedup = stats["rps"] / base_rps if base_rps else 0.0
+        print(
+            f"{workers:>7} {stats['rps']:>9.1f} {speedup:>7.2f}x "
+            f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
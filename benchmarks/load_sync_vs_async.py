@@ -0,0 +1,125 @@
+"""
+Load test: sync stack (def handlers + Session) vs async stack (async def + AsyncSession).
+
+Run from the project root:
+    python -m benchmarks.load_sync_vs_async --concurrency 64 --duration 10
+
+For each DB_STACK it seeds a throwaway SQLite file, starts `uvicorn app.main:app`
+in a subprocess and drives it with `--concurrency` concurrent httpx clients,
+then prints requests per second and p50/p99 latency.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlmodel import SQLModel, create_engine, insert
+
+from app.models.hero_models import Hero
+
+
+def seed(sqlite_file: Path, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{sqlite_file}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Hero),
+            [{"name": f"Hero{i}", "secret_name": f"S{i}", "age": i % 90} for i in range(rows)],
+        )
+    engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/heroes/1")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+async def drive(base_url: str, rows: int, concurrency: int, duration: float) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker() -> None:
+            while time.monotonic() < deadline:
+                if random.random() < 0.8:
+                    url = f"/heroes/{random.randint(1, rows)}"
+                else:
+                    url = f"/heroes/?offset={random.randint(0, rows - 20)}&limit=20"
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def run_stack(stack: str, args, sqlite_file: Path) -> tuple[float, float, float]:
+    port = free_port()
+    env = {**os.environ, "DB_ENGINE": "sqlite", "DB_STACK": stack, "SQLITE_FILE_NAME": str(sqlite_file)}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(wait_until_up(base_url))
+        latencies = asyncio.run(drive(base_url, args.rows, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    rps = len(latencies) / args.duration
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    return rps, p50, p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--stacks", nargs="+", default=["sync", "async"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_file = Path(tmp) / "bench.db"
+        seed(sqlite_file, args.rows)
+
+        print(f"rows={args.rows} concurrency={args.concurrency} duration={args.duration}s")
+        print(f"{'stack':>6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+        for stack in args.stacks:
+            rps, p50, p99 = run_stack(stack, args, sqlite_file)
+            print(f"{stack:>6} {rps:>10.1f} {p50:>10.2f} {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Results of `benchmarks.suite`: latency percentiles, tables and baseline comparison.
+
+A result set is JSON: {"meta": {...run parameters...}, "results": {key: stats}},
+with one key per "target/layer/scenario" (e.g. "sqlite-file/http/GET /heroes/{id}")
+and stats {"count", "errors", "rps", "p50_ms", "p95_ms", "p99_ms"}.
+"""
+
+import json
+import platform
+import sys
+from pathlib import Path
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    # nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    """Stats of one scenario from its per-call latencies (seconds) and wall time."""
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def run_meta(**params) -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        **params,
+    }
+
+
+def save(path: Path, meta: dict, results: dict) -> None:
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+
+
+def load(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def print_table(results: dict) -> None:
+    print(
+        f"{'benchmark':<58} {'n':>7} {'err':>5} {'req/s':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for key, stats in results.items():
+        print(
+            f"{key:<58} {stats['count']:>7} {stats['errors']:>5} {stats['rps']:>9.1f} "
+            f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}"
+        )
+
+
+def compare(baseline: dict, meta: dict, results: dict, tolerance: float) -> list[str]:
+    """
+    Print each result against the baseline; returns the regressed keys.
+
+    A regression is p95 more than `tolerance` (a fraction) above the baseline,
+    or req/s more than `tolerance` below it. Keys missing on either side never
+    count as regressions.
+    """
+    base_meta, base_results = baseline["meta"], baseline["results"]
+    print(f"baseline: python {base_meta.get('python')} on {base_meta.get('platform')}")
+    for param, value in meta.items():
+        if base_meta.get(param) != value:
+            print(f"warning: {param}={value}, but {base_meta.get(param)} in the baseline")
+
+    regressions = []
+    print(f"{'benchmark':<58} {'req/s':>9} {'Δ req/s':>8} {'p95 ms':>9} {'Δ p95':>8}")
+    for key, stats in results.items():
+        base = base_results.get(key)
+        if base is None:
+            print(f"{key:<58} {'(not in baseline)':>36}")
+            continue
+        rps_change = stats["rps"] / base["rps"] - 1 if base["rps"] else 0.0
+        p95_change = stats["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        regressed = rps_change < -tolerance or p95_change > tolerance
+        if regressed:
+            regressions.append(key)
+        print(
+            f"{key:<58} {stats['rps']:>9.1f} {rps_change:>+8.1%} "
+            f"{stats['p95_ms']:>9.3f} {p95_change:>+8.1%}{'  REGRESSED' if regressed else ''}"
+        )
+    not_run = base_results.keys() - results.keys()
+    if not_run:
+        print(f"({len(not_run)} baseline benchmarks not run this time)")
+    return regressions
@@ -0,0 +1,70 @@
+"""
+Seed-data generator: a reproducible hero table of 10^4 .. 10^7 rows.
+
+Run from the project root:
+    python -m benchmarks.seed --database-url sqlite:///bench.db --heroes 1000000
+
+The same `--seed` always produces the same heroes (names, ages, genders), so
+benchmark runs on different branches/ machines read the same data. Rows go in
+with multi-row INSERTs of `--batch` heroes, one transaction per batch; the
+table (and its full-text index) is created first if it does not exist.
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Iterator
+
+from sqlalchemy import Engine, create_engine, insert
+from sqlmodel import SQLModel
+
+from app.models.hero_models import Hero
+
+FIRST_NAMES = (
+    "Captain", "Doctor", "Iron", "Silver", "Night", "Storm", "Shadow", "Black",
+    "Scarlet", "Green", "Atomic", "Cosmic", "Crimson", "Golden", "Mister", "Lady",
+)  # fmt: skip
+LAST_NAMES = (
+    "Nova", "Falcon", "Wasp", "Panther", "Hawk", "Spider", "Widow", "Lantern",
+    "Arrow", "Phoenix", "Titan", "Raven", "Comet", "Fury", "Blade", "Vision",
+)  # fmt: skip
+GENDERS = ("Female", "Male", "Non-binary", None)
+
+
+def hero_rows(count: int, seed: int = 0, start: int = 0) -> Iterator[dict]:
+    """Heroes `start` .. `start + count - 1` of the data set for `seed`."""
+    for i in range(start, start + count):
+        rng = random.Random(seed * 1_000_003 + i)  # per row: any slice is reproducible
+        yield {
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            "secret_name": f"Secret {rng.getrandbits(32):08x}",
+            "age": None if rng.random() < 0.1 else rng.randint(18, 90),
+            "gender": rng.choice(GENDERS),
+        }
+
+
+def seed_heroes(engine: Engine, count: int, seed: int = 0, batch: int = 10_000) -> None:
+    SQLModel.metadata.create_all(engine)
+    for start in range(0, count, batch):
+        with engine.begin() as conn:
+            conn.execute(insert(Hero), list(hero_rows(min(batch, count - start), seed, start)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite:///bench.db")
+    parser.add_argument("--heroes", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    start = time.perf_counter()
+    seed_heroes(engine, args.heroes, args.seed, args.batch)
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    print(f"seeded {args.heroes} heroes in {elapsed:.1f}s ({args.heroes / elapsed:.0f} heroes/s)")
+
+
+if __name__ == "__main__":
+    main()
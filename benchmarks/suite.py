@@ -0,0 +1,435 @@
+"""
+Benchmark suite: every hero endpoint, and the repository/ service layers alone.
+
+Run from the project root:
+    python -m benchmarks.suite --heroes 10000 --duration 5 --save-baseline baseline.json
+    # ... change something, then:
+    python -m benchmarks.suite --heroes 10000 --duration 5 --baseline baseline.json
+
+Targets (`--targets`):
+- sqlite-file: a throwaway SQLite file (with the app's pragmas)
+- sqlite-memory: an in-memory SQLite db; over http the server runs one worker,
+  seeded through POST /heroes/bulk (nothing else can reach its memory), and
+  gets one request at a time (its single shared connection allows no more)
+- postgres: `--postgres-url` (a throwaway database: its hero table is dropped
+  and re-seeded); skipped when not given
+
+Layers (`--layers`):
+- repository/ service: each method called in process, one call at a time,
+  with a fresh Session per call (as per request)
+- http: `uvicorn app.main:app --workers N` started locally and driven by
+  `--concurrency` concurrent httpx clients; no external service is involved
+
+Every scenario runs for `--duration` seconds after `--warmup` seconds and
+reports p50/p95/p99 latency and requests (calls) per second. Heroes come from
+`benchmarks.seed` (`--heroes` 10^4 .. 10^7, same data for the same `--seed`).
+`--baseline` compares with a stored run and exits with 1 when a scenario's
+p95 or req/s is more than `--tolerance` worse; compare runs of one machine.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+from sqlalchemy import Engine, StaticPool, create_engine, make_url
+from sqlmodel import Session, SQLModel
+
+from app.cache import TTLLRUCache
+from app.db import set_sqlite_pragmas
+from app.models.hero_models import (
+    Hero,
+    HeroBulkUpdate,
+    HeroCountMode,
+    HeroCreate,
+    HeroFilter,
+    HeroOrderBy,
+    HeroUpdate,
+)
+from app.pagination import encode_cursor
+from app.repositories.hero_repository import HeroRepository
+from app.services.hero_service import HeroService
+from benchmarks import report
+from benchmarks.seed import LAST_NAMES, hero_rows, seed_heroes
+
+TARGETS = ("sqlite-file", "sqlite-memory", "postgres")
+LAYERS = ("repository", "service", "http")
+PAGE = 20  # page size of the list scenarios
+BULK = 100  # heroes per bulk scenario call
+# these delete what the create scenarios before them made: no warmup to use it up
+NO_WARMUP = {"delete_by_id", "delete", "DELETE /heroes/{id}", "DELETE /heroes/bulk"}
+
+
+class Context:
+    """What one scenario run knows: the data set size and the rows it created."""
+
+    def __init__(self, heroes: int, seed: int) -> None:
+        self.heroes = heroes
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.created: list[int] = []  # by the create scenarios, for the delete ones
+        self.bulk_created: list[int] = []
+
+    def hero_id(self) -> int:
+        return self.rng.randint(1, self.heroes)
+
+    def new_hero(self) -> dict:
+        # a hero from far beyond the seeded range of the same data set
+        return next(hero_rows(1, self.seed, start=self.rng.randrange(10**8, 10**9)))
+
+    def offset(self) -> int:
+        return self.rng.randrange(max(1, self.heroes - PAGE))
+
+    def age(self) -> int:
+        return self.rng.randint(18, 85)
+
+    def last_name(self) -> str:
+        return self.rng.choice(LAST_NAMES)
+
+
+# ==== ==== In process: one callable per scenario, given the layer object ==== ====
+def repository_scenarios(ctx: Context) -> dict[str, Callable[[HeroRepository], object]]:
+    def delete_one(repo: HeroRepository):
+        return repo.delete_by_id(ctx.created.pop()) if ctx.created else StopIteration
+
+    return {
+        "read_one": lambda repo: repo.read_one(ctx.hero_id()),
+        "read_many offset": lambda repo: repo.read_many(ctx.offset(), PAGE),
+        "read_many keyset": lambda repo: repo.read_many(
+            0, PAGE, after=(hero_id := ctx.hero_id(), hero_id)
+        ),
+        "read_many filtered": lambda repo: repo.read_many(
+            0,
+            PAGE,
+            order_by=HeroOrderBy.age,
+            filters=HeroFilter(age_min=(age := ctx.age()), age_max=age + 5),
+        ),
+        "read_many columns": lambda repo: repo.read_many(
+            ctx.offset(), PAGE, columns=("id", "name")
+        ),
+        "search": lambda repo: repo.search([ctx.last_name().lower()], 0, PAGE),
+        "count": lambda repo: repo.count(),
+        "estimate_count": lambda repo: repo.estimate_count(),
+        "create": lambda repo: ctx.created.append(repo.create(Hero(**ctx.new_hero())).id),
+        "create_many": lambda repo: repo.create_many(
+            [Hero(**ctx.new_hero()) for _ in range(BULK)]
+        ),
+        "update_by_id": lambda repo: repo.update_by_id(ctx.hero_id(), {"age": ctx.age()}),
+        "update_many": lambda repo: repo.update_many(
+            [{"id": ctx.hero_id(), "age": ctx.age()} for _ in range(BULK)]
+        ),
+        "delete_by_id": delete_one,
+    }
+
+
+def service_scenarios(ctx: Context) -> dict[str, Callable[[HeroService], object]]:
+    def delete_one(service: HeroService):
+        return service.delete(ctx.created.pop()) if ctx.created else StopIteration
+
+    return {
+        "read_one (cached)": lambda service: service.read_one(ctx.hero_id()),
+        "read_one fields": lambda service: service.read_one(ctx.hero_id(), ("id", "name")),
+        "read_many offset": lambda service: service.read_many(ctx.offset(), PAGE),
+        "read_many cursor": lambda service: service.read_many(
+            0, PAGE, cursor=encode_cursor("id", hero_id := ctx.hero_id(), hero_id)
+        ),
+        "search": lambda service: service.search(ctx.last_name(), 0, PAGE),
+        "count cached": lambda service: service.count(HeroCountMode.cached),
+        "count estimated": lambda service: service.count(HeroCountMode.estimated),
+        "create": lambda service: ctx.created.append(
+            service.create(HeroCreate(**ctx.new_hero())).id
+        ),
+        "create_many": lambda service: service.create_many(
+            [HeroCreate(**ctx.new_hero()) for _ in range(BULK)]
+        ),
+        "update": lambda service: service.update(ctx.hero_id(), HeroUpdate(age=ctx.age())),
+        "update_many": lambda service: service.update_many(
+            [HeroBulkUpdate(id=ctx.hero_id(), age=ctx.age()) for _ in range(BULK)]
+        ),
+        "delete": delete_one,
+    }
+
+
+def run_in_process(engine: Engine, layer: str, args) -> dict:
+    ctx = Context(args.heroes, args.seed)
+    cache = TTLLRUCache(max_size=10_000, ttl=30.0)  # process-wide, as in the app
+
+    def layer_object(session: Session):
+        repo = HeroRepository(session)
+        return repo if layer == "repository" else HeroService(repo=repo, cache=cache)
+
+    scenarios = repository_scenarios(ctx) if layer == "repository" else service_scenarios(ctx)
+    results = {}
+    for name, scenario in scenarios.items():
+        latencies: list[float] = []
+        warm_until = time.perf_counter() + (0 if name in NO_WARMUP else args.warmup)
+        deadline = warm_until + args.duration
+        while (now := time.perf_counter()) < deadline:
+            with Session(engine) as session:
+                obj = layer_object(session)
+                call_start = time.perf_counter()
+                outcome = scenario(obj)
+                call_end = time.perf_counter()
+            if outcome is StopIteration:  # nothing left to delete
+                break
+            if now >= warm_until:
+                latencies.append(call_end - call_start)
+        elapsed = max(0.0, min(time.perf_counter(), deadline) - warm_until)
+        results[name] = report.summarize(latencies, elapsed)
+    return results
+
+
+# ==== ==== Over HTTP: one request builder per scenario ==== ====
+# (method, url, json body) or None once there is nothing left to do;
+# `core` scenarios are the ones the async stack (async_hero_router) serves
+def http_scenarios(ctx: Context, core_only: bool) -> dict[str, Callable[[], tuple | None]]:
+    def delete_bulk():
+        if len(ctx.bulk_created) < BULK:
+            return None
+        ids = [ctx.bulk_created.pop() for _ in range(BULK)]
+        return "DELETE", "/heroes/bulk", ids
+
+    core = {
+        "GET /heroes/{id}": lambda: ("GET", f"/heroes/{ctx.hero_id()}", None),
+        "GET /heroes/ offset": lambda: (
+            "GET", f"/heroes/?limit={PAGE}&offset={ctx.offset()}", None
+        ),
+        "GET /heroes/ cursor": lambda: (
+            "GET",
+            f"/heroes/?limit={PAGE}&cursor={encode_cursor('id', i := ctx.hero_id(), i)}",
+            None,
+        ),
+        "GET /heroes/ filtered": lambda: (
+            "GET",
+            f"/heroes/?limit={PAGE}&order_by=age&age_min={(a := ctx.age())}&age_max={a + 5}",
+            None,
+        ),
+        "GET /heroes/ fields": lambda: (
+            "GET", f"/heroes/?limit={PAGE}&fields=id,name&offset={ctx.offset()}", None
+        ),
+        "GET /heroes/ count": lambda: ("GET", f"/heroes/?limit={PAGE}&count=estimated", None),
+        "POST /heroes/": lambda: ("POST", "/heroes/", ctx.new_hero()),
+        "PATCH /heroes/{id}": lambda: (
+            "PATCH", f"/heroes/{ctx.hero_id()}", {"age": ctx.age()}
+        ),
+        "DELETE /heroes/{id}": lambda: (
+            ("DELETE", f"/heroes/{ctx.created.pop()}", None) if ctx.created else None
+        ),
+    }
+    if core_only:
+        return core
+    return {
+        **core,
+        "GET /heroes/search": lambda: (
+            "GET", f"/heroes/search?q={ctx.last_name()}&limit={PAGE}", None
+        ),
+        "GET /heroes/export": lambda: ("GET", "/heroes/export", None),
+        "POST /heroes/bulk": lambda: (
+            "POST", "/heroes/bulk", [ctx.new_hero() for _ in range(BULK)]
+        ),
+        "PATCH /heroes/bulk": lambda: (
+            "PATCH",
+            "/heroes/bulk",
+            [{"id": ctx.hero_id(), "age": ctx.age()} for _ in range(BULK)],
+        ),
+        "DELETE /heroes/bulk": delete_bulk,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/heroes/?limit=1")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+async def seed_over_http(base_url: str, heroes: int, seed: int) -> None:
+    # sqlite-memory: the server's db lives in its own process
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        for start in range(0, heroes, 10_000):
+            rows = list(hero_rows(min(10_000, heroes - start), seed, start))
+            (await client.post("/heroes/bulk", json=rows)).raise_for_status()
+
+
+async def drive(
+    base_url: str, scenarios: dict, ctx: Context, concurrency: int, args
+) -> dict:
+    results = {}
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        for name, build_request in scenarios.items():
+            latencies: list[float] = []
+            errors = 0
+            warm_until = time.perf_counter() + (0 if name in NO_WARMUP else args.warmup)
+            deadline = warm_until + args.duration
+
+            async def worker() -> None:
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    request = build_request()
+                    if request is None:  # nothing left to delete
+                        return
+                    method, url, body = request
+                    call_start = time.perf_counter()
+                    response = await client.request(method, url, json=body)
+                    call_end = time.perf_counter()
+                    if method == "POST" and response.is_success:
+                        created = response.json()
+                        if isinstance(created, list):
+                            ctx.bulk_created.extend(hero["id"] for hero in created)
+                        else:
+                            ctx.created.append(created["id"])
+                    if call_start < warm_until:
+                        continue
+                    if response.is_success:
+                        latencies.append(call_end - call_start)
+                    else:
+                        errors += 1
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = max(0.0, min(time.perf_counter(), deadline) - warm_until)
+            results[name] = report.summarize(latencies, elapsed, errors)
+    return results
+
+
+def server_env(target: str, database_url: str, tmp: Path, args) -> dict:
+    env = {**os.environ, "DB_STACK": args.stack, "LOG_DIR": str(tmp)}
+    if target == "postgres":
+        url = make_url(database_url)
+        env.update(
+            DB_ENGINE="postgres",
+            POSTGRES_USER=url.username or "",
+            POSTGRES_PASSWORD=url.password or "",
+            POSTGRES_HOST=url.host or "localhost",
+            POSTGRES_PORT=str(url.port or 5432),
+            POSTGRES_DB=url.database or "",
+        )
+    else:
+        sqlite_file = make_url(database_url).database or ":memory:"
+        env.update(DB_ENGINE="sqlite", SQLITE_FILE_NAME=sqlite_file)
+    return env
+
+
+def run_http(target: str, database_url: str, tmp: Path, args) -> dict:
+    port = free_port()
+    in_memory = target == "sqlite-memory"
+    workers, concurrency = (1, 1) if in_memory else (args.workers, args.concurrency)
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+    command += ["--workers", str(workers), "--log-level", "warning"]
+    server = subprocess.Popen(
+        command,
+        env=server_env(target, database_url, tmp, args),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(wait_until_up(base_url))
+        if in_memory:
+            asyncio.run(seed_over_http(base_url, args.heroes, args.seed))
+        ctx = Context(args.heroes, args.seed)
+        scenarios = http_scenarios(ctx, core_only=args.stack == "async")
+        return asyncio.run(drive(base_url, scenarios, ctx, concurrency, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+# ==== ==== Targets ==== ====
+def prepare_target(target: str, tmp: Path, args) -> tuple[str, Engine]:
+    """Seed the target; returns its URL and an engine for the in-process layers."""
+    if target == "sqlite-file":
+        database_url = f"sqlite:///{tmp / 'bench.db'}"
+        engine = create_engine(database_url, connect_args={"check_same_thread": False})
+        set_sqlite_pragmas(engine)
+    elif target == "sqlite-memory":
+        database_url = "sqlite://"
+        engine = create_engine(
+            database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    else:
+        database_url = args.postgres_url
+        engine = create_engine(database_url)
+        SQLModel.metadata.drop_all(engine)
+
+    start = time.perf_counter()
+    seed_heroes(engine, args.heroes, args.seed)
+    print(f"{target}: seeded {args.heroes} heroes in {time.perf_counter() - start:.1f}s")
+    return database_url, engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--heroes", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--layers", nargs="+", choices=LAYERS, default=list(LAYERS))
+    parser.add_argument("--postgres-url", help="e.g. postgresql+psycopg2://u:p@localhost/bench")
+    parser.add_argument("--stack", choices=["sync", "async"], default="sync")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds per scenario")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--save-baseline", type=Path, help="store the results as the baseline")
+    parser.add_argument("--baseline", type=Path, help="compare with a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    targets = [t for t in args.targets if t != "postgres" or args.postgres_url]
+    meta = report.run_meta(
+        heroes=args.heroes,
+        seed=args.seed,
+        stack=args.stack,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        duration=args.duration,
+    )
+    results: dict[str, dict] = {}
+    for target in targets:
+        with tempfile.TemporaryDirectory() as tmp:
+            database_url, engine = prepare_target(target, Path(tmp), args)
+            for layer in args.layers:
+                if layer == "http":
+                    if target != "sqlite-memory":  # (disposing would drop that db)
+                        engine.dispose()  # the server has the database to itself
+                    layer_results = run_http(target, database_url, Path(tmp), args)
+                else:
+                    layer_results = run_in_process(engine, layer, args)
+                for name, stats in layer_results.items():
+                    results[f"{target}/{layer}/{name}"] = stats
+            engine.dispose()
+
+    report.print_table(results)
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            report.save(path, meta, results)
+    if args.baseline is not None:
+        baseline = report.load(args.baseline)
+        regressions = report.compare(baseline, meta, results, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""add full-text search on hero.name (sqlite FTS5 / postgres tsvector)
+
+Revision ID: 8d4f0a6e2b17
+Revises: 5b9e2c7d41a3
+Create Date: 2026-10-18 11:40:27.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f0a6e2b17'
+down_revision: Union[str, Sequence[str], None] = '5b9e2c7d41a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # hand written: full-text objects are outside the SQLModel metadata
+    # (same DDL as `HERO_SEARCH_DDL` in app/models/hero_models.py)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE hero ADD COLUMN name_tsv tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', name)) STORED"
+        )
+        op.execute("CREATE INDEX ix_hero_name_tsv ON hero USING gin (name_tsv)")
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE hero_fts USING fts5(name, content='hero', content_rowid='id')"
+    )
+    op.execute(
+        """CREATE TRIGGER hero_fts_insert AFTER INSERT ON hero BEGIN
+            INSERT INTO hero_fts(rowid, name) VALUES (new.id, new.name);
+        END"""
+    )
+    op.execute(
+        """CREATE TRIGGER hero_fts_delete AFTER DELETE ON hero BEGIN
+            INSERT INTO hero_fts(hero_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END"""
+    )
+    op.execute(
+        """CREATE TRIGGER hero_fts_update AFTER UPDATE OF name ON hero BEGIN
+            INSERT INTO hero_fts(hero_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO hero_fts(rowid, name) VALUES (new.id, new.name);
+        END"""
+    )
+    # index the heroes already in the table
+    op.execute("INSERT INTO hero_fts(hero_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX ix_hero_name_tsv")
+        op.execute("ALTER TABLE hero DROP COLUMN name_tsv")
+        return
+
+    op.execute("DROP TRIGGER hero_fts_update")
+    op.execute("DROP TRIGGER hero_fts_delete")
+    op.execute("DROP TRIGGER hero_fts_insert")
+    op.execute("DROP TABLE hero_fts")
@@ -5,12 +5,22 @@
 # to share across multiple test files.
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import StaticPool, create_engine
+from sqlalchemy import NullPool, StaticPool, create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.dependencies import get_session
+from app.async_dependencies import get_async_read_session, get_async_session
+from app.dependencies import (
+    get_hero_cache,
+    get_hero_count_cache,
+    get_read_session,
+    get_session,
+)
 from app.main import app
+from app.routers import async_hero_router
 
 
 @pytest.fixture(name="session")
@@ -28,12 +38,59 @@ def session_fixture():
         yield session
 
 
+def clear_hero_cache():
+    # the hero caches are process-wide; every test starts with a fresh db
+    for cache in (get_hero_cache(), get_hero_count_cache()):
+        if cache is not None:
+            cache.clear()
+
+
 @pytest.fixture(name="client")
 def client_fixture(session: Session):
     def get_session_override():
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
     client = TestClient(app=app)
     yield client
     app.dependency_overrides.clear()
+    clear_hero_cache()
+
+
+# ==== ==== Async stack (DB_STACK=async) ==== ====
+# async tests run on anyio's pytest plugin: `@pytest.mark.anyio`
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(name="async_engine")
+def async_engine_fixture(tmp_path):
+    # File db (not in-memory): every event loop opens its own connection to it
+    sqlite_file = tmp_path / "test.db"
+    SQLModel.metadata.create_all(create_engine(f"sqlite:///{sqlite_file}"))
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{sqlite_file}", poolclass=NullPool)
+    yield engine
+
+
+@pytest.fixture(name="async_session")
+async def async_session_fixture(async_engine):
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture(name="async_client")
+def async_client_fixture(async_engine):
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    async_app = FastAPI()
+    async_app.include_router(async_hero_router.router)
+    async_app.dependency_overrides[get_async_session] = get_async_session_override
+    async_app.dependency_overrides[get_async_read_session] = get_async_session_override
+    client = TestClient(app=async_app)
+    yield client
+    clear_hero_cache()
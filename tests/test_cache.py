@@ -0,0 +1,115 @@
+from app.cache import TTLLRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_set_counts_hits_and_misses():
+    # Arrange
+    cache = TTLLRUCache(max_size=10, ttl=60)
+
+    # Act
+    miss = cache.get("a")
+    cache.set("a", {"id": 1})
+    hit = cache.get("a")
+
+    # Assert
+    assert miss is None
+    assert hit == {"id": 1}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    # Arrange
+    cache = TTLLRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+
+    # Act
+    cache.set("c", 3)
+
+    # Assert
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    # Arrange
+    clock = FakeClock()
+    cache = TTLLRUCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    # Act
+    clock.now = 4.9
+    before = cache.get("a")
+    clock.now = 5.0
+    after = cache.get("a")
+
+    # Assert
+    assert before == 1
+    assert after is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_delete_and_clear():
+    # Arrange
+    cache = TTLLRUCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Act
+    cache.delete("a")
+    cache.delete("missing")  # no error
+    size_after_delete = cache.stats()["size"]
+    cache.clear()
+
+    # Assert
+    assert size_after_delete == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_incr_updates_live_entry_and_keeps_its_expiry():
+    # Arrange
+    clock = FakeClock()
+    cache = TTLLRUCache(max_size=10, ttl=10, clock=clock)
+    cache.set("count", 5)
+
+    # Act
+    clock.now = 6
+    incremented = cache.incr("count", 2)
+    missing = cache.incr("other", 1)
+
+    # Assert
+    assert incremented == 7
+    assert cache.get("count") == 7
+    assert missing is None
+    assert cache.get("other") is None
+    clock.now = 10  # expires 10s after set(), not after incr()
+    assert cache.incr("count", 1) is None
+    assert cache.get("count") is None
+
+
+def test_set_if_generation_skips_after_a_write():
+    # Arrange: a read-through fill read its row at `generation`
+    cache = TTLLRUCache(max_size=10, ttl=60)
+    generation = cache.generation()
+    cache.set("b", 2)  # a write in between (to any key)
+
+    # Act
+    stale = cache.set("a", 1, if_generation=generation)
+    fresh = cache.set("a", 1, if_generation=cache.generation())
+
+    # Assert
+    assert stale is False
+    assert fresh is True
+    assert cache.get("a") == 1
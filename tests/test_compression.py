@@ -0,0 +1,142 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.cache import TTLLRUCache
+from app.compression import CompressionMiddleware, choose_encoding, media_type_matches
+from app.config import Settings
+
+BIG = json.dumps([{"id": i, "name": f"Hero{i}"} for i in range(200)]).encode()
+
+
+def make_client(cache=None, **options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return Response(BIG, media_type="application/json", headers={"ETag": '"1"'})
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"id": 1}', media_type="application/json")
+
+    @app.get("/image")
+    def image():
+        return Response(BIG, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        lines = (b'{"id": %d}\n' % i for i in range(1000))
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    settings = Settings(**options)
+    app.add_middleware(CompressionMiddleware, settings=settings, cache=cache)
+    return TestClient(app)
+
+
+def test_choose_encoding():
+    preference = ["zstd", "br", "gzip"]
+
+    assert choose_encoding("gzip, deflate, br", preference) == "br"
+    assert choose_encoding("gzip;q=0.5, br;q=0", preference) == "gzip"
+    assert choose_encoding("*", preference) == "zstd"
+    assert choose_encoding("*;q=0, gzip", preference) == "gzip"
+    assert choose_encoding("identity", preference) is None
+    assert choose_encoding("", preference) is None
+
+
+def test_media_type_matches():
+    rules = ["application/json", "text/*"]
+
+    assert media_type_matches("application/json", rules)
+    assert media_type_matches("text/csv; charset=utf-8", rules)
+    assert not media_type_matches("image/png", rules)
+    assert not media_type_matches("", rules)
+
+
+def test_compresses_large_bodies_of_listed_types_only():
+    client = make_client(compression_encodings="gzip")
+    gzip_only = {"Accept-Encoding": "gzip"}
+
+    big = client.get("/big", headers=gzip_only)
+    small = client.get("/small", headers=gzip_only)
+    image = client.get("/image", headers=gzip_only)
+    identity = client.get("/big", headers={"Accept-Encoding": "identity"})
+
+    assert big.headers["Content-Encoding"] == "gzip"
+    assert big.headers["Vary"] == "Accept-Encoding"
+    assert big.headers["ETag"] == '"1"'  # the version tag, usable in If-Match
+    assert int(big.headers["Content-Length"]) < len(BIG) / 5
+    assert big.content == BIG  # httpx decodes it
+    for response in small, image, identity:
+        assert "Content-Encoding" not in response.headers
+    assert identity.content == BIG
+
+
+@pytest.mark.anyio
+async def test_streamed_bodies_are_compressed_incrementally():
+    # straight through ASGI: TestClient would buffer the whole stream
+    chunks = [b'{"id": %d}\n' % i for i in range(3)]
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"application/x-ndjson")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i, chunk in enumerate(chunks):
+            more_body = i < len(chunks) - 1
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CompressionMiddleware(app, Settings(compression_encodings="gzip"))
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await middleware(scope, None, send)
+
+    start, *bodies = sent
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert [body["more_body"] for body in bodies] == [True, True, False]
+    # every chunk is flushed: what arrived so far already decodes
+    decoder = zlib.decompressobj(31)
+    for chunk, body in zip(chunks, bodies):
+        assert decoder.decompress(body["body"]) == chunk
+    assert gzip.decompress(b"".join(body["body"] for body in bodies)) == b"".join(chunks)
+
+
+def test_streaming_response_is_compressed():
+    client = make_client(compression_encodings="gzip")
+
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert response.content.count(b"\n") == 1000
+
+
+def test_compressed_bodies_are_cached_by_content():
+    cache = TTLLRUCache(max_size=8, ttl=60)
+    client = make_client(cache=cache, compression_encodings="gzip")
+
+    first = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert first.content == second.content == BIG
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+def test_optional_encodings(encoding, module):
+    pytest.importorskip(module)
+    client = make_client()
+
+    response = client.get("/big", headers={"Accept-Encoding": f"gzip, {encoding}"})
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.content == BIG
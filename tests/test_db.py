@@ -0,0 +1,147 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import StaticPool, create_engine, event, text
+
+import app.db
+from app.db import (
+    TimedQueuePool,
+    check_schema_at_head,
+    dispose_engines,
+    get_alembic_heads,
+    get_engine,
+    get_pool_stats,
+    get_sync_engine,
+)
+
+
+# Tests for the engine factory in app/db.py
+# `monkeypatch` swaps the module-level `settings` fields for one test only
+def test_sqlite_file_engine_uses_pool_settings_and_pragmas(monkeypatch, tmp_path):
+    # Arrange
+    monkeypatch.setattr(app.db.settings, "sqlite_file_name", str(tmp_path / "test.db"))
+    monkeypatch.setattr(app.db.settings, "db_pool_size", 3)
+    monkeypatch.setattr(app.db.settings, "sqlite_busy_timeout", 1234)
+
+    # Act
+    engine = get_engine()
+    with engine.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+        synchronous = conn.execute(text("PRAGMA synchronous")).scalar()
+        busy_timeout = conn.execute(text("PRAGMA busy_timeout")).scalar()
+        stats_in_use = get_pool_stats(engine)
+    stats = get_pool_stats(engine)
+    engine.dispose()
+
+    # Assert
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == 3
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 1234
+    assert stats_in_use["checked_out"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["wait_time_max_ms"] >= 0
+
+
+def test_pool_wait_excludes_connect_time_and_counts_every_checkout(tmp_path):
+    # Arrange: opening a connection takes 50 ms; 8 threads share 2 connections
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}", poolclass=TimedQueuePool, pool_size=2, max_overflow=0
+    )
+
+    @event.listens_for(engine, "connect")
+    def slow_connect(dbapi_connection, connection_record):
+        time.sleep(0.05)
+
+    def checkout(_):
+        for _ in range(25):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+    # Act
+    with engine.connect():  # first checkout: a new connection, nothing to wait for
+        first = get_pool_stats(engine)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(checkout, range(8)))
+    stats = get_pool_stats(engine)
+    engine.dispose()
+
+    # Assert
+    assert first["checkouts"] == 1
+    assert first["wait_time_max_ms"] < 50
+    assert stats["checkouts"] == 1 + 8 * 25
+
+
+def test_sqlite_memory_engine_uses_static_pool(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(app.db.settings, "sqlite_file_name", ":memory:")
+
+    # Act
+    engine = get_engine()
+
+    # Assert
+    assert isinstance(engine.pool, StaticPool)
+    assert get_pool_stats(engine) == {"pool": "StaticPool"}
+
+
+@pytest.mark.anyio
+async def test_sync_engine_is_built_once_and_disposed_on_shutdown(monkeypatch, tmp_path):
+    # Arrange
+    monkeypatch.setattr(app.db.settings, "sqlite_file_name", str(tmp_path / "test.db"))
+    get_sync_engine.cache_clear()
+
+    # Act
+    engine = get_sync_engine()
+    with engine.connect():
+        pass
+    checked_in = engine.pool.checkedin()
+    await dispose_engines()
+
+    # Assert
+    assert get_sync_engine.cache_info().currsize == 0  # the next use builds a new one
+    assert checked_in == 1
+    assert engine.pool.checkedin() == 0
+
+
+def make_versioned_engine(tmp_path, *revisions):
+    engine = create_engine(f"sqlite:///{tmp_path / 'versioned.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        for revision in revisions:
+            conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": revision})
+    return engine
+
+
+def test_schema_check_passes_at_head(tmp_path):
+    engine = make_versioned_engine(tmp_path, *get_alembic_heads())
+
+    check_schema_at_head(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM alembic_version"))
+    check_schema_at_head(engine)  # cached: no second query (nor error)
+
+
+def test_alembic_heads_match_alembic_itself():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    script_directory = ScriptDirectory.from_config(Config(app.db.ALEMBIC_INI))
+
+    assert get_alembic_heads() == tuple(sorted(script_directory.get_heads()))
+
+
+def test_schema_check_fails_fast_behind_head(tmp_path):
+    engine = make_versioned_engine(tmp_path, "8d4f0a6e2b17")
+
+    with pytest.raises(RuntimeError, match="is at 8d4f0a6e2b17, migrations head is"):
+        check_schema_at_head(engine)
+
+
+def test_schema_check_fails_fast_without_migrations(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+
+    with pytest.raises(RuntimeError, match="No alembic_version table"):
+        check_schema_at_head(engine)
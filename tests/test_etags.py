@@ -0,0 +1,23 @@
+from app.etags import make_etag, match_versions, none_match
+
+
+def test_make_etag():
+    assert make_etag(3) == '"3"'
+    assert make_etag(3, ("name", "id")) == '"3-name,id"'
+
+
+def test_none_match_is_weak():
+    assert none_match('"3"', '"3"')
+    assert none_match('W/"3"', '"3"')
+    assert none_match('"1", "3"', '"3"')
+    assert none_match("*", '"3"')
+    assert not none_match('"2"', '"3"')
+    assert not none_match('"3"', '"3-name"')  # a different representation
+
+
+def test_match_versions_is_strong():
+    assert match_versions("*") is None
+    assert match_versions('"3"') == [3]
+    assert match_versions('"1", "3-name,id"') == [1, 3]
+    assert match_versions('W/"3"') == []
+    assert match_versions('"abc", 3') == []
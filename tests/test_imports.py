@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Import-time budget of `import app.main` (ms, as measured by `python -X importtime`),
+# with headroom for slower machines: measured ~1000 ms in total, of which 60-85 ms
+# in the app's own modules, on one core (see benchmarks/bench_imports.py)
+APP_MODULES_BUDGET_MS = 250
+TOTAL_BUDGET_MS = 3000
+
+# Only imported when their feature is on (DB_STACK=async, PROFILING_ENABLED, ...)
+LAZY_MODULES = {
+    "sqlalchemy.ext.asyncio",
+    "app.async_dependencies",
+    "app.routers.async_hero_router",
+    "app.profiling",
+    "cProfile",
+    "alembic",
+}
+
+
+def import_times(**env) -> dict[str, tuple[int, int]]:
+    """{module: (self us, cumulative us)} of `import app.main` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+@pytest.fixture(scope="module")
+def sync_stack_import_times():
+    return import_times(DB_STACK="sync", PROFILING_ENABLED="false")
+
+
+def test_sync_stack_does_not_import_lazy_modules(sync_stack_import_times):
+    assert LAZY_MODULES.isdisjoint(sync_stack_import_times)
+
+
+def test_import_time_within_budget(sync_stack_import_times):
+    app_modules_ms = sum(
+        self_us
+        for module, (self_us, _) in sync_stack_import_times.items()
+        if module == "app" or module.startswith("app.")
+    ) / 1000
+    total_ms = sync_stack_import_times["app.main"][1] / 1000
+
+    assert app_modules_ms < APP_MODULES_BUDGET_MS
+    assert total_ms < TOTAL_BUDGET_MS
+
+
+def test_async_stack_imports_its_router():
+    times = import_times(DB_STACK="async")
+
+    assert "app.routers.async_hero_router" in times
+    assert "app.routers.hero_router" not in times
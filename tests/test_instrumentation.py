@@ -0,0 +1,144 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import StaticPool, create_engine, text
+
+from app import metrics
+from app.instrumentation import (
+    RequestContextMiddleware,
+    compiled_cache_counts,
+    install_query_timing,
+)
+from app.metrics import Histogram
+from app.models.hero_models import Hero
+from app.responses import hero_response
+
+
+def make_engine(threshold_ms: float):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    install_query_timing(engine, threshold_ms)
+    return engine
+
+
+def make_app(engine) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/things/{thing_id}")
+    def read_thing(thing_id: int):
+        with engine.connect() as conn:
+            return {"value": conn.execute(text("SELECT :x"), {"x": thing_id}).scalar()}
+
+    return app
+
+
+def test_slow_query_logged_with_route_and_duration(caplog):
+    # Arrange
+    client = TestClient(make_app(make_engine(threshold_ms=0)))
+
+    # Act
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        response = client.get("/things/42")
+
+    # Assert
+    assert response.status_code == 200
+    records = [r for r in caplog.records if r.name == "app.slow_query"]
+    assert len(records) == 1
+    assert records[0].route == "GET /things/{thing_id}"
+    assert records[0].statement == "SELECT ?"
+    assert records[0].duration_ms >= 0
+    assert "42" not in records[0].getMessage()  # parameters are never logged
+
+
+def test_fast_query_not_logged(caplog):
+    # Arrange
+    client = TestClient(make_app(make_engine(threshold_ms=10_000)))
+
+    # Act
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        client.get("/things/1")
+
+    # Assert
+    assert not [r for r in caplog.records if r.name == "app.slow_query"]
+
+
+def test_compiled_cache_hits_and_misses_counted():
+    # Arrange
+    engine = make_engine(threshold_ms=-1)
+    before = compiled_cache_counts.copy()
+
+    # Act
+    with engine.connect() as conn:
+        for x in range(3):
+            conn.execute(text("SELECT :x"), {"x": x})
+
+    # Assert: compiled once (new engine), then taken from its cache
+    assert compiled_cache_counts["CACHE_MISS"] - before["CACHE_MISS"] == 1
+    assert compiled_cache_counts["CACHE_HIT"] - before["CACHE_HIT"] == 2
+
+
+def test_request_timings_in_server_timing_and_metrics():
+    # Arrange
+    metrics.request_db_statements.clear()
+    app = make_app(make_engine(threshold_ms=-1))
+
+    @app.get("/heroes/{hero_id}")
+    def read_hero(hero_id: int):
+        return hero_response(Hero(id=hero_id, name="Deadpond", secret_name="s"))
+
+    client = TestClient(app)
+
+    # Act
+    response = client.get("/things/42")
+    client.get("/things/43")
+    hero_response_ = client.get("/heroes/1")
+    client.get("/nowhere")
+    text = metrics.render_metrics()
+
+    # Assert
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+    assert "db;dur=" in response.headers["Server-Timing"]
+    assert 'desc="statements=1"' in response.headers["Server-Timing"]
+    assert 'desc="statements=0"' in hero_response_.headers["Server-Timing"]
+    assert "serialize;dur=" in hero_response_.headers["Server-Timing"]
+    # labelled by route template, never by raw path
+    assert (
+        'http_request_db_statements_count{method="GET",route="/things/{thing_id}"} 2'
+        in text
+    )
+    assert (
+        'http_request_db_statements_bucket{method="GET",route="/things/{thing_id}",le="1.0"} 2'
+        in text
+    )
+    assert 'route="unmatched"' in text
+    assert "/things/42" not in text
+
+
+def test_histogram_render():
+    # Arrange
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    # Act
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.1)  # le is inclusive
+    histogram.observe(("/a",), 5.0)
+    histogram.observe(('say "hi"',), 0.5)
+
+    # Assert
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.15',
+        'latency_seconds_count{route="/a"} 3',
+        'latency_seconds_bucket{route="say \\"hi\\"",le="0.1"} 0',
+        'latency_seconds_bucket{route="say \\"hi\\"",le="1.0"} 1',
+        'latency_seconds_bucket{route="say \\"hi\\"",le="+Inf"} 1',
+        'latency_seconds_sum{route="say \\"hi\\""} 0.5',
+        'latency_seconds_count{route="say \\"hi\\""} 1',
+    ]
@@ -0,0 +1,128 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from app.config import Settings
+from app.db import TimedAsyncQueuePool, TimedQueuePool
+from app.logging_config import (
+    BoundedQueueHandler,
+    JsonFormatter,
+    get_logging_stats,
+    setup_logging,
+    stop_logging,
+)
+
+
+@pytest.fixture(name="root_logger")
+def root_logger_fixture():
+    # setup_logging() replaces the root handlers -> put pytest's back afterwards
+    root_logger = logging.getLogger()
+    handlers, level = root_logger.handlers[:], root_logger.level
+    yield root_logger
+    stop_logging()
+    root_logger.handlers[:] = handlers
+    root_logger.setLevel(level)
+
+
+def test_queue_mode_writes_log_file_on_background_thread(root_logger, tmp_path):
+    # Arrange
+    settings = Settings(log_dir=str(tmp_path), log_queue=True, log_json=True)
+    setup_logging(settings=settings)
+
+    # Act
+    logging.getLogger("app.test").info("hello %s", "queue", extra={"route": "GET /x"})
+    stop_logging()  # flushes the queue
+
+    # Assert
+    assert [type(h) for h in root_logger.handlers] == [BoundedQueueHandler]
+    lines = (tmp_path / "app.log").read_text().splitlines()
+    record = json.loads(lines[-1])
+    assert record["message"] == "hello queue"
+    assert record["logger"] == "app.test"
+    assert record["route"] == "GET /x"
+
+
+def test_drop_policy_counts_dropped_records():
+    # Arrange
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), block=False)
+    logger = logging.Logger("drop-test")
+    logger.addHandler(handler)
+
+    # Act
+    for i in range(3):
+        logger.warning("record %d", i)
+
+    # Assert
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+
+
+def test_json_formatter_includes_exception():
+    # Arrange
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.getLogger("app.test").makeRecord(
+            "app.test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+
+    # Act
+    data = json.loads(JsonFormatter().format(record))
+
+    # Assert
+    assert data["level"] == "ERROR"
+    assert data["message"] == "failed"
+    assert "RuntimeError: boom" in data["exc_info"]
+
+
+def test_direct_mode_has_no_queue(root_logger, tmp_path):
+    # Act
+    setup_logging(settings=Settings(log_dir=str(tmp_path), log_queue=False))
+
+    # Assert
+    assert get_logging_stats() == {"queue": False}
+    assert len(root_logger.handlers) == 2
+
+
+def test_size_rotation_keeps_backup_count_files(root_logger, tmp_path):
+    # Arrange
+    settings = Settings(
+        log_dir=str(tmp_path),
+        log_queue=False,
+        log_rotation="size",
+        log_max_bytes=1000,
+        log_backup_count=2,
+    )
+    setup_logging(settings=settings)
+
+    # Act: ~10 KB of records -> many rollovers
+    for i in range(100):
+        logging.getLogger("app.test").info("record %03d %s", i, "x" * 50)
+    stop_logging()
+    for handler in root_logger.handlers:
+        handler.close()
+
+    # Assert
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert files == ["app.log", "app.log.1", "app.log.2"]
+    assert all(path.stat().st_size <= 1000 for path in tmp_path.iterdir())
+    assert "record 099" in (tmp_path / "app.log").read_text()
+
+
+def test_pool_loggers_stay_at_warning(root_logger, tmp_path):
+    # Arrange: the pools' loggers are named after their class, outside "sqlalchemy"
+    pools = [
+        TimedQueuePool(lambda: None),
+        TimedAsyncQueuePool(lambda: None),
+    ]
+
+    # Act
+    setup_logging(settings=Settings(log_dir=str(tmp_path), log_queue=False))
+
+    # Assert
+    for pool in pools:
+        assert not pool.logger.isEnabledFor(logging.INFO)
+        assert pool.logger.isEnabledFor(logging.WARNING)
@@ -0,0 +1,91 @@
+import asyncio
+import pstats
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.profiling import ProfilingMiddleware
+
+
+def busy_work(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_client() -> tuple[TestClient, ProfilingMiddleware]:
+    app = FastAPI()
+
+    @app.get("/slow", status_code=201)
+    def slow_route():  # sync: runs on the threadpool
+        busy_work(0.1)
+        return {"ok": True}
+
+    middleware = ProfilingMiddleware(app, token="s3cret", interval_ms=1)
+    return TestClient(middleware), middleware
+
+
+def test_requests_without_x_profile_are_untouched():
+    client, _ = make_client()
+
+    response = client.get("/slow")
+
+    assert response.status_code == 201
+    assert response.json() == {"ok": True}
+
+
+def test_needs_the_token_and_a_known_format():
+    client, _ = make_client()
+
+    anonymous = client.get("/slow", headers={"X-Profile": "pstats"})
+    wrong_token = client.get(
+        "/slow", headers={"X-Profile": "pstats", "X-Profile-Token": "guess"}
+    )
+    bad_format = client.get("/slow", headers={"X-Profile": "svg", "X-Profile-Token": "s3cret"})
+
+    assert anonymous.status_code == 403
+    assert wrong_token.status_code == 403
+    assert bad_format.status_code == 400
+
+
+def test_pstats_profile(tmp_path):
+    client, _ = make_client()
+
+    response = client.get(
+        "/slow", headers={"X-Profile": "pstats", "X-Profile-Token": "s3cret"}
+    )
+    (tmp_path / "profile.pstats").write_bytes(response.content)
+    stats = pstats.Stats(str(tmp_path / "profile.pstats"))
+
+    assert response.status_code == 200
+    assert response.headers["X-Profiled-Status"] == "201"
+    assert float(response.headers["X-Profiled-Duration-Ms"]) >= 100
+    # the handler ran on a threadpool thread and is still in the profile
+    assert any(function == "busy_work" for _, _, function in stats.stats)
+
+
+def test_collapsed_stacks():
+    client, _ = make_client()
+
+    response = client.get(
+        "/slow", headers={"X-Profile": "collapsed", "X-Profile-Token": "s3cret"}
+    )
+    lines = response.text.splitlines()
+
+    assert response.status_code == 200
+    assert response.headers["X-Profiled-Status"] == "201"
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)  # "a;b;c N"
+    busy = [line for line in lines if "slow_route" in line and "busy_work" in line]
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in busy) >= 5
+
+
+def test_one_profile_at_a_time():
+    client, middleware = make_client()
+    asyncio.run(middleware._lock.acquire())  # a profile is running
+
+    response = client.get(
+        "/slow", headers={"X-Profile": "collapsed", "X-Profile-Token": "s3cret"}
+    )
+
+    assert response.status_code == 409
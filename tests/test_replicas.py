@@ -0,0 +1,136 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel
+
+import app.dependencies
+from app.cache import TTLLRUCache
+from app.dependencies import get_hero_cache, get_hero_count_cache
+from app.models.hero_models import Hero
+from app.replicas import (
+    PRIMARY_COOKIE,
+    ReadYourWritesMiddleware,
+    ReplicaSelector,
+    pinned_to_primary,
+)
+from app.routers import hero_router
+
+
+def make_engine(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def test_round_robin_takes_each_replica_in_turn():
+    selector = ReplicaSelector(["a", "b", "c"], "round_robin")
+
+    picks = [selector.pick() for _ in range(7)]
+
+    assert picks == ["a", "b", "c", "a", "b", "c", "a"]
+
+
+def test_least_connections_avoids_the_busy_replica(tmp_path):
+    busy, idle = make_engine(tmp_path / "busy.db"), make_engine(tmp_path / "idle.db")
+    selector = ReplicaSelector([busy, idle], "least_connections")
+
+    with busy.connect():
+        pick = selector.pick()
+
+    assert pick is idle
+
+
+def test_selector_rejects_unknown_selection_and_no_replicas():
+    with pytest.raises(ValueError, match="DB_REPLICA_SELECTION"):
+        ReplicaSelector(["a"], "random")
+    with pytest.raises(ValueError, match="at least one"):
+        ReplicaSelector([], "round_robin")
+
+
+def test_pinned_to_primary_until_the_cookie_expires():
+    assert pinned_to_primary({PRIMARY_COOKIE: str(time.time() + 5)})
+    assert not pinned_to_primary({PRIMARY_COOKIE: str(time.time() - 5)})
+    assert not pinned_to_primary({PRIMARY_COOKIE: "soon"})
+    assert not pinned_to_primary({})
+
+
+def make_client(tmp_path, monkeypatch, cache=None, count_cache=None) -> TestClient:
+    # two separate databases: the replica never receives the primary's writes,
+    # i.e. replication lag at its worst
+    primary = make_engine(tmp_path / "primary.db")
+    replica = make_engine(tmp_path / "replica.db")
+    monkeypatch.setattr(app.dependencies, "get_sync_engine", lambda: primary)
+    monkeypatch.setattr(
+        app.dependencies, "get_replica_selector", lambda: ReplicaSelector([replica])
+    )
+
+    api = FastAPI()
+    api.include_router(hero_router.router)
+    api.dependency_overrides[get_hero_cache] = lambda: cache
+    api.dependency_overrides[get_hero_count_cache] = lambda: count_cache
+    return TestClient(ReadYourWritesMiddleware(api, window=30))
+
+
+@pytest.fixture(name="replicated_client")
+def replicated_client_fixture(tmp_path, monkeypatch):
+    return make_client(tmp_path, monkeypatch)  # no cache: every read hits a db
+
+
+def test_reads_go_to_the_replica_and_writes_to_the_primary(replicated_client):
+    hero = replicated_client.post("/heroes/", json={"name": "Deadpond", "secret_name": "Dive"})
+    replicated_client.cookies.clear()  # another client: not pinned
+
+    response = replicated_client.get(f"/heroes/{hero.json()['id']}")
+
+    assert hero.status_code == 200
+    assert response.status_code == 404  # not on the replica (yet)
+
+
+def test_a_writer_reads_its_own_writes_from_the_primary(replicated_client):
+    hero = replicated_client.post("/heroes/", json={"name": "Deadpond", "secret_name": "Dive"})
+
+    response = replicated_client.get(f"/heroes/{hero.json()['id']}")
+
+    assert "Max-Age=30" in hero.headers["set-cookie"]
+    assert response.status_code == 200
+    assert response.json()["name"] == "Deadpond"
+
+
+def test_failed_writes_and_reads_set_no_cookie(replicated_client):
+    failed = replicated_client.patch("/heroes/999", json={"name": "Nobody"})
+    read = replicated_client.get("/heroes/")
+
+    assert failed.status_code == 404
+    assert "set-cookie" not in failed.headers
+    assert "set-cookie" not in read.headers
+
+
+def test_replica_reads_never_fill_the_cache(tmp_path, monkeypatch):
+    # Arrange: the same hero on both databases, then renamed on the primary only
+    count_cache = TTLLRUCache(max_size=1, ttl=60)
+    client = make_client(
+        tmp_path, monkeypatch, cache=TTLLRUCache(max_size=10, ttl=60), count_cache=count_cache
+    )
+    for path in ("primary.db", "replica.db"):
+        with Session(create_engine(f"sqlite:///{tmp_path / path}")) as session:
+            session.add(Hero(name="Deadpond", secret_name="Dive Wilson"))
+            session.commit()
+    renamed = client.patch("/heroes/bulk", json=[{"id": 1, "name": "Deadpool"}])
+    writer_cookies = dict(client.cookies)
+
+    # Act: another client reads the stale replica row, then the writer reads
+    client.cookies.clear()
+    other = client.get("/heroes/1")
+    count = client.get("/heroes/", params={"count": "cached"})
+    client.cookies.update(writer_cookies)
+    writer = client.get("/heroes/1")
+
+    # Assert
+    assert renamed.json()["ids"] == [1]
+    assert other.json()["name"] == "Deadpond"  # lagging replica
+    assert count.headers["X-Total-Count"] == "1"
+    assert count_cache.get(("hero_count",)) is None
+    assert writer.json()["name"] == "Deadpool"  # not the replica's row from the cache
@@ -0,0 +1,72 @@
+import pytest
+
+from app.models.hero_models import Hero, HeroOrderBy
+from app.repositories.async_hero_repository import AsyncHeroRepository
+
+# Integration style tests for AsyncHeroRepository using the `async_session` fixture
+# from `tests/conftest.py` (aiosqlite on a temporary file db)
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_and_read_one(async_session):
+    # Arrange
+    repo = AsyncHeroRepository(async_session)
+
+    # Act
+    hero_created = await repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    result = await repo.read_one(hero_created.id)
+
+    # Assert
+    assert hero_created.id is not None
+    assert result is not None
+    assert result.name == "Deadpond"
+
+
+async def test_create_many(async_session):
+    # Arrange
+    repo = AsyncHeroRepository(async_session, bulk_chunk_size=2)
+    heroes = [Hero(name=f"Deadpond{i}", secret_name=f"Dive Wilson {i}") for i in range(5)]
+
+    # Act
+    result = await repo.create_many(heroes)
+
+    # Assert
+    assert [h.name for h in result] == [f"Deadpond{i}" for i in range(5)]
+    assert len({h.id for h in result}) == 5
+    assert (await repo.read_one(result[-1].id)).secret_name == "Dive Wilson 4"
+
+
+async def test_read_many_keyset(async_session):
+    # Arrange
+    repo = AsyncHeroRepository(async_session)
+    for i, age in enumerate([30, None, 25]):
+        await repo.create(Hero(name=f"Hero{i}", secret_name=f"S{i}", age=age))
+
+    # Act
+    first_page = await repo.read_many(0, 2, order_by=HeroOrderBy.age)
+    last = first_page[-1]
+    second_page = await repo.read_many(
+        limit=2, order_by=HeroOrderBy.age, after=(last.age, last.id)
+    )
+
+    # Assert
+    assert [h.age for h in first_page] == [25, 30]
+    assert [h.age for h in second_page] == [None]
+
+
+async def test_update_and_delete(async_session):
+    # Arrange
+    repo = AsyncHeroRepository(async_session)
+    hero_created = await repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+
+    # Act
+    updated = await repo.update_by_id(hero_created.id, {"secret_name": "Updated Dive Wilson"})
+    stale = await repo.delete_by_id(hero_created.id, versions=[1])
+    deleted = await repo.delete_by_id(hero_created.id, versions=[2])
+
+    # Assert
+    assert updated.secret_name == "Updated Dive Wilson"
+    assert updated.version == 2
+    assert not stale
+    assert deleted
+    assert await repo.read_one(hero_created.id) is None
@@ -1,5 +1,13 @@
-from app.models.hero_models import Hero
-from app.repositories.hero_repository import HeroRepository
+from sqlmodel import text
+
+from app.models.hero_models import Hero, HeroFilter, HeroOrderBy, SortDirection
+from app.repositories.hero_repository import (
+    HeroRepository,
+    select_after,
+    select_one,
+    select_page,
+    unsupported_by_index,
+)
 
 
 # Integration style tests for HeroRepository using the `session` fixture from `tests/conftest.py`
@@ -121,3 +129,358 @@ def test_delete(session):
 
     # Assert
     assert session.get(Hero, hero_created.id) is None  # no row after deletion
+
+
+def test_read_many_keyset_matches_offset_pages(session):
+    """Test keyset pages (after=(value, id)) walk the same rows as offset pages."""
+    # Arrange
+    repo = HeroRepository(session)
+    ages = [30, None, 25, 30, None, 41, 25]
+    for i, age in enumerate(ages):
+        repo.create(Hero(name=f"Hero{i % 3}", secret_name=f"S{i}", age=age))
+
+    for order_by in HeroOrderBy:
+        expected = [h.id for h in repo.read_many(0, 100, order_by=order_by)]
+
+        # Act
+        seen = []
+        after = None
+        while True:
+            page = repo.read_many(limit=2, order_by=order_by, after=after)
+            seen.extend(h.id for h in page)
+            if len(page) < 2:
+                break
+            after = (getattr(page[-1], order_by.value), page[-1].id)
+
+        # Assert
+        assert seen == expected
+        assert len(seen) == len(ages)
+
+
+def test_read_many_orders_nulls_last(session):
+    """Test ordering by a nullable column puts NULLs after every value."""
+    # Arrange
+    repo = HeroRepository(session)
+    repo.create(Hero(name="A", secret_name="s1", age=None))
+    repo.create(Hero(name="B", secret_name="s2", age=50))
+    repo.create(Hero(name="C", secret_name="s3", age=20))
+
+    # Act
+    result = repo.read_many(0, 100, order_by=HeroOrderBy.age)
+
+    # Assert
+    assert [h.age for h in result] == [20, 50, None]
+
+
+def test_read_many_keyset_descending_matches_offset_pages(session):
+    """Test keyset pages walk the same rows as offset pages in DESC order (NULLs last)."""
+    # Arrange
+    repo = HeroRepository(session)
+    ages = [30, None, 25, 30, None, 41, 25]
+    for i, age in enumerate(ages):
+        repo.create(Hero(name=f"Hero{i % 3}", secret_name=f"S{i}", age=age))
+
+    for order_by in HeroOrderBy:
+        criteria = {"order_by": order_by, "direction": SortDirection.desc}
+        expected = [h.id for h in repo.read_many(0, 100, **criteria)]
+
+        # Act
+        seen = []
+        after = None
+        while True:
+            page = repo.read_many(limit=2, after=after, **criteria)
+            seen.extend(h.id for h in page)
+            if len(page) < 2:
+                break
+            after = (getattr(page[-1], order_by.value), page[-1].id)
+
+        # Assert
+        assert seen == expected
+        assert len(seen) == len(ages)
+
+    result = repo.read_many(order_by=HeroOrderBy.age, direction=SortDirection.desc)
+    assert [h.age for h in result] == [41, 30, 30, 25, 25, None, None]
+
+
+def test_read_many_filters(session):
+    """Test each filter (and a combination) narrows the page."""
+    # Arrange
+    repo = HeroRepository(session)
+    repo.create(Hero(name="Spider-Boy", secret_name="s1", age=16, gender="Male"))
+    repo.create(Hero(name="Spider-Girl", secret_name="s2", age=17, gender="Female"))
+    repo.create(Hero(name="Spiderz", secret_name="s3", age=40, gender="Male"))
+    repo.create(Hero(name="Deadpond", secret_name="s4", age=None, gender="Male"))
+
+    def names(order_by=HeroOrderBy.id, **filters):
+        heroes = repo.read_many(order_by=order_by, filters=HeroFilter(**filters))
+        return [h.name for h in heroes]
+
+    # Act / Assert
+    assert names(name="Spiderz") == ["Spiderz"]
+    assert names(HeroOrderBy.name, name_prefix="Spider-") == ["Spider-Boy", "Spider-Girl"]
+    assert names(HeroOrderBy.age, age_min=17) == ["Spider-Girl", "Spiderz"]
+    assert names(HeroOrderBy.age, age_min=16, age_max=17) == ["Spider-Boy", "Spider-Girl"]
+    assert names(gender="Male") == ["Spider-Boy", "Spiderz", "Deadpond"]
+    assert names(HeroOrderBy.age, age_max=40, gender="Male") == ["Spider-Boy", "Spiderz"]
+
+
+def test_statements_built_once_per_shape():
+    """Test the same query shape reuses one statement, its values going in as parameters."""
+    # Act
+    page, params = select_page(HeroOrderBy.name, 0, 10, filters=HeroFilter(name_prefix="Sp"))
+    same_shape, other_params = select_page(
+        HeroOrderBy.name, 20, 5, filters=HeroFilter(name_prefix="De")
+    )
+    other_shape, _ = select_page(HeroOrderBy.name, 0, 10, filters=HeroFilter(gender="Male"))
+
+    # Assert
+    assert same_shape is page
+    assert other_shape is not page
+    assert params == {"name_prefix": "Sp", "name_prefix_upper": "Sq", "offset": 0, "limit": 10}
+    assert other_params["offset"] == 20 and other_params["name_prefix"] == "De"
+    assert select_one(1, ("id", "name"))[0] is select_one(2, ("id", "name"))[0]
+
+
+def explain(session, query) -> str:
+    statement, params = query
+    sql = statement.params(params).compile(
+        session.get_bind(), compile_kwargs={"literal_binds": True}
+    )
+    rows = session.exec(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_filtered_reads_use_an_index(session):
+    """Test (EXPLAIN QUERY PLAN) every supported filter/ sort runs on an index, no sort step."""
+    # Arrange
+    cases = [
+        (HeroOrderBy.name, HeroFilter(name_prefix="Spi"), "ix_hero_name (name>? AND name<?)"),
+        (HeroOrderBy.age, HeroFilter(age_min=16, age_max=40), "ix_hero_age (age>? AND age<?)"),
+        (HeroOrderBy.id, HeroFilter(name="Spiderz"), "ix_hero_name (name=?"),
+        (HeroOrderBy.id, HeroFilter(gender="Male"), "ix_hero_gender (gender=?"),
+    ]
+
+    for order_by, filters, index_use in cases:
+        for direction in SortDirection:
+            # Act
+            page_plan = explain(session, select_page(order_by, 0, 10, direction, filters))
+            value = 30 if order_by == HeroOrderBy.age else "x"
+            seek_plan = explain(
+                session, select_after(order_by, value, 1, 10, direction, filters)
+            )
+
+            # Assert
+            assert unsupported_by_index(filters, order_by) is None
+            for plan in (page_plan, seek_plan):
+                assert f"USING INDEX {index_use}" in plan
+                assert "TEMP B-TREE" not in plan
+
+
+def test_unsupported_by_index(session):
+    """Test a range filter on a column other than the ORDER BY one is reported."""
+    # Act / Assert
+    assert unsupported_by_index(None, HeroOrderBy.id) is None
+    assert unsupported_by_index(HeroFilter(gender="Male"), HeroOrderBy.age) is None
+    assert unsupported_by_index(HeroFilter(age_min=3), HeroOrderBy.age) is None
+    assert "order_by=age" in unsupported_by_index(HeroFilter(age_min=3), HeroOrderBy.id)
+    assert "order_by=name" in unsupported_by_index(
+        HeroFilter(name_prefix="Sp", age_max=3), HeroOrderBy.age
+    )
+
+    # the scan the guard prevents
+    plan = explain(session, select_page(HeroOrderBy.id, 0, 10, filters=HeroFilter(age_min=3)))
+    assert "SCAN hero" in plan
+
+
+def test_create_many(session):
+    """Test create_many inserts in chunks and returns heroes with ids in order."""
+    # Arrange
+    repo = HeroRepository(session, bulk_chunk_size=2)
+    heroes = [Hero(name=f"Deadpond{i}", secret_name=f"Dive Wilson {i}") for i in range(5)]
+
+    # Act
+    result = repo.create_many(heroes)
+
+    # Assert
+    assert [h.name for h in result] == [f"Deadpond{i}" for i in range(5)]
+    assert all(h.id is not None for h in result)
+    assert len({h.id for h in result}) == 5
+    assert session.get(Hero, result[-1].id).secret_name == "Dive Wilson 4"
+
+
+def test_update_many(session):
+    """Test update_many applies per-hero fields and reports existing ids only."""
+    # Arrange
+    repo = HeroRepository(session)
+    hero_1 = repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    hero_2 = repo.create(Hero(name="Rusty-Man", secret_name="Tommy Sharp"))
+
+    # Act
+    result = repo.update_many(
+        [
+            {"id": hero_1.id, "age": 30},
+            {"id": hero_2.id, "name": "Rusty-Woman", "gender": "Female"},
+            {"id": 999, "age": 1},
+        ]
+    )
+
+    # Assert
+    assert result == [hero_1.id, hero_2.id]
+    assert session.get(Hero, hero_1.id).age == 30
+    assert session.get(Hero, hero_1.id).name == "Deadpond"  # untouched
+    assert session.get(Hero, hero_2.id).name == "Rusty-Woman"
+    assert session.get(Hero, hero_2.id).gender == "Female"
+
+
+def test_delete_many(session):
+    """Test delete_many removes the given rows and reports the deleted ids."""
+    # Arrange
+    repo = HeroRepository(session, bulk_chunk_size=1)
+    hero_1 = repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    hero_2 = repo.create(Hero(name="Rusty-Man", secret_name="Tommy Sharp"))
+    hero_3 = repo.create(Hero(name="Spider-Boy", secret_name="Pedro Parqueador"))
+
+    # Act
+    result = repo.delete_many([hero_1.id, hero_3.id, 999])
+
+    # Assert
+    assert result == [hero_1.id, hero_3.id]
+    assert session.get(Hero, hero_1.id) is None
+    assert session.get(Hero, hero_2.id) is not None
+    assert session.get(Hero, hero_3.id) is None
+
+
+def test_update_by_id(session):
+    """Test update_by_id updates in one statement and returns the new row."""
+    # Arrange
+    repo = HeroRepository(session)
+    hero_created = repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+
+    # Act
+    result = repo.update_by_id(hero_created.id, {"age": 30, "name": "Deadpuddle"})
+    missing = repo.update_by_id(999, {"age": 30})
+
+    # Assert
+    assert result.id == hero_created.id
+    assert result.name == "Deadpuddle"
+    assert result.age == 30
+    assert result.secret_name == "Dive Wilson"
+    assert session.get(Hero, hero_created.id).name == "Deadpuddle"  # stored
+    assert missing is None
+
+
+def test_delete_by_id(session):
+    """Test delete_by_id reports whether a row was deleted."""
+    # Arrange
+    repo = HeroRepository(session)
+    hero_created = repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    hero_id = hero_created.id
+
+    # Act
+    deleted = repo.delete_by_id(hero_id)
+    deleted_again = repo.delete_by_id(hero_id)
+
+    # Assert
+    assert deleted is True
+    assert deleted_again is False
+    assert session.get(Hero, hero_id) is None
+
+
+def test_stream_public(session):
+    """Test stream_public yields plain public-column rows ordered by id."""
+    # Arrange
+    repo = HeroRepository(session)
+    repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    repo.create(Hero(name="Rusty-Man", secret_name="Tommy Sharp", age=48))
+
+    # Act
+    rows = list(repo.stream_public(batch_size=1))
+
+    # Assert
+    assert [tuple(row) for row in rows] == [
+        ("Deadpond", None, None, 1),
+        ("Rusty-Man", 48, None, 2),
+    ]
+
+
+def test_search_ranked_and_kept_in_sync(session):
+    """Test search matches word prefixes, ranks best first and follows writes."""
+    # Arrange
+    repo = HeroRepository(session)
+    for name in ["Spider-Boy", "Spider Spider", "Rusty-Man", "Boy Wonder"]:
+        repo.create(Hero(name=name, secret_name="s"))
+
+    # Act / Assert
+    assert [h.name for h in repo.search(["spider"])] == ["Spider Spider", "Spider-Boy"]
+    assert [h.name for h in repo.search(["spi", "bo"])] == ["Spider-Boy"]
+    assert [h.name for h in repo.search(["spider"], offset=1, limit=1)] == ["Spider-Boy"]
+
+    # the index follows updates and deletes (db triggers)
+    repo.update_by_id(3, {"name": "Iron-Man"})
+    repo.delete_by_id(4)
+    assert [h.name for h in repo.search(["iron"])] == ["Iron-Man"]
+    assert repo.search(["rusty"]) == []
+    assert [h.name for h in repo.search(["boy"])] == ["Spider-Boy"]
+
+
+def test_count_and_estimate_count(session):
+    """Test exact counts honour filters; estimates come from max(id), then ANALYZE stats."""
+    # Arrange
+    repo = HeroRepository(session)
+    for i in range(5):
+        repo.create(Hero(name=f"Hero{i}", secret_name="s", age=20 + i))
+    repo.delete_by_id(5)
+
+    # Act / Assert
+    assert repo.count() == 4
+    assert repo.count(HeroFilter(age_min=22)) == 2
+    assert repo.estimate_count() == 4  # max(id): no statistics yet
+
+    repo.delete_by_id(2)
+    assert repo.estimate_count() == 4  # an upper bound once ids have gaps
+    session.exec(text("ANALYZE"))
+    assert repo.estimate_count() == 3  # sqlite_stat1
+
+
+def test_read_many_and_read_one_with_columns_skip_the_orm(session):
+    """Test a column projection returns plain rows and loads nothing into the session."""
+    # Arrange
+    repo = HeroRepository(session)
+    for i in range(3):
+        repo.create(Hero(name=f"Hero{i}", secret_name="s", age=30 - i))
+    session.expunge_all()
+
+    # Act
+    criteria = {"limit": 2, "order_by": HeroOrderBy.age, "columns": ("age", "id")}
+    page = repo.read_many(**criteria)
+    next_page = repo.read_many(after=(page[-1].age, page[-1].id), **criteria)
+    row = repo.read_one(2, columns=("name", "id"))
+
+    # Assert
+    assert [tuple(r) for r in page] == [(28, 3), (29, 2)]
+    assert [tuple(r) for r in next_page] == [(30, 1)]
+    assert row._mapping == {"name": "Hero1", "id": 2}
+    assert repo.read_one(99, columns=("id",)) is None
+    assert len(session.identity_map) == 0  # no Hero objects were built
+
+
+def test_writes_bump_version_and_honour_versions(session):
+    """Test every update bumps `version`; `versions` makes update/ delete conditional."""
+    # Arrange
+    repo = HeroRepository(session)
+    hero = repo.create(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    assert hero.version == 1
+
+    # Act
+    updated = repo.update_by_id(hero.id, {"age": 30}, versions=[1])
+    stale = repo.update_by_id(hero.id, {"age": 31}, versions=[1])
+    repo.update_many([{"id": hero.id, "age": 32}])
+    not_deleted = repo.delete_by_id(hero.id, versions=[1, 2])
+
+    # Assert
+    assert updated.version == 2
+    assert stale is None
+    assert repo.read_version(hero.id) == 3
+    assert repo.read_version(999) is None
+    assert not_deleted is False
+    assert repo.delete_by_id(hero.id, versions=[3]) is True
@@ -0,0 +1,40 @@
+from pydantic import TypeAdapter
+
+from app.models.hero_models import Hero, HeroPublic
+from app.responses import hero_json, heroes_json
+
+
+def default_json(value, annotation) -> bytes:
+    # what FastAPI does with `response_model=...`: validate, then dump_json
+    adapter = TypeAdapter(annotation)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def test_heroes_json_matches_response_model_output(session):
+    # Arrange
+    session.add(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    session.add(Hero(name="Señor \"Ünicode\" ⚡", secret_name="s", age=48, gender="Male"))
+    session.commit()
+    heroes = session.get(Hero, 1), session.get(Hero, 2)
+
+    # Act
+    fast_list = heroes_json(heroes)
+    fast_one = hero_json(heroes[1])
+
+    # Assert
+    assert fast_list == default_json(list(heroes), list[HeroPublic])
+    assert fast_one == default_json(heroes[1], HeroPublic)
+    assert b"secret_name" not in fast_list
+
+
+def test_hero_json_loads_expired_attributes(session):
+    # Arrange
+    hero = Hero(name="Rusty-Man", secret_name="Tommy Sharp", age=48)
+    session.add(hero)
+    session.commit()  # expires every attribute of `hero`
+
+    # Act
+    result = hero_json(hero)
+
+    # Assert
+    assert result == b'{"name":"Rusty-Man","age":48,"gender":null,"id":1}'
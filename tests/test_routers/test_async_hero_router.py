@@ -0,0 +1,176 @@
+from fastapi.testclient import TestClient
+
+from app.pagination import encode_cursor
+
+
+# `async_client` fixture comes from tests/conftest.py (async router on aiosqlite)
+def test_crud_round_trip(async_client: TestClient):
+    response = async_client.post(
+        "/heroes", json={"name": "Deadpond", "secret_name": "Dive Wilson"}
+    )
+    data = response.json()
+    assert response.status_code == 200
+    assert "secret_name" not in data
+    hero_id = data["id"]
+
+    response = async_client.patch(f"/heroes/{hero_id}", json={"age": 30})
+    assert response.status_code == 200
+    assert response.json()["age"] == 30
+
+    response = async_client.get(f"/heroes/{hero_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Deadpond"
+
+    response = async_client.delete(f"/heroes/{hero_id}")
+    assert response.status_code == 200
+
+    response = async_client.get(f"/heroes/{hero_id}")
+    assert response.status_code == 404
+
+
+def test_create_heroes_bulk(async_client: TestClient):
+    response = async_client.post(
+        "/heroes/bulk",
+        json=[
+            {"name": "Deadpond", "secret_name": "Dive Wilson"},
+            {"name": "Rusty-Man", "secret_name": "Tommy Sharp", "age": 48},
+        ],
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert [hero["name"] for hero in data] == ["Deadpond", "Rusty-Man"]
+    assert async_client.get(f"/heroes/{data[1]['id']}").json()["age"] == 48
+
+
+def test_update_and_delete_heroes_bulk(async_client: TestClient):
+    heroes = async_client.post(
+        "/heroes/bulk",
+        json=[{"name": "Deadpond", "secret_name": "s"}, {"name": "Rusty-Man", "secret_name": "s"}],
+    ).json()
+    hero_1, hero_2 = heroes[0]["id"], heroes[1]["id"]
+    async_client.get(f"/heroes/{hero_1}")  # cached
+    assert async_client.get("/heroes", params={"count": "cached"}).headers["X-Total-Count"] == "2"
+
+    updated = async_client.patch(
+        "/heroes/bulk", json=[{"id": hero_1, "age": 30}, {"id": 999, "age": 1}]
+    )
+    read_after_update = async_client.get(f"/heroes/{hero_1}")
+    deleted = async_client.request("DELETE", "/heroes/bulk", json=[hero_1, 999])
+    count = async_client.get("/heroes", params={"count": "cached"})
+
+    assert updated.json() == {"ids": [hero_1], "not_found": [999]}
+    assert read_after_update.json()["age"] == 30  # cache entry invalidated
+    assert deleted.json() == {"ids": [hero_1], "not_found": [999]}
+    assert async_client.get(f"/heroes/{hero_1}").status_code == 404
+    assert async_client.get(f"/heroes/{hero_2}").status_code == 200
+    assert count.headers["X-Total-Count"] == "1"
+
+
+def test_export_heroes_ndjson_and_csv(async_client: TestClient):
+    empty = async_client.get("/heroes/export", params={"format": "csv"})
+    async_client.post("/heroes/", json={"name": "Deadpond", "secret_name": "Dive Wilson"})
+    async_client.post("/heroes/", json={"name": "Rusty-Man", "secret_name": "s", "age": 48})
+
+    ndjson = async_client.get("/heroes/export")
+    csv = async_client.get("/heroes/export", params={"format": "csv"})
+
+    assert empty.text.splitlines() == ["name,age,gender,id"]
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert len(ndjson.text.splitlines()) == 2
+    assert "secret_name" not in ndjson.text
+    assert csv.text.splitlines() == ["name,age,gender,id", "Deadpond,,,1", "Rusty-Man,48,,2"]
+
+
+def test_search_heroes(async_client: TestClient):
+    for name in ["Spider-Boy", "Rusty-Man", "Spider-Girl"]:
+        async_client.post("/heroes/", json={"name": name, "secret_name": "s"})
+
+    response = async_client.get("/heroes/search", params={"q": "spider"})
+    paged = async_client.get("/heroes/search", params={"q": "spider", "offset": 1, "limit": 1})
+    no_words = async_client.get("/heroes/search", params={"q": "**"})
+
+    assert response.status_code == 200
+    assert [hero["name"] for hero in response.json()] == ["Spider-Boy", "Spider-Girl"]
+    assert [hero["name"] for hero in paged.json()] == ["Spider-Girl"]
+    assert no_words.status_code == 400
+
+
+def test_read_heroes_cursor_pagination(async_client: TestClient):
+    for i in range(3):
+        async_client.post("/heroes", json={"name": f"Hero{i}", "secret_name": "S"})
+
+    response = async_client.get("/heroes", params={"limit": 2})
+    next_cursor = response.headers["X-Next-Cursor"]
+    response_2 = async_client.get("/heroes", params={"limit": 2, "cursor": next_cursor})
+
+    assert [h["name"] for h in response.json()] == ["Hero0", "Hero1"]
+    assert [h["name"] for h in response_2.json()] == ["Hero2"]
+    assert "X-Next-Cursor" not in response_2.headers
+
+
+def test_read_heroes_tampered_cursor_value(async_client: TestClient):
+    async_client.post("/heroes", json={"name": "Deadpond", "secret_name": "S", "age": 30})
+
+    for order_by, value in [("name", {"a": 1}), ("age", "30")]:
+        cursor = encode_cursor(order_by, value, 1)
+        response = async_client.get("/heroes", params={"order_by": order_by, "cursor": cursor})
+
+        assert response.status_code == 400
+
+
+def test_read_heroes_filters(async_client: TestClient):
+    for name, age in [("Spider-Boy", 16), ("Spider-Girl", 17), ("Rusty-Man", 48)]:
+        async_client.post("/heroes", json={"name": name, "secret_name": "s", "age": age})
+
+    response = async_client.get(
+        "/heroes", params={"age_max": 17, "order_by": "age", "direction": "desc"}
+    )
+    bad_response = async_client.get("/heroes", params={"name_prefix": "S"})
+
+    assert [hero["name"] for hero in response.json()] == ["Spider-Girl", "Spider-Boy"]
+    assert bad_response.status_code == 400
+
+
+def test_read_heroes_total_count(async_client: TestClient):
+    for i in range(3):
+        async_client.post("/heroes", json={"name": f"Hero{i}", "secret_name": "s"})
+
+    exact = async_client.get("/heroes", params={"limit": 1, "count": "exact"})
+    estimated = async_client.get("/heroes", params={"count": "estimated"})
+
+    assert exact.headers["X-Total-Count"] == "3"
+    assert estimated.headers["X-Total-Count"] == "3"
+
+
+def test_read_heroes_and_hero_with_fields(async_client: TestClient):
+    response = async_client.post("/heroes", json={"name": "Deadpond", "secret_name": "s"})
+    hero_id = response.json()["id"]
+
+    many = async_client.get("/heroes", params={"fields": "name"})
+    one = async_client.get(f"/heroes/{hero_id}", params={"fields": "id"})
+
+    assert many.json() == [{"name": "Deadpond"}]
+    assert one.json() == {"id": hero_id}
+
+
+def test_conditional_requests(async_client: TestClient):
+    created = async_client.post("/heroes/", json={"name": "Deadpond", "secret_name": "s"})
+    hero_id, etag = created.json()["id"], created.headers["ETag"]
+
+    not_modified = async_client.get(f"/heroes/{hero_id}", headers={"If-None-Match": etag})
+    updated = async_client.patch(
+        f"/heroes/{hero_id}", json={"age": 30}, headers={"If-Match": etag}
+    )
+    lost_update = async_client.patch(
+        f"/heroes/{hero_id}", json={"age": 31}, headers={"If-Match": etag}
+    )
+    stale_delete = async_client.delete(f"/heroes/{hero_id}", headers={"If-Match": etag})
+
+    assert etag == '"1"'
+    assert not_modified.status_code == 304
+    assert updated.headers["ETag"] == '"2"'
+    assert lost_update.status_code == 412
+    assert stale_delete.status_code == 412
+    assert async_client.get(f"/heroes/{hero_id}").json()["age"] == 30
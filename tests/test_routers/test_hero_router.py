@@ -1,7 +1,14 @@
+import asyncio
+import tracemalloc
+
+import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, SQLModel, create_engine, insert
 
+from app.dependencies import get_read_session
+from app.main import app
 from app.models.hero_models import Hero
+from app.pagination import encode_cursor
 
 
 # `client` and `session` fixtures (dependencies) comes from tests/conftest.py
@@ -47,6 +54,94 @@ def test_create_hero_invalid(client: TestClient):
     assert response.status_code == 422
 
 
+def test_create_heroes_bulk(session: Session, client: TestClient):
+    response = client.post(
+        "/heroes/bulk",
+        json=[
+            {"name": "Deadpond", "secret_name": "Dive Wilson"},
+            {"name": "Rusty-Man", "secret_name": "Tommy Sharp", "age": 48},
+        ],
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert [hero["name"] for hero in data] == ["Deadpond", "Rusty-Man"]
+    assert "secret_name" not in data[0]
+    assert session.get(Hero, data[1]["id"]).age == 48
+
+
+def test_create_heroes_bulk_invalid_item_inserts_nothing(session: Session, client: TestClient):
+    response = client.post(
+        "/heroes/bulk",
+        json=[{"name": "Deadpond", "secret_name": "Dive Wilson"}, {"name": "No secret"}],
+    )
+
+    assert response.status_code == 422
+    assert client.get("/heroes").json() == []
+
+
+def test_update_heroes_bulk(session: Session, client: TestClient):
+    hero_1 = Hero(name="Deadpond", secret_name="Dive Wilson")
+    hero_2 = Hero(name="Rusty-Man", secret_name="Tommy Sharp")
+    session.add(hero_1)
+    session.add(hero_2)
+    session.commit()
+
+    response = client.patch(
+        "/heroes/bulk",
+        json=[
+            {"id": hero_1.id, "age": 30},
+            {"id": hero_2.id, "name": "Rusty-Woman"},
+            {"id": 999, "age": 1},
+        ],
+    )
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data == {"ids": [hero_1.id, hero_2.id], "not_found": [999]}
+    assert client.get(f"/heroes/{hero_1.id}").json()["age"] == 30
+    assert client.get(f"/heroes/{hero_2.id}").json()["name"] == "Rusty-Woman"
+
+
+def test_update_heroes_bulk_item_without_changes(session: Session, client: TestClient):
+    hero_1 = Hero(name="Deadpond", secret_name="Dive Wilson")
+    session.add(hero_1)
+    session.commit()
+
+    response = client.patch("/heroes/bulk", json=[{"id": hero_1.id, "age": 30}, {"id": hero_1.id}])
+
+    assert response.status_code == 422
+    assert "No fields to update" in response.text
+
+
+def test_update_heroes_bulk_item_with_null_name(session: Session, client: TestClient):
+    hero_1 = Hero(name="Deadpond", secret_name="Dive Wilson")
+    session.add(hero_1)
+    session.commit()
+
+    response = client.patch("/heroes/bulk", json=[{"id": hero_1.id, "name": None}])
+    secret = client.patch("/heroes/bulk", json=[{"id": hero_1.id, "secret_name": None}])
+
+    assert response.status_code == 422
+    assert "name cannot be null" in response.text
+    assert secret.status_code == 422
+    assert client.get(f"/heroes/{hero_1.id}").json()["name"] == "Deadpond"
+    assert client.get(f"/heroes/{hero_1.id}").json()["age"] is None
+
+
+def test_delete_heroes_bulk(session: Session, client: TestClient):
+    hero_1 = Hero(name="Deadpond", secret_name="Dive Wilson")
+    session.add(hero_1)
+    session.commit()
+
+    response = client.request("DELETE", "/heroes/bulk", json=[hero_1.id, 999])
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data == {"ids": [hero_1.id], "not_found": [999]}
+    assert client.get(f"/heroes/{hero_1.id}").status_code == 404
+
+
 # `client` and `session` fixtures (dependencies) comes from tests/conftest.py
 # PyTest auotomatically detects those fixturs - no need to import them
 def test_read_heroes(session: Session, client: TestClient):
@@ -78,6 +173,139 @@ def test_read_heroes(session: Session, client: TestClient):
     assert data[1]["id"] == hero_2.id
 
 
+def test_read_heroes_cursor_pagination(session: Session, client: TestClient):
+    for i in range(5):
+        session.add(Hero(name=f"Hero{i}", secret_name=f"Secret{i}", age=20 + i % 2))
+    session.commit()
+
+    names = []
+    response = client.get("/heroes", params={"limit": 2, "order_by": "age"})
+    while True:
+        assert response.status_code == 200
+        names.extend(hero["name"] for hero in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        response = client.get(
+            "/heroes", params={"limit": 2, "order_by": "age", "cursor": next_cursor}
+        )
+
+    assert names == ["Hero0", "Hero2", "Hero4", "Hero1", "Hero3"]
+
+
+def test_read_heroes_invalid_cursor(client: TestClient):
+    response = client.get("/heroes", params={"cursor": "garbage"})
+
+    assert response.status_code == 400
+
+
+def test_read_heroes_tampered_cursor_value(session: Session, client: TestClient):
+    session.add(Hero(name="Deadpond", secret_name="Dive Wilson", age=30))
+    session.commit()
+
+    for order_by, value in [("name", {"a": 1}), ("age", "30"), ("id", None)]:
+        cursor = encode_cursor(order_by, value, 1)
+        response = client.get("/heroes", params={"order_by": order_by, "cursor": cursor})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_read_heroes_filters_and_direction(session: Session, client: TestClient):
+    session.add(Hero(name="Spider-Boy", secret_name="Pedro Parqueador", age=16))
+    session.add(Hero(name="Spider-Girl", secret_name="Gwen", age=17, gender="Female"))
+    session.add(Hero(name="Rusty-Man", secret_name="Tommy Sharp", age=48))
+    session.commit()
+
+    by_prefix = client.get(
+        "/heroes", params={"name_prefix": "Spider", "order_by": "name", "direction": "desc"}
+    )
+    by_age = client.get("/heroes", params={"age_min": 17, "order_by": "age"})
+    by_gender = client.get("/heroes", params={"gender": "Female"})
+
+    assert [hero["name"] for hero in by_prefix.json()] == ["Spider-Girl", "Spider-Boy"]
+    assert [hero["name"] for hero in by_age.json()] == ["Spider-Girl", "Rusty-Man"]
+    assert [hero["name"] for hero in by_gender.json()] == ["Spider-Girl"]
+
+
+def test_read_heroes_filter_without_supporting_index(client: TestClient):
+    # a range of ages can't be read in name order from any single index
+    response = client.get("/heroes", params={"age_min": 17, "order_by": "name"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Filtering on a range of age requires order_by=age"
+
+
+def test_read_heroes_total_count(session: Session, client: TestClient):
+    for i in range(3):
+        session.add(Hero(name=f"Hero{i}", secret_name="s", age=30 + i))
+    session.commit()
+
+    plain = client.get("/heroes", params={"limit": 1})
+    exact = client.get(
+        "/heroes", params={"limit": 1, "count": "exact", "age_min": 31, "order_by": "age"}
+    )
+    cached = client.get("/heroes", params={"count": "cached"})
+    client.post("/heroes", json={"name": "Hero3", "secret_name": "s"})
+    cached_after_create = client.get("/heroes", params={"count": "cached"})
+    estimated = client.get("/heroes", params={"count": "estimated"})
+
+    assert "X-Total-Count" not in plain.headers
+    assert exact.headers["X-Total-Count"] == "2"
+    assert cached.headers["X-Total-Count"] == "3"
+    assert cached_after_create.headers["X-Total-Count"] == "4"
+    assert estimated.headers["X-Total-Count"] == "4"
+
+
+def test_search_heroes(session: Session, client: TestClient):
+    session.add(Hero(name="Spider-Boy", secret_name="Pedro Parqueador"))
+    session.add(Hero(name="Rusty-Man", secret_name="Tommy Sharp"))
+    session.add(Hero(name="Spider-Girl", secret_name="Gwen"))
+    session.commit()
+
+    response = client.get("/heroes/search", params={"q": "spider"})
+    paged = client.get("/heroes/search", params={"q": "spider", "offset": 1, "limit": 1})
+    no_words = client.get("/heroes/search", params={"q": "**"})
+
+    assert response.status_code == 200
+    assert [hero["name"] for hero in response.json()] == ["Spider-Boy", "Spider-Girl"]
+    assert "secret_name" not in response.json()[0]
+    assert [hero["name"] for hero in paged.json()] == ["Spider-Girl"]
+    assert no_words.status_code == 400
+
+
+def test_openapi_still_documents_hero_public(client: TestClient):
+    # routes return prebuilt JSON responses; `response_model` keeps the schema
+    paths = client.get("/openapi.json").json()["paths"]
+
+    def schema(path: str) -> dict:
+        return paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+    list_schema, one_schema = schema("/heroes/"), schema("/heroes/{hero_id}")
+    assert list_schema["items"] == {"$ref": "#/components/schemas/HeroPublic"}
+    assert one_schema == {"$ref": "#/components/schemas/HeroPublic"}
+
+
+def test_read_heroes_and_hero_with_fields(session: Session, client: TestClient):
+    for i in range(3):
+        session.add(Hero(name=f"Hero{i}", secret_name="s", age=40 - i))
+    session.commit()
+
+    params = {"fields": "id,name", "order_by": "age", "limit": 2}
+    page = client.get("/heroes", params=params)
+    cursor = page.headers["X-Next-Cursor"]
+    next_page = client.get("/heroes", params={**params, "cursor": cursor})
+    one = client.get("/heroes/1", params={"fields": "name"})
+    unknown = client.get("/heroes", params={"fields": "name,secret_name"})
+
+    assert page.json() == [{"name": "Hero2", "id": 3}, {"name": "Hero1", "id": 2}]
+    assert next_page.json() == [{"name": "Hero0", "id": 1}]
+    assert one.json() == {"name": "Hero0"}
+    assert client.get("/heroes/99", params={"fields": "name"}).status_code == 404
+    assert unknown.status_code == 400
+    assert unknown.json()["detail"] == "Unknown fields: secret_name"
+
+
 def test_read_hero(session: Session, client: TestClient):
     hero_1 = Hero(name="Deadpond", secret_name="Dive Wilson")
     session.add(hero_1)
@@ -125,3 +353,185 @@ def test_delete_hero(session: Session, client: TestClient):
     hero_in_db = session.get(Hero, hero_1.id)
     assert response.status_code == 200
     assert hero_in_db is None
+
+
+def test_read_hero_after_update_is_not_stale(session: Session, client: TestClient):
+    hero_1 = Hero(name="Deadpond", secret_name="Dive Wilson")
+    session.add(hero_1)
+    session.commit()
+
+    client.get(f"/heroes/{hero_1.id}")  # cached
+    client.patch(f"/heroes/{hero_1.id}", json={"name": "Deadpuddle"})
+    response = client.get(f"/heroes/{hero_1.id}")
+
+    assert response.json()["name"] == "Deadpuddle"
+
+    client.delete(f"/heroes/{hero_1.id}")
+    response = client.get(f"/heroes/{hero_1.id}")
+
+    assert response.status_code == 404
+
+
+
+def test_conditional_requests(session: Session, client: TestClient):
+    hero_1 = Hero(name="Deadpond", secret_name="Dive Wilson")
+    session.add(hero_1)
+    session.commit()
+
+    response = client.get(f"/heroes/{hero_1.id}")
+    etag = response.headers["ETag"]
+    not_modified = client.get(f"/heroes/{hero_1.id}", headers={"If-None-Match": etag})
+
+    assert etag == '"1"'
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert not_modified.content == b""
+
+    fields = client.get(f"/heroes/{hero_1.id}?fields=name", headers={"If-None-Match": etag})
+
+    assert fields.status_code == 200  # a different representation, its own tag
+    assert fields.headers["ETag"] == '"1-name"'
+    assert fields.json() == {"name": "Deadpond"}
+
+    updated = client.patch(
+        f"/heroes/{hero_1.id}", json={"age": 30}, headers={"If-Match": etag}
+    )
+    lost_update = client.patch(
+        f"/heroes/{hero_1.id}", json={"age": 31}, headers={"If-Match": etag}
+    )
+    modified = client.get(f"/heroes/{hero_1.id}", headers={"If-None-Match": etag})
+
+    assert updated.status_code == 200
+    assert updated.headers["ETag"] == '"2"'
+    assert lost_update.status_code == 412
+    assert modified.status_code == 200
+    assert modified.json()["age"] == 30
+
+    stale_delete = client.delete(f"/heroes/{hero_1.id}", headers={"If-Match": etag})
+    deleted = client.delete(f"/heroes/{hero_1.id}", headers={"If-Match": '"2"'})
+
+    assert stale_delete.status_code == 412
+    assert deleted.status_code == 200
+    assert client.get(f"/heroes/{hero_1.id}", headers={"If-None-Match": "*"}).status_code == 404
+
+def test_conditional_write_with_etag_of_compressed_read(session: Session, client: TestClient):
+    # a hero big enough to go out compressed
+    hero_1 = Hero(name="Deadpond" * 200, secret_name="Dive Wilson")
+    session.add(hero_1)
+    session.commit()
+
+    response = client.get(f"/heroes/{hero_1.id}", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["ETag"]
+    updated = client.patch(
+        f"/heroes/{hero_1.id}", json={"age": 30}, headers={"If-Match": etag}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert etag == '"1"'
+    assert updated.status_code == 200
+
+
+def test_export_heroes_ndjson_and_csv(session: Session, client: TestClient):
+    session.add(Hero(name="Deadpond", secret_name="Dive Wilson"))
+    session.add(Hero(name="Rusty-Man", secret_name="Tommy Sharp", age=48))
+    session.commit()
+
+    response = client.get("/heroes/export")
+    lines = response.text.splitlines()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(lines) == 2
+    assert "secret_name" not in lines[0]
+
+    response = client.get("/heroes/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == ["name,age,gender,id", "Deadpond,,,1", "Rusty-Man,48,,2"]
+
+
+def call_asgi_discarding_body(path: str, query_string: bytes = b"") -> tuple[int, int]:
+    """GET `path` on the app, counting body bytes/ lines without keeping them."""
+    # (TestClient buffers the whole response body, which would hide the streaming)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    counts = {"status": 0, "lines": 0}
+
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:  # the client never disconnects
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            counts["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            counts["lines"] += message.get("body", b"").count(b"\n")
+
+    asyncio.run(app(scope, receive, send))
+    return counts["status"], counts["lines"]
+
+
+def seed_export_db(path, rows: int):
+    """A file db with `rows` heroes, inserted in chunks (low peak memory)."""
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for start in range(0, rows, 50_000):
+            conn.execute(
+                insert(Hero),
+                [
+                    {"name": f"Hero{i}", "secret_name": "S", "age": i % 90}
+                    for i in range(start, min(start + 50_000, rows))
+                ],
+            )
+    return engine
+
+
+def override_read_session(engine):
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_read_session] = get_session_override
+
+
+@pytest.mark.slow
+def test_export_million_heroes_in_constant_memory(tmp_path):
+    # Arrange: 1,000,000 rows; warm up (imports, first compile) on a tiny table
+    rows = 1_000_000
+    override_read_session(seed_export_db(tmp_path / "warm_up.db", 10))
+    call_asgi_discarding_body("/heroes/export", b"format=csv")
+    override_read_session(seed_export_db(tmp_path / "export.db", rows))
+
+    # Act: trace only the measured export
+    tracemalloc.start()
+    try:
+        status, exported = call_asgi_discarding_body("/heroes/export")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        app.dependency_overrides.clear()
+
+    # Assert: the export (~60 MB of NDJSON, far more as row objects) never
+    # sits in memory as a whole
+    assert status == 200
+    assert exported == rows
+    assert peak / 2**20 < 20  # MiB
@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+
+
+def test_read_pool_stats(client: TestClient):
+    response = client.get("/monitoring/pool")
+    data = response.json()
+
+    assert response.status_code == 200
+    assert "pool" in data
+
+
+def test_read_cache_stats(client: TestClient):
+    response = client.get("/monitoring/cache")
+    data = response.json()
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions"} <= set(data)
+
+
+def test_read_statement_stats(client: TestClient):
+    client.get("/heroes/")
+    client.get("/heroes/")
+
+    response = client.get("/monitoring/statements")
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["statements"]["page"]["hits"] >= 1
+    assert "hit_rate" in data["compiled"]
+
+
+def test_read_compression_stats(client: TestClient):
+    response = client.get("/monitoring/compression")
+    data = response.json()
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "size"} <= set(data)
+
+
+def test_read_metrics(client: TestClient):
+    client.get("/heroes/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/heroes/"}' in response.text
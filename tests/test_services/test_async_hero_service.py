@@ -0,0 +1,91 @@
+import pytest
+
+from app.cache import TTLLRUCache
+from app.models.hero_models import Hero, HeroCreate, HeroUpdate
+from app.repositories.async_hero_repository import AsyncHeroRepository
+from app.services.async_hero_service import AsyncHeroService
+
+# Unit tests for app.services.async_hero_service.AsyncHeroService
+# `mocker.AsyncMock(spec=...)` makes every repo method awaitable
+pytestmark = pytest.mark.anyio
+
+
+async def test_create(mocker):
+    # Arrange
+    repo_mock = mocker.AsyncMock(spec=AsyncHeroRepository)
+    fake_db_hero = Hero(id=1, name="Deadpond", secret_name="Dive Wilson")
+    repo_mock.create.return_value = fake_db_hero
+    service = AsyncHeroService(repo=repo_mock)
+
+    # Act
+    result = await service.create(HeroCreate(name="Deadpond", secret_name="Dive Wilson"))
+
+    # Assert
+    assert result is fake_db_hero
+    repo_mock.create.assert_awaited_once()
+
+
+async def test_read_one_without_fill_cache_never_fills_it(mocker):
+    # Arrange: a read service on a replica session
+    repo_mock = mocker.AsyncMock(spec=AsyncHeroRepository)
+    repo_mock.read_one.return_value = Hero(id=1, name="Deadpond", secret_name="Dive Wilson")
+    cache = TTLLRUCache()
+    service = AsyncHeroService(repo=repo_mock, cache=cache, fill_cache=False)
+
+    # Act
+    await service.read_one(1)
+
+    # Assert
+    assert cache.get(("hero", 1)) is None
+
+
+async def test_read_one_never_caches_over_a_concurrent_delete(mocker):
+    # Arrange: a DELETE commits while a miss is reading the hero
+    repo_mock = mocker.AsyncMock(spec=AsyncHeroRepository)
+    cache = TTLLRUCache()
+    service = AsyncHeroService(repo=repo_mock, cache=cache)
+    writer = AsyncHeroService(repo=mocker.AsyncMock(spec=AsyncHeroRepository), cache=cache)
+    writer.repo.delete_by_id.return_value = True
+
+    async def read_then_lose_the_race(hero_id):
+        await writer.delete(hero_id)
+        return Hero(id=1, name="Deadpond", secret_name="Dive Wilson")
+
+    repo_mock.read_one.side_effect = read_then_lose_the_race
+
+    # Act
+    await service.read_one(1)
+
+    # Assert
+    assert cache.get(("hero", 1)) is None
+
+
+async def test_read_one_not_found_raises(mocker):
+    # Arrange
+    repo_mock = mocker.AsyncMock(spec=AsyncHeroRepository)
+    repo_mock.read_one.return_value = None
+    service = AsyncHeroService(repo=repo_mock)
+
+    # Act
+    with pytest.raises(Exception) as excinfo:
+        await service.read_one(999)
+
+    # Assert
+    assert excinfo.type.__name__ == "HTTPException"
+    assert getattr(excinfo.value, "status_code") == 404
+
+
+async def test_update_not_found_raises(mocker):
+    # Arrange
+    repo_mock = mocker.AsyncMock(spec=AsyncHeroRepository)
+    repo_mock.update_by_id.return_value = None  # 0 rows updated
+    service = AsyncHeroService(repo=repo_mock)
+
+    # Act
+    with pytest.raises(Exception) as excinfo:
+        await service.update(111, HeroUpdate(name="Deadpuddle"))
+
+    # Assert
+    assert getattr(excinfo.value, "status_code") == 404
+    repo_mock.update_by_id.assert_awaited_once_with(111, {"name": "Deadpuddle"}, None)
+    repo_mock.read_one.assert_not_awaited()
@@ -1,8 +1,21 @@
 import pytest
-
-from app.models.hero_models import Hero, HeroCreate, HeroUpdate
+from fastapi import HTTPException
+
+from app.cache import TTLLRUCache
+from app.models.hero_models import (
+    Hero,
+    HeroBulkUpdate,
+    HeroCountMode,
+    HeroCreate,
+    HeroExportFormat,
+    HeroFilter,
+    HeroOrderBy,
+    HeroUpdate,
+    SortDirection,
+)
+from app.pagination import encode_cursor
 from app.repositories.hero_repository import HeroRepository
-from app.services.hero_service import HeroService
+from app.services.hero_service import HeroService, parse_fields
 
 
 # Unit tests for app.services.hero_service.HeroService
@@ -107,12 +120,10 @@ def test_read_one_not_found_raises(mocker):
 
 def test_update_success(mocker):
     # def update(self, hero_id: int, hero: HeroUpdate) -> Hero:
-    #     hero_db = self.repo.read_one(hero_id)
+    #     hero_data = hero.model_dump(exclude_unset=True)
+    #     hero_db = self.repo.update_by_id(hero_id, hero_data)
     #     if not hero_db:
     #         raise HTTPException(status_code=404, detail="Hero not found")
-    #     hero_data = hero.model_dump(exclude_unset=True)
-    #     hero_db = self.repo.update(hero_db, hero_data)
-
     #     return hero_db
 
     # Arrange
@@ -122,8 +133,7 @@ def test_update_success(mocker):
     fake_hero_db = Hero(
         id=1, name="Deadpond", secret_name="Dive Wilson", age=None, gender=None
     )
-    repo_mock.read_one.return_value = fake_hero_db
-    repo_mock.update.return_value = fake_hero_db
+    repo_mock.update_by_id.return_value = fake_hero_db
 
     hero_update_mock = mocker.Mock(spec=HeroUpdate)
     hero_update_mock.model_dump.return_value = {"secret_name": "Updated Name"}
@@ -133,10 +143,9 @@ def test_update_success(mocker):
 
     # Assert
     assert result is fake_hero_db
-    repo_mock.read_one.assert_called_once_with(1)
-    repo_mock.update.assert_called_once_with(
-        fake_hero_db, {"secret_name": "Updated Name"}
-    )
+    # single UPDATE .. RETURNING; no prior read
+    repo_mock.read_one.assert_not_called()
+    repo_mock.update_by_id.assert_called_once_with(1, {"secret_name": "Updated Name"}, None)
 
 
 def test_update_not_found_raises(mocker):
@@ -145,8 +154,9 @@ def test_update_not_found_raises(mocker):
     service = HeroService(repo=repo_mock)
 
     hero_update_mock = mocker.Mock(spec=HeroUpdate)
+    hero_update_mock.model_dump.return_value = {"name": "Nobody"}
 
-    repo_mock.read_one.return_value = None  # simulate not found
+    repo_mock.update_by_id.return_value = None  # simulate not found (0 rows updated)
 
     # Act
     with pytest.raises(Exception) as excinfo:
@@ -159,30 +169,26 @@ def test_update_not_found_raises(mocker):
 
 def test_delete_success_and_not_found_raises(mocker):
     # def delete(self, hero_id: int) -> None:
-    #     hero = self.repo.read_one(hero_id)
-    #     if not hero:
+    #     if not self.repo.delete_by_id(hero_id):
     #         raise HTTPException(status_code=404, detail="Hero not found")
-    #     self.repo.delete(hero)
 
     # ==== ==== Success case ==== ====
     # Arrange
     repo_mock = mocker.Mock(spec=HeroRepository)
     service = HeroService(repo=repo_mock)
 
-    fake_hero_db = Hero(
-        id=1, name="Deadpond", secret_name="Dive Wilson", age=None, gender=None
-    )
-    repo_mock.read_one.return_value = fake_hero_db
+    repo_mock.delete_by_id.return_value = True
 
     # Act
     service.delete(1)
 
     # Assert
-    repo_mock.delete.assert_called_once_with(fake_hero_db)
+    repo_mock.delete_by_id.assert_called_once_with(1, None)
+    repo_mock.read_one.assert_not_called()
 
     # ==== ==== Not Found Raises case ==== ====
     # Arrange
-    repo_mock.read_one.return_value = None  # simulate not found
+    repo_mock.delete_by_id.return_value = False  # simulate not found (0 rows deleted)
 
     # Act
     with pytest.raises(Exception) as excinfo:
@@ -191,3 +197,388 @@ def test_delete_success_and_not_found_raises(mocker):
     # Assert
     assert excinfo.type.__name__ == "HTTPException"
     assert getattr(excinfo.value, "status_code") == 404
+
+
+def test_read_many_with_cursor_seeks_after_last_row(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.read_many.return_value = []
+    service = HeroService(repo=repo_mock)
+    last_hero = Hero(id=7, name="Deadpond", secret_name="Dive Wilson", age=30)
+    cursor = service.next_cursor([last_hero], limit=1, order_by=HeroOrderBy.age)
+
+    # Act
+    service.read_many(0, 10, cursor=cursor, order_by=HeroOrderBy.age)
+
+    # Assert
+    repo_mock.read_many.assert_called_once_with(
+        0, 10, order_by=HeroOrderBy.age, after=(30, 7)
+    )
+
+
+def test_next_cursor_none_on_last_page(mocker):
+    # Arrange
+    service = HeroService(repo=mocker.Mock(spec=HeroRepository))
+    heroes = [Hero(id=1, name="Deadpond", secret_name="Dive Wilson")]
+
+    # Act / Assert
+    assert service.next_cursor(heroes, limit=2) is None
+    assert service.next_cursor([], limit=2) is None
+    assert service.next_cursor(heroes, limit=1) is not None
+
+
+def test_read_many_invalid_cursor_raises(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    service = HeroService(repo=repo_mock)
+    name_cursor = service.next_cursor(
+        [Hero(id=1, name="Deadpond", secret_name="Dive Wilson")],
+        limit=1,
+        order_by=HeroOrderBy.name,
+    )
+
+    # Act / Assert
+    for cursor, kwargs in [
+        ("not-a-cursor", {}),
+        (name_cursor, {"order_by": HeroOrderBy.age}),  # built for another column
+        (encode_cursor("name", {"$gt": ""}, 1), {"order_by": HeroOrderBy.name}),  # tampered
+        (encode_cursor("age", "thirty", 1), {"order_by": HeroOrderBy.age}),
+        (encode_cursor("name", None, 1), {"order_by": HeroOrderBy.name}),  # name is NOT NULL
+        (encode_cursor("id", 1, True), {}),
+    ]:
+        with pytest.raises(Exception) as excinfo:
+            service.read_many(0, 10, cursor=cursor, **kwargs)
+        assert excinfo.type.__name__ == "HTTPException"
+        assert getattr(excinfo.value, "status_code") == 400
+
+    repo_mock.read_many.assert_not_called()
+
+
+def test_read_many_descending_cursor_keeps_direction(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.read_many.return_value = []
+    service = HeroService(repo=repo_mock)
+    last_hero = Hero(id=7, name="Deadpond", secret_name="Dive Wilson", age=30)
+    desc = {"order_by": HeroOrderBy.age, "direction": SortDirection.desc}
+    cursor = service.next_cursor([last_hero], 1, **desc)
+
+    # Act
+    service.read_many(0, 10, cursor=cursor, **desc)
+
+    # Assert
+    repo_mock.read_many.assert_called_once_with(0, 10, after=(30, 7), **desc)
+    with pytest.raises(Exception) as excinfo:  # an ASC cursor is not a DESC one
+        service.read_many(0, 10, cursor=cursor, order_by=HeroOrderBy.age)
+    assert getattr(excinfo.value, "status_code") == 400
+
+
+def test_read_many_filter_without_supporting_index_raises(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    service = HeroService(repo=repo_mock)
+
+    # Act
+    with pytest.raises(Exception) as excinfo:
+        service.read_many(0, 10, filters=HeroFilter(age_min=18), order_by=HeroOrderBy.name)
+
+    # Assert
+    assert excinfo.type.__name__ == "HTTPException"
+    assert getattr(excinfo.value, "status_code") == 400
+    repo_mock.read_many.assert_not_called()
+
+
+def test_read_one_served_from_cache_after_first_read(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.read_one.return_value = Hero(
+        id=1, name="Deadpond", secret_name="Dive Wilson", age=None, gender=None
+    )
+    service = HeroService(repo=repo_mock, cache=TTLLRUCache())
+
+    # Act
+    first = service.read_one(1)
+    second = service.read_one(1)
+
+    # Assert
+    repo_mock.read_one.assert_called_once_with(1)
+    assert second.name == first.name == "Deadpond"
+    assert second is not first  # a fresh object, not shared between requests
+
+
+def test_read_one_without_fill_cache_reads_but_never_fills_it(mocker):
+    # Arrange: a read service on a replica session
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.read_one.return_value = Hero(id=1, name="Deadpond", secret_name="Dive Wilson")
+    repo_mock.count.return_value = 5
+    cache, count_cache = TTLLRUCache(), TTLLRUCache(max_size=1)
+    service = HeroService(
+        repo=repo_mock, cache=cache, count_cache=count_cache, fill_cache=False
+    )
+
+    # Act
+    service.read_one(1)
+    service.count(HeroCountMode.cached)
+
+    # Assert
+    assert cache.get(("hero", 1)) is None
+    assert count_cache.get(("hero_count",)) is None
+
+
+def test_read_one_never_caches_over_a_concurrent_write(mocker):
+    # Arrange: a PATCH commits and caches version 2 while a miss is reading version 1
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    cache = TTLLRUCache()
+    service = HeroService(repo=repo_mock, cache=cache)
+    writer = HeroService(repo=mocker.Mock(spec=HeroRepository), cache=cache)
+    writer.repo.update_by_id.return_value = Hero(
+        id=1, name="Deadpuddle", secret_name="Dive Wilson", version=2
+    )
+
+    def read_then_lose_the_race(hero_id):
+        writer.update(hero_id, HeroUpdate(name="Deadpuddle"))
+        return Hero(id=1, name="Deadpond", secret_name="Dive Wilson", version=1)
+
+    repo_mock.read_one.side_effect = read_then_lose_the_race
+
+    # Act
+    service.read_one(1)
+
+    # Assert
+    assert cache.get(("hero", 1))["version"] == 2
+    assert service.current_version(1) == 2
+
+
+def test_update_and_delete_keep_cache_fresh(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    cache = TTLLRUCache()
+    service = HeroService(repo=repo_mock, cache=cache)
+    hero_db = Hero(id=1, name="Deadpond", secret_name="Dive Wilson")
+    cache.set(("hero", 1), hero_db.model_dump())
+    repo_mock.update_by_id.return_value = Hero(
+        id=1, name="Deadpuddle", secret_name="Dive Wilson"
+    )
+    repo_mock.delete_by_id.return_value = True
+
+    # Act
+    service.update(1, HeroUpdate(name="Deadpuddle"))
+    after_update = service.read_one(1)
+    service.delete(1)
+    repo_mock.read_one.return_value = None
+
+    # Assert
+    assert after_update.name == "Deadpuddle"
+    with pytest.raises(Exception) as excinfo:
+        service.read_one(1)  # not served from a stale cache entry
+    assert getattr(excinfo.value, "status_code") == 404
+
+
+def test_create_many(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.create_many.return_value = ["created"]
+    service = HeroService(repo=repo_mock)
+    heroes_in = [HeroCreate(name="Deadpond", secret_name="Dive Wilson")]
+
+    # Act
+    result = service.create_many(heroes_in)
+
+    # Assert
+    assert result == ["created"]
+    (db_heroes,), _ = repo_mock.create_many.call_args
+    assert isinstance(db_heroes[0], Hero)
+    assert db_heroes[0].name == "Deadpond"
+
+
+def test_update_many_reports_not_found(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.update_many.return_value = [1]
+    cache = TTLLRUCache()
+    cache.set(("hero", 1), {"id": 1, "name": "Deadpond", "secret_name": "Dive Wilson"})
+    service = HeroService(repo=repo_mock, cache=cache)
+
+    # Act
+    result = service.update_many(
+        [HeroBulkUpdate(id=1, age=30), HeroBulkUpdate(id=2, name="Nobody")]
+    )
+
+    # Assert
+    repo_mock.update_many.assert_called_once_with(
+        [{"id": 1, "age": 30}, {"id": 2, "name": "Nobody"}]
+    )
+    assert result.ids == [1]
+    assert result.not_found == [2]
+    assert cache.get(("hero", 1)) is None  # invalidated
+
+
+def test_delete_many_reports_not_found(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.delete_many.return_value = [3, 1]
+    service = HeroService(repo=repo_mock)
+
+    # Act
+    result = service.delete_many([1, 2, 3, 2])
+
+    # Assert
+    assert result.ids == [1, 3]
+    assert result.not_found == [2]
+
+
+def test_export_ndjson_and_csv(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    rows = [("Deadpond", None, None, 1), ("Rusty-Man", 48, "Male", 2)]
+    repo_mock.stream_public.side_effect = lambda batch_size: iter(rows)
+    service = HeroService(repo=repo_mock)
+
+    # Act
+    ndjson_chunks = list(service.export(HeroExportFormat.ndjson, batch_size=1))
+    csv_text = "".join(service.export(HeroExportFormat.csv, batch_size=1))
+
+    # Assert
+    assert len(ndjson_chunks) == 2  # one chunk per batch
+    assert ndjson_chunks[1] == '{"name": "Rusty-Man", "age": 48, "gender": "Male", "id": 2}\n'
+    assert csv_text.splitlines() == ["name,age,gender,id", "Deadpond,,,1", "Rusty-Man,48,Male,2"]
+
+
+def test_search_passes_plain_words_only(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.search.return_value = []
+    service = HeroService(repo=repo_mock)
+
+    # Act
+    service.search('spider-"boy"* OR NEAR(', 0, 10)
+
+    # Assert: FTS5/ tsquery operators never reach the match expression
+    repo_mock.search.assert_called_once_with(["spider", "boy", "OR", "NEAR"], 0, 10)
+    with pytest.raises(Exception) as excinfo:
+        service.search("*** --", 0, 10)
+    assert getattr(excinfo.value, "status_code") == 400
+
+
+def test_cached_count_is_adjusted_by_writes(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.count.return_value = 10
+    repo_mock.create.side_effect = lambda hero: hero
+    repo_mock.create_many.side_effect = lambda heroes: heroes
+    repo_mock.delete_many.return_value = [1, 2, 3]
+    repo_mock.delete_by_id.return_value = True
+    service = HeroService(
+        repo=repo_mock, cache=TTLLRUCache(), count_cache=TTLLRUCache(max_size=1)
+    )
+
+    # Act
+    first = service.count(HeroCountMode.cached)
+    service.create(HeroCreate(name="Deadpond", secret_name="Dive Wilson"))
+    service.create_many([HeroCreate(name=f"H{i}", secret_name="s") for i in range(2)])
+    service.delete_many([1, 2, 3, 99])
+    service.delete(4)
+    second = service.count(HeroCountMode.cached)
+
+    # Assert: one COUNT(*), then 10 + 1 + 2 - 3 - 1 from the writes alone
+    assert (first, second) == (10, 9)
+    repo_mock.count.assert_called_once_with()
+
+
+def test_cached_count_survives_hero_cache_traffic(mocker):
+    # Arrange: a hero cache far smaller than the heroes read
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.count.return_value = 10
+    repo_mock.read_one.side_effect = lambda hero_id: Hero(
+        id=hero_id, name="Deadpond", secret_name="Dive Wilson"
+    )
+    cache = TTLLRUCache(max_size=2)
+    service = HeroService(repo=repo_mock, cache=cache, count_cache=TTLLRUCache(max_size=1))
+
+    # Act
+    service.count(HeroCountMode.cached)
+    for hero_id in range(1, 6):
+        service.read_one(hero_id)
+    total = service.count(HeroCountMode.cached)
+
+    # Assert: one COUNT(*), and the hero cache counts hero lookups only
+    assert total == 10
+    repo_mock.count.assert_called_once_with()
+    assert cache.stats()["misses"] == 5
+
+
+def test_count_modes(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.count.return_value = 7
+    repo_mock.estimate_count.side_effect = [1000, None]
+    service = HeroService(repo=repo_mock)  # no cache: cached == exact
+    filters = HeroFilter(gender="Female")
+
+    # Act / Assert
+    assert service.count(HeroCountMode.estimated) == 1000
+    assert service.count(HeroCountMode.estimated) == 7  # no statistics yet
+    assert service.count(HeroCountMode.cached) == 7
+    assert service.count(HeroCountMode.exact, filters) == 7
+    repo_mock.count.assert_called_with(filters)
+    with pytest.raises(Exception) as excinfo:
+        service.count(HeroCountMode.estimated, filters)
+    assert getattr(excinfo.value, "status_code") == 400
+
+
+def test_parse_fields():
+    # Act / Assert: schema order, duplicates and blanks dropped
+    assert parse_fields("id, name,,id") == ("name", "id")
+    for fields in ["id,secret_name", " , "]:
+        with pytest.raises(Exception) as excinfo:
+            parse_fields(fields)
+        assert getattr(excinfo.value, "status_code") == 400
+
+
+def test_read_many_and_read_one_with_fields(mocker):
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    repo_mock.read_many.return_value = []
+    repo_mock.read_one.return_value = mocker.Mock(_mapping={"name": "Deadpond"})
+    cache = TTLLRUCache()
+    service = HeroService(repo=repo_mock, cache=cache)
+    cache.set(
+        ("hero", 1),
+        {"id": 1, "name": "Rusty-Man", "age": 48, "gender": None, "secret_name": "s", "version": 2},
+    )
+
+    # Act
+    service.read_many(0, 10, fields=("name",), order_by=HeroOrderBy.age)
+    cached = service.read_one(1, fields=("name", "id"))
+    from_db = service.read_one(2, fields=("name",))
+
+    # Assert: the page also selects what the next cursor needs
+    repo_mock.read_many.assert_called_once_with(
+        0, 10, order_by=HeroOrderBy.age, columns=("name", "age", "id")
+    )
+    assert cached == {"name": "Rusty-Man", "id": 1, "version": 2}
+    assert from_db == {"name": "Deadpond"}
+    repo_mock.read_one.assert_called_once_with(2, columns=("name", "version"))
+    assert cache.get(("hero", 2)) is None  # partial rows are not cached
+
+
+def test_conditional_read_and_update(mocker):
+    """If-None-Match answers 304 from the version alone; If-Match mismatch is a 412"""
+    # Arrange
+    repo_mock = mocker.Mock(spec=HeroRepository)
+    service = HeroService(repo=repo_mock)
+    repo_mock.read_version.return_value = 2
+    repo_mock.update_by_id.return_value = None  # version did not match
+
+    # Act
+    with pytest.raises(HTTPException) as not_modified:
+        service.read_one(1, if_none_match='"2"')
+    with pytest.raises(HTTPException) as precondition_failed:
+        service.update(1, HeroUpdate(age=30), if_match='"1"')
+
+    # Assert
+    assert not_modified.value.status_code == 304
+    assert not_modified.value.headers == {"ETag": '"2"'}
+    repo_mock.read_one.assert_not_called()  # nothing but the version was read
+    assert precondition_failed.value.status_code == 412
+    repo_mock.update_by_id.assert_called_once_with(1, {"age": 30}, [1])